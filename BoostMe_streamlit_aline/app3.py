@@ -1,4 +1,6 @@
 import base64
+import sys
+import time
 from pathlib import Path
 from urllib.parse import quote
 
@@ -35,6 +37,15 @@ DATA_DIR = BASE_DIR / "data"
 LOGO_PATH = BASE_DIR / "LOGO_BoostMe.png"
 WALLPAPER_PATH = BASE_DIR / "wallpaper.png"
 
+# package boostme (racine du repo) : store Arrow écrit par le pipeline de nettoyage
+ROOT_DIR = BASE_DIR.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+SNAPSHOT_DIR = ROOT_DIR / "data" / "new_videos"  # snapshots du jour (get_new_videos.ipynb)
+STATS_DIR = ROOT_DIR / "data" / "video_stats"     # historique des snapshots (nettoyage.ipynb)
+
+from boostme import cube, details, enrich, facets, filters, live, schema, search, store, timeseries, topics, trending  # noqa: E402
+
 
 # =============================
 # HELPERS
@@ -250,34 +261,160 @@ def show_header(page_title):
     st.markdown('<div class="bm-divider"></div>', unsafe_allow_html=True)
 
 
-@st.cache_data
-def load_data():
+# fichiers dont dépendent les tables chargées : leur empreinte sert de clé de cache
+DATA_FILES = [
+    *enrich.ENRICHED_FILES, cube.CUBE_FILE, *store.STORE_FILES, "cats.csv", "chaines.csv", "videos.csv",
+]
+
+
+def data_version() -> tuple:
+    return store.data_version(DATA_DIR, DATA_FILES)
+
+
+def reload_data():
+    # bouton "Recharger" : on oublie tout, les tables sont relues au rerun
+    st.cache_resource.clear()
+    st.cache_data.clear()
+
+
+# cache_resource : une seule copie des tables par processus, partagée (sans
+# pickle ni copie) par toutes les sessions -> tables en lecture seule.
+# max_entries=1 : quand un nouveau snapshot change l'empreinte des fichiers,
+# l'ancienne version est libérée.
+# Renvoie (chaines, videos, fiches des chaînes, index des thèmes) : chaines sans
+# les colonnes texte, lues fiche par fiche pour le Focus Influenceur
+# (boostme/details.py) ; l'index thème -> chaînes est aligné sur ses lignes.
+@st.cache_resource(max_entries=1, show_spinner="Chargement des données…")
+def load_data(version: tuple):
+    # 1) table enrichie déjà matérialisée par le pipeline
+    if enrich.has_enriched(DATA_DIR):
+        return (
+            *enrich.load_enriched(DATA_DIR),
+            details.ChannelDetails.open(DATA_DIR),
+            topics.TopicIndex.open(DATA_DIR),
+        )
+
+    # 2) sinon store Arrow (typé, memory-map), sinon CSV -> enrichissement une seule fois
+    # (colonnes validées à la lecture, boostme/schema.py : une colonne obligatoire manquante -> message)
     missing = [str(DATA_DIR / f) for f in ["cats.csv", "chaines.csv", "videos.csv"] if not (DATA_DIR / f).exists()]
-    if missing:
+    if not store.has_store(DATA_DIR) and missing:
         st.error("Fichiers CSV manquants :")
         for m in missing:
             st.write("—", m)
         st.stop()
 
-    cats = pd.read_csv(DATA_DIR / "cats.csv")
-    chaines = pd.read_csv(DATA_DIR / "chaines.csv")
-    videos = pd.read_csv(DATA_DIR / "videos.csv")
-    chaines = chaines[chaines['country']=="FR"].copy() 
-    return cats, chaines, videos
-
-
-def clean_columns(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
-    df.columns = (
-        df.columns.astype(str)
-        .str.lower()
-        .str.strip()
-        .str.replace(" ", "_")
-        .str.replace("(", "", regex=False)
-        .str.replace(")", "", regex=False)
-        .str.replace("%", "pct", regex=False)
+    try:
+        if store.has_store(DATA_DIR):
+            cats, chaines, videos = store.load_store(DATA_DIR)
+        else:
+            cats = schema.read_csv(DATA_DIR / "cats.csv", "cats")
+            chaines = schema.read_csv(DATA_DIR / "chaines.csv", "chaines")
+            videos = schema.read_csv(DATA_DIR / "videos.csv", "videos")
+        topic_index = topics.TopicIndex.from_frame(enrich.french_channels(chaines))
+        chaines, videos = enrich.build_dashboard_tables(cats, chaines, videos)
+    except ValueError as e:
+        st.error(str(e))
+        st.stop()
+    return details.drop_details(chaines), videos, details.ChannelDetails.from_frames(chaines, videos), topic_index
+
+
+@st.cache_resource(max_entries=1)
+def load_cube(version: tuple):
+    # cube matérialisé avec la table enrichie, sinon agrégé une fois à partir des vidéos chargées
+    if enrich.has_enriched(DATA_DIR) and cube.has_cube(DATA_DIR):
+        return cube.load_cube(DATA_DIR)
+    return cube.build_cube(load_data(version)[1])
+
+
+def load_cats():
+    if (DATA_DIR / store.CATS_FILE).exists():
+        return store.read_frame(DATA_DIR / store.CATS_FILE, "cats")
+    return schema.read_csv(DATA_DIR / "cats.csv", "cats")
+
+
+@st.cache_resource(max_entries=1)
+def load_live(version: tuple):
+    # tables chargées + snapshots de data/new_videos plus récents que les fichiers du dossier,
+    # appliqués à chaud (seules les lignes nouvelles / avec plus de vues, voir boostme/live.py)
+    chaines, videos, _, _ = load_data(version)
+    since_ns = max((mtime for _, _, mtime in version), default=0)
+    watcher = live.SnapshotWatcher(SNAPSHOT_DIR, since_ns)
+    return live.LiveTables(load_cats(), chaines, videos, load_cube(version), watcher)
+
+
+# caches dépendants : clé = (empreinte des fichiers, version des snapshots appliqués),
+# les tables correspondantes sont passées à part (arguments _ non hachés)
+@st.cache_resource(max_entries=1)
+def load_filter_indexes(version: tuple, _videos: pd.DataFrame, _videos_cube: pd.DataFrame):
+    # dimensions des vidéos et du cube encodées une fois par processus
+    return filters.FilterIndex(_videos), filters.FilterIndex(_videos_cube)
+
+
+@st.cache_resource(max_entries=1)
+def load_channel_search(version: tuple, _videos: pd.DataFrame):
+    return search.ChannelSearch.from_videos(_videos)
+
+
+@st.cache_resource(max_entries=1)
+def load_focus_search(version: tuple):
+    # Focus Influenceur : toutes les chaînes, classées par abonnés (sans requête = top abonnés)
+    ranked = chaines.sort_values("subscribers", ascending=False).drop_duplicates("title")
+    ids = pd.Series(ranked["id"].to_numpy(), index=ranked["title"].to_numpy())
+    return search.ChannelSearch(ranked["title"], ranked["subscribers"].fillna(0)), ids
+
+
+def stats_version() -> tuple:
+    return store.data_version(STATS_DIR, sorted(p.name for p in STATS_DIR.glob("*.arrow")))
+
+
+@st.cache_resource(max_entries=1, show_spinner="Calcul des tendances…")
+def load_trends(stats_version: tuple):
+    # vitesse / accélération recalculées quand nettoyage.ipynb ajoute un snapshot au store
+    stats = timeseries.VideoStats.open(STATS_DIR)
+    return {stat: trending.video_trends(stats, stat) for stat in TREND_STATS}, stats.last_day
+
+
+@st.cache_resource(max_entries=1)
+def load_names(version: tuple, _videos: pd.DataFrame):
+    # titres des vidéos et noms des chaînes pour les tableaux de la page Tendances
+    titles = _videos.drop_duplicates("video_id").set_index("video_id")["title"]
+    # "channel" (nom renvoyé par l'API) : "chaine" n'est connu que pour les chaînes FR de chaines.csv
+    chaines_names = _videos.drop_duplicates("channel_id").set_index("channel_id")["channel"].astype(str)
+    return titles, chaines_names
+
+
+@st.cache_resource(max_entries=1, show_spinner="Indexation des vidéos…")
+def load_video_facets(version: tuple, _videos: pd.DataFrame):
+    # index écrit par le pipeline tant qu'aucun snapshot n'a été appliqué à chaud (mêmes lignes
+    # que la table vidéos), sinon reconstruit sur la table courante
+    if version[1] == 0 and enrich.has_enriched(DATA_DIR):
+        index = facets.open_facets(DATA_DIR)
+        if len(index) == len(_videos):
+            return index
+    return facets.build_facets(_videos, topic_index.terms_by_id("topics"))
+
+
+def channel_picker(channel_search: search.ChannelSearch):
+    """
+    Filtre "Chaînes" : toutes les chaînes par défaut (filters.ALL, aucune liste
+    envoyée au navigateur), sinon recherche côté serveur + sélection parmi les
+    k premiers résultats. Les chaînes déjà cochées restent dans les options.
+    """
+    if st.sidebar.checkbox("Toutes les chaînes", value=True, key="chaines_toutes"):
+        return filters.ALL
+
+    query = st.sidebar.text_input("Rechercher une chaîne", key="chaines_recherche")
+    matches, total = channel_search.search(query)
+    selected = st.session_state.get("chaines", [])
+    selected = selected if isinstance(selected, list) else []
+    chaines_sel = st.sidebar.multiselect(
+        "Chaînes",
+        options=list(dict.fromkeys(selected + matches)),
+        key="chaines",
     )
-    return df
+    if total > len(matches):
+        st.sidebar.caption(f"{len(matches)} chaînes affichées sur {total} : affiner la recherche")
+    return chaines_sel
 
 
 def multiselect_simple(label: str, options: list, default_values=None, key=None):
@@ -309,93 +446,97 @@ def multiselect_simple(label: str, options: list, default_values=None, key=None)
 # =============================
 inject_css()
 
-cats, chaines, videos = load_data()
-cats = clean_columns(cats)
-chaines = clean_columns(chaines)
-videos = clean_columns(videos)
+files_version = data_version()
+tables = load_live(files_version)
+live_version, videos, videos_cube = tables.refresh()
+chaines = tables.chaines
+channel_details, topic_index = load_data(files_version)[2:]
+version = (files_version, live_version)
 
 # =============================
-# SECURE / FIX MERGES
+# PAGE : VIDEOS
 # =============================
-# Engagement rate (chaines)
-cand = [c for c in chaines.columns if "engagement" in c and "rate" in c]
-if not cand:
-    st.error("Je ne trouve aucune colonne 'engagement' + 'rate' dans chaines.")
-    st.write("Colonnes chaines :", list(chaines.columns))
-    st.stop()
-
-engagement_col = cand[0]
-if engagement_col != "engagement_rate_pct":
-    chaines.rename(columns={engagement_col: "engagement_rate_pct"}, inplace=True)
-chaines["engagement_rate_pct"] = pd.to_numeric(chaines["engagement_rate_pct"], errors="coerce")
-
-# Taux engagement (videos)
-eng_cand = [c for c in videos.columns if "taux" in c and "engagement" in c]
-if not eng_cand:
-    st.error("Je ne trouve pas la colonne de taux d'engagement dans videos.")
-    st.write("Colonnes videos :", list(videos.columns))
-    st.stop()
-
-taux_eng_col = eng_cand[0]
-if taux_eng_col != "taux_engagement_pct":
-    videos.rename(columns={taux_eng_col: "taux_engagement_pct"}, inplace=True)
-videos["taux_engagement_pct"] = pd.to_numeric(videos["taux_engagement_pct"], errors="coerce")
-
-# Dates
-videos["published_at"] = pd.to_datetime(videos["published_at"], errors="coerce")
-videos["heure_publication"] = videos["published_at"].dt.hour
-videos["jour_semaine_num"] = videos["published_at"].dt.weekday
-jours_map = {0: "Lundi", 1: "Mardi", 2: "Mercredi", 3: "Jeudi", 4: "Vendredi", 5: "Samedi", 6: "Dimanche"}
-videos["jour_semaine"] = videos["jour_semaine_num"].map(jours_map)
-ordre_jours = ["Lundi", "Mardi", "Mercredi", "Jeudi", "Vendredi", "Samedi", "Dimanche"]
-videos["jour_semaine"] = pd.Categorical(videos["jour_semaine"], categories=ordre_jours, ordered=True)
-videos["annee"] = videos["published_at"].dt.year
-
-# Engagement total
-videos["engagement_total"] = videos.get("likes", 0).fillna(0) + videos.get("comments", 0).fillna(0)
-
-# Topics - suppression des caractères superflus
-if "topics" in chaines.columns:
-        chaines["topics"] = (
-            chaines["topics"]
-            .astype(str)
-            .str.replace(r"[\[\]'\"]", "", regex=True) # Supprime [ ] ' "
-            .str.replace(",", ", ") # Rajoute un espace après la virgule pour la lisibilité
-        )
+EXPLORER_PAGE_SIZE = 100  # lignes par page de la table "Explorer"
 
-# =============================
-# JOIN CATS
-# =============================
-videos = videos.merge(
-    cats[["category_id", "name"]],
-    on="category_id",
-    how="left"
-).rename(columns={"name": "categorie"})
 
-# =============================
-# JOIN CHAINES (FIX: types + fillna)
-# =============================
-chaines_for_merge = chaines.rename(columns={"title": "chaine"}) if "title" in chaines.columns else chaines.copy()
-
-# ✅ clé : forcer types pour matcher
-videos["channel_id"] = videos["channel_id"].astype(str).str.strip()
-chaines_for_merge["id"] = chaines_for_merge["id"].astype(str).str.strip()
-
-videos = videos.merge(
-    chaines_for_merge[["id", "chaine", "country", "subscribers", "engagement_rate_pct", "nb_videos"]],
-    left_on="channel_id",
-    right_on="id",
-    how="left",
-    suffixes=("", "_chaine")
-)
+@st.cache_data(max_entries=64, show_spinner=False)
+def video_charts(selections: dict, heures: tuple, version: tuple):
+    """
+    KPIs + figures de page_videos pour un état des filtres : mémorisés sur cet
+    état, un rerun sans changement de filtre (pagination, autre page...) ne
+    reconstruit aucune figure.
+    """
+    _, cube_index = load_filter_indexes(version, videos, videos_cube)
+    sel = filters.take(videos_cube, cube_index.select(selections, heures))
+    totals = cube.kpis(sel)
 
-# ✅ clé : ne plus perdre 9000 lignes au filtre
-videos["chaine"] = videos["chaine"].fillna("Chaîne inconnue")
-videos["categorie"] = videos["categorie"].fillna("Catégorie inconnue")
+    cat_views = (
+        cube.rollup_mean(sel, "categorie", "views")
+        .sort_values("views", ascending=False)
+    ) if len(sel) else pd.DataFrame(columns=["categorie", "views"])
+
+    fig_cat = px.bar(cat_views, x="categorie", y="views", title=None)
+    fig_cat.update_traces(marker_color=BOOSTME["orange"])
+    fig_cat.update_layout(
+        paper_bgcolor="rgba(23,23,36,0.88)",
+        plot_bgcolor="rgba(23,23,36,0.88)",
+        font_color=BOOSTME["text"],
+        xaxis_title=None,
+        yaxis_title="Vues moyennes",
+        margin=dict(l=10, r=10, t=10, b=10),
+    )
+
+    hour_eng = (
+        cube.rollup_mean(sel, "heure_publication", "taux_engagement_pct")
+        .sort_values("heure_publication")
+    ) if len(sel) else pd.DataFrame(columns=["heure_publication", "taux_engagement_pct"])
+
+    fig_hour = px.line(hour_eng, x="heure_publication", y="taux_engagement_pct", markers=True, title=None)
+    fig_hour.update_traces(line_color=BOOSTME["violet"])
+    fig_hour.update_layout(
+        paper_bgcolor="rgba(23,23,36,0.88)",
+        plot_bgcolor="rgba(23,23,36,0.88)",
+        font_color=BOOSTME["text"],
+        xaxis_title="Heure",
+        yaxis_title="Taux d'engagement (%)",
+        margin=dict(l=10, r=10, t=10, b=10),
+    )
+
+    day_eng = (
+        cube.rollup_mean(sel, "jour_semaine", "taux_engagement_pct")
+        .sort_values("jour_semaine")
+    ) if len(sel) else pd.DataFrame(columns=["jour_semaine", "taux_engagement_pct"])
+
+    fig_day = px.line(day_eng, x="jour_semaine", y="taux_engagement_pct", markers=True, title=None)
+    fig_day.update_traces(line_color=BOOSTME["rose"])
+    fig_day.update_layout(
+        paper_bgcolor="rgba(23,23,36,0.88)",
+        plot_bgcolor="rgba(23,23,36,0.88)",
+        font_color=BOOSTME["text"],
+        xaxis_title=None,
+        yaxis_title="Taux d'engagement (%)",
+        margin=dict(l=10, r=10, t=10, b=10),
+    )
+
+    top_chaines = (
+        cube.rollup_sum(sel, "chaine", "engagement_total")
+        .sort_values("engagement_total", ascending=False)
+        .head(15)
+    ) if len(sel) else pd.DataFrame(columns=["chaine", "engagement_total"])
+
+    fig_top = px.bar(top_chaines, x="engagement_total", y="chaine", orientation="h", title=None)
+    fig_top.update_traces(marker_color=BOOSTME["jaune"])
+    fig_top.update_layout(
+        paper_bgcolor="rgba(23,23,36,0.88)",
+        plot_bgcolor="rgba(23,23,36,0.88)",
+        font_color=BOOSTME["text"],
+        xaxis_title="Interactions",
+        yaxis_title=None,
+        margin=dict(l=10, r=10, t=10, b=10),
+    )
+
+    return totals, (fig_cat, fig_hour, fig_day, fig_top)
 
-# =============================
-# PAGE : VIDEOS
-# =============================
 
 def page_videos():
 
@@ -409,10 +550,10 @@ def page_videos():
         st.sidebar.image(str(LOGO_PATH), use_container_width=True)
 
 
-    annees_opts = sorted(videos["annee"].dropna().unique())
-    categories_opts = sorted(videos["categorie"].dropna().unique())
-    chaines_opts = sorted(videos["chaine"].dropna().unique())
-    jours_opts = list(videos["jour_semaine"].cat.categories)
+    videos_index, _ = load_filter_indexes(version, videos, videos_cube)
+    annees_opts = videos_index.options("annee")
+    categories_opts = videos_index.options("categorie")
+    jours_opts = videos_index.options("jour_semaine")
 
     # ✅ Par défaut : seulement 2024, 2025, 2026
     annees = multiselect_simple(
@@ -429,12 +570,7 @@ def page_videos():
         key="categories"
     )
 
-    chaines_sel = multiselect_simple(
-        "Chaînes",
-        chaines_opts,
-        default_values=chaines_opts,
-        key="chaines"
-    )
+    chaines_sel = channel_picker(load_channel_search(version, videos))
 
     jours_sel = multiselect_simple(
         "Jour de publication",
@@ -445,15 +581,10 @@ def page_videos():
 
     heures = st.sidebar.slider("Heure de publication", 0, 23, (0, 23), key="heures")
 
-    # si l'utilisateur a tout décoché un filtre -> df vide (OK)
-    df = videos[
-        (videos["annee"].isin(annees)) &
-        (videos["categorie"].isin(categories)) &
-        (videos["chaine"].isin(chaines_sel)) &
-        (videos["jour_semaine"].isin(jours_sel)) &
-        (videos["heure_publication"].between(heures[0], heures[1]))
-    ].copy()
-
+    # KPIs et graphiques : agrégation des lignes du cube retenues par les filtres
+    # si l'utilisateur a tout décoché un filtre -> cube vide (OK)
+    selections = {"annee": annees, "categorie": categories, "chaine": chaines_sel, "jour_semaine": jours_sel}
+    totals, (fig_cat, fig_hour, fig_day, fig_top) = video_charts(selections, heures, version)
 
     # =============================
     # KPIs
@@ -461,15 +592,15 @@ def page_videos():
     k1, k2, k3, k4 = st.columns(4)
 
     with k1:
-        kpi_card("📹 Vidéos analysées", f"{len(df):,}", BOOSTME["orange"])
+        kpi_card("📹 Vidéos analysées", f"{totals['videos']:,}", BOOSTME["orange"])
     with k2:
-        v = f"{df['views'].mean():,.0f}" if len(df) and "views" in df.columns else "0"
+        v = f"{totals['views_mean']:,.0f}" if totals["videos"] else "0"
         kpi_card("👀 Vues moyennes / vidéo", v, BOOSTME["jaune"])
     with k3:
-        e = f"{df['taux_engagement_pct'].mean():.2f} %" if len(df) else "0"
+        e = f"{totals['taux_mean']:.2f} %" if totals["videos"] else "0"
         kpi_card("⚡ Engagement moyen", e, BOOSTME["rose"])
     with k4:
-        it = f"{df['engagement_total'].sum():,.0f}" if len(df) else "0"
+        it = f"{totals['engagement_total']:,.0f}" if totals["videos"] else "0"
         kpi_card("💬 Interactions totales", it, BOOSTME["violet"])
 
     st.markdown('<div class="bm-divider"></div>', unsafe_allow_html=True)
@@ -478,91 +609,37 @@ def page_videos():
     # CHARTS
     # =============================
     st.subheader("📊 Moyenne de vues par catégorie")
-    cat_views = (
-        df.groupby("categorie", as_index=False)["views"]
-        .mean()
-        .sort_values("views", ascending=False)
-    ) if len(df) and "categorie" in df.columns and "views" in df.columns else pd.DataFrame(columns=["categorie", "views"])
-
-    fig_cat = px.bar(cat_views, x="categorie", y="views", title=None)
-    fig_cat.update_traces(marker_color=BOOSTME["orange"])
-    fig_cat.update_layout(
-        paper_bgcolor="rgba(23,23,36,0.88)",
-        plot_bgcolor="rgba(23,23,36,0.88)",
-        font_color=BOOSTME["text"],
-        xaxis_title=None,
-        yaxis_title="Vues moyennes",
-        margin=dict(l=10, r=10, t=10, b=10),
-    )
     st.plotly_chart(fig_cat, use_container_width=True)
 
     st.subheader("⏰ Engagement moyen par heure")
-    hour_eng = (
-        df.groupby("heure_publication", as_index=False)["taux_engagement_pct"]
-        .mean()
-        .sort_values("heure_publication")
-    ) if len(df) else pd.DataFrame(columns=["heure_publication", "taux_engagement_pct"])
-
-    fig_hour = px.line(hour_eng, x="heure_publication", y="taux_engagement_pct", markers=True, title=None)
-    fig_hour.update_traces(line_color=BOOSTME["violet"])
-    fig_hour.update_layout(
-        paper_bgcolor="rgba(23,23,36,0.88)",
-        plot_bgcolor="rgba(23,23,36,0.88)",
-        font_color=BOOSTME["text"],
-        xaxis_title="Heure",
-        yaxis_title="Taux d'engagement (%)",
-        margin=dict(l=10, r=10, t=10, b=10),
-    )
     st.plotly_chart(fig_hour, use_container_width=True)
 
     st.subheader("📅 Engagement moyen par jour")
-    day_eng = (
-        df.groupby("jour_semaine", as_index=False)["taux_engagement_pct"]
-        .mean()
-        .sort_values("jour_semaine")
-    ) if len(df) else pd.DataFrame(columns=["jour_semaine", "taux_engagement_pct"])
-
-    fig_day = px.line(day_eng, x="jour_semaine", y="taux_engagement_pct", markers=True, title=None)
-    fig_day.update_traces(line_color=BOOSTME["rose"])
-    fig_day.update_layout(
-        paper_bgcolor="rgba(23,23,36,0.88)",
-        plot_bgcolor="rgba(23,23,36,0.88)",
-        font_color=BOOSTME["text"],
-        xaxis_title=None,
-        yaxis_title="Taux d'engagement (%)",
-        margin=dict(l=10, r=10, t=10, b=10),
-    )
     st.plotly_chart(fig_day, use_container_width=True)
 
     st.subheader("🏆 Top chaînes (interactions)")
-    top_chaines = (
-        df.groupby("chaine", as_index=False)["engagement_total"]
-        .sum()
-        .sort_values("engagement_total", ascending=False)
-        .head(15)
-    ) if len(df) else pd.DataFrame(columns=["chaine", "engagement_total"])
-
-    fig_top = px.bar(top_chaines, x="engagement_total", y="chaine", orientation="h", title=None)
-    fig_top.update_traces(marker_color=BOOSTME["jaune"])
-    fig_top.update_layout(
-        paper_bgcolor="rgba(23,23,36,0.88)",
-        plot_bgcolor="rgba(23,23,36,0.88)",
-        font_color=BOOSTME["text"],
-        xaxis_title="Interactions",
-        yaxis_title=None,
-        margin=dict(l=10, r=10, t=10, b=10),
-    )
     st.plotly_chart(fig_top, use_container_width=True)
 
     # =============================
     # TABLE + DEBUG
     # =============================
+    # seule la table détaillée a besoin des lignes vidéo : positions retenues,
+    # et seule la page affichée est extraite et envoyée au navigateur
+    rows = videos_index.select(selections, heures)
+    n_rows = filters.count(rows, len(videos))
+
     with st.expander("🔎 Explorer les données filtrées"):
-        st.dataframe(df, use_container_width=True)
+        n_pages = max(1, -(-n_rows // EXPLORER_PAGE_SIZE))
+        if st.session_state.get("explorer_page", 1) > n_pages:
+            st.session_state["explorer_page"] = 1
+        page = st.number_input(f"Page (sur {n_pages:,})", min_value=1, max_value=n_pages, step=1, key="explorer_page")
+        first = (page - 1) * EXPLORER_PAGE_SIZE
+        st.dataframe(filters.take_page(videos, rows, first, first + EXPLORER_PAGE_SIZE), use_container_width=True)
+        st.caption(f"Lignes {min(first + 1, n_rows):,}–{min(first + EXPLORER_PAGE_SIZE, n_rows):,} sur {n_rows:,}")
 
     with st.expander("🛠️ Debug (volumes)"):
         st.write("Total videos (table):", len(videos))
-        st.write("Après filtres:", len(df))
+        st.write("Après filtres:", n_rows)
         st.write("NaT published_at:", videos["published_at"].isna().sum())
         st.write("NaN annee:", videos["annee"].isna().sum())
         st.write("NaN chaine:", videos["chaine"].isna().sum())
@@ -573,15 +650,30 @@ def page_videos():
 # =============================
 def page_chaines():
     show_header("Top Chaînes Françaises - 2025")
+
+    # Filtre par thèmes : positions des chaînes lues dans l'index inversé
+    # (union / intersection de listes triées, boostme/topics.py)
+    themes = topic_index.counts("topics")
+    themes_sel = st.sidebar.multiselect(
+        "Thèmes", list(themes.index), format_func=lambda t: f"{t} ({themes[t]})", key="chaines_themes"
+    )
+    vue = chaines
+    if themes_sel:
+        tous = len(themes_sel) > 1 and st.sidebar.radio(
+            "Chaînes ayant", ["au moins un thème", "tous les thèmes"], horizontal=True, key="chaines_themes_mode"
+        ) == "tous les thèmes"
+        rows = topic_index.all_of("topics", themes_sel) if tous else topic_index.any_of("topics", themes_sel)
+        vue = chaines.iloc[rows]
+        st.caption(f"{len(vue)} chaînes sur {len(chaines)} pour les thèmes sélectionnés")
     
     # Calcul des KPIs spécifiques aux chaînes
-    # Note : On utilise 'chaines' (le DataFrame global chargé au début)
-    if not chaines.empty:
-        avg_videos = chaines["nb_videos"].mean()
-        avg_subscribers = chaines["subscribers"].mean()
+    # Note : On utilise 'vue' (le DataFrame global 'chaines', filtré par thèmes)
+    if not vue.empty:
+        avg_videos = vue["nb_videos"].mean()
+        avg_subscribers = vue["subscribers"].mean()
         # On s'assure que la colonne views existe dans chaines ou on la calcule
-        avg_views = chaines["views"].mean() if "views" in chaines.columns else 0
-        avg_engagement = chaines["engagement_rate_pct"].mean()
+        avg_views = vue["views"].mean() if "views" in vue.columns else 0
+        avg_engagement = vue["engagement_rate_pct"].mean()
     else:
         avg_videos = avg_subscribers = avg_views = avg_engagement = 0
 
@@ -606,7 +698,7 @@ def page_chaines():
     with g1:
         # Graphique 1 : Top Abonnés
         st.subheader("🏆 Top 10 : le plus d'abonnés")
-        top_subs = chaines.sort_values("subscribers", ascending=False).head(10)
+        top_subs = vue.sort_values("subscribers", ascending=False).head(10)
         # On utilise 'title' ou 'chaine' selon le nom de votre colonne après nettoyage
         col_name = "title" if "title" in top_subs.columns else "chaine"
 
@@ -642,7 +734,7 @@ def page_chaines():
     with g2:
         # Graphique 2 : Top Engagement 
         st.subheader("⚡Top 10 : les plus engageantes")
-        top_eng = chaines.sort_values("engagement_rate_pct", ascending=False).head(10)
+        top_eng = vue.sort_values("engagement_rate_pct", ascending=False).head(10)
         # On utilise 'title' ou 'chaine' selon le nom de votre colonne après nettoyage
         col_name = "title" if "title" in top_subs.columns else "chaine"
         
@@ -673,51 +765,263 @@ def page_chaines():
 
     st.markdown('<div class="bm-divider"></div>', unsafe_allow_html=True)
         
-    # Préparation des données pour le top 10
-    top_30_subscribers = chaines.sort_values("subscribers", ascending=False).head(30)
-    
-    # On crée le rectangle avec du HTML
-    
-
     st.subheader("👤 Focus Influenceur")
-    # Sélecteur stylisé
+    # Toutes les chaînes : recherche côté serveur, les 30 premiers résultats dans le sélecteur
+    # (sans recherche : les 30 chaînes les plus suivies)
+    focus_search, focus_ids = load_focus_search(files_version)
+    query = st.text_input("Rechercher une chaîne", key="focus_recherche")
+    matches, total = focus_search.search(query, k=30)
+    if not matches:
+        st.info("Aucune chaîne ne correspond à la recherche.")
+        return
     option = st.selectbox(
         "Sélectionnez une chaîne pour voir les détails :",
-        top_30_subscribers['title'].unique(),
+        matches,
         index=0
     )
 
-    # Extraction des détails
-    details = top_30_subscribers[top_30_subscribers['title'] == option].iloc[0]
+    # Extraction des détails : chiffres depuis la table chaines, textes + dernières vidéos
+    # lus dans la fiche de la chaîne (un seul enregistrement)
+    channel_id = focus_ids[option]
+    infos = chaines[chaines["id"] == channel_id].iloc[0]
+    fiche = channel_details.get(channel_id) or {}
 
     # 2) Affichage du bloc "À propos"
     st.markdown(f"### À propos de {option}")
-    st.markdown(f"<span style='color:{BOOSTME['violet']}; font-weight:bold;'>🏷️ {details['topics']}</span>", unsafe_allow_html=True)
-    st.write(details['description'])
+    st.markdown(f"<span style='color:{BOOSTME['violet']}; font-weight:bold;'>🏷️ {fiche.get('topics', '')}</span>", unsafe_allow_html=True)
+    st.write(fiche.get("description") or "")
     
     # 3) KPIs de l'influenceur
     c1, c2, c3, c4 = st.columns(4)
 
     with c1:
-        kpi_card("📹 Vidéos", f"{details['nb_videos']:,}", BOOSTME["orange"])
+        kpi_card("📹 Vidéos", f"{infos['nb_videos']:,}", BOOSTME["orange"])
     with c2:
-        kpi_card("👥 Abonnés", f"{details['subscribers']:,}", BOOSTME["jaune"])
+        kpi_card("👥 Abonnés", f"{infos['subscribers']:,}", BOOSTME["jaune"])
     with c3:
         # Vérification si 'views' existe pour éviter les erreurs
-        v_val = f"{details['views']:,}" if 'views' in details else "N/A"
+        v_val = f"{infos['views']:,}" if 'views' in infos else "N/A"
         kpi_card("👀 Vues totales", v_val, BOOSTME["rose"])
     with c4:
         # On utilise le taux d'engagement formaté
-        e_val = f"{details['engagement_rate_pct']:.2f} %" if 'engagement_rate_pct' in details else "N/A"
+        e_val = f"{infos['engagement_rate_pct']:.2f} %" if 'engagement_rate_pct' in infos else "N/A"
         kpi_card("⚡ Engagement", e_val, BOOSTME["violet"])
 
+    # 4) Dernières vidéos de la chaîne dans nos données
+    if fiche.get("recent_videos"):
+        st.markdown("#### 🎬 Dernières vidéos")
+        recent = pd.DataFrame(fiche["recent_videos"])
+        recent["published_at"] = pd.to_datetime(recent["published_at"], errors="coerce").dt.strftime("%Y-%m-%d")
+        st.dataframe(recent, use_container_width=True, hide_index=True)
+
     st.markdown("</div>", unsafe_allow_html=True)
 
+# =============================
+# PAGE : TENDANCES
+# =============================
+TREND_STATS = {"views": "Vues", "likes": "Likes"}
+
+
+def page_trending():
+    show_header("Tendances : les vidéos et chaînes qui accélèrent")
+
+    trends, last_day = load_trends(stats_version())
+    if last_day is None:
+        st.info(
+            "Pas encore d'historique des snapshots : lancer nettoyage.ipynb "
+            "ou `python -m boostme.timeseries data/new_videos data/video_stats`."
+        )
+        return
+
+    stat = st.sidebar.radio("Mesure", list(TREND_STATS), format_func=TREND_STATS.get, key="trend_stat")
+    score = st.sidebar.radio(
+        "Classement", ["velocity", "acceleration"],
+        format_func={"velocity": "Vitesse (/ jour)", "acceleration": "Accélération"}.get,
+        key="trend_score",
+    )
+    cat_names = dict(zip(tables.cats["category_id"].astype(str), tables.cats["name"]))
+    videos_trend = trends[stat]
+    cat_opts = sorted(videos_trend["category_id"].unique(), key=lambda c: cat_names.get(c, c))
+    categorie = st.sidebar.selectbox(
+        "Catégorie", ["__toutes__", *cat_opts],
+        format_func=lambda c: "Toutes" if c == "__toutes__" else cat_names.get(c, f"Catégorie {c}"),
+        key="trend_categorie",
+    )
+    k = st.sidebar.slider("Taille du classement", 5, 50, trending.TOP_K, key="trend_k")
+
+    if categorie != "__toutes__":
+        videos_trend = videos_trend[videos_trend["category_id"] == categorie]
+    channels_trend = trending.channel_trends(videos_trend, by_category=False)
+    top_videos = trending.top_k(videos_trend, score, k)
+    top_channels = trending.top_k(channels_trend, score, k)
+
+    titles, chaines_names = load_names(version, videos)
+    label = TREND_STATS[stat].lower()
+
+    # =============================
+    # KPIs
+    # =============================
+    k1, k2, k3, k4 = st.columns(4)
+    with k1:
+        kpi_card("📹 Vidéos mesurées", f"{len(videos_trend):,}", BOOSTME["orange"])
+    with k2:
+        kpi_card("📅 Dernier snapshot", timeseries.day_name(last_day), BOOSTME["jaune"])
+    with k3:
+        total = videos_trend["velocity"].sum()
+        kpi_card(f"🚀 {TREND_STATS[stat]} / jour (total)", f"{total:,.0f}", BOOSTME["rose"])
+    with k4:
+        kpi_card("🏆 Chaînes mesurées", f"{len(channels_trend):,}", BOOSTME["violet"])
+
+    st.markdown('<div class="bm-divider"></div>', unsafe_allow_html=True)
+
+    # =============================
+    # CHAINES
+    # =============================
+    st.subheader(f"🔥 Top chaînes : {label} gagnés par jour" if score == "velocity" else "🔥 Top chaînes : accélération")
+    top_channels["chaine"] = top_channels["channel_id"].map(chaines_names).fillna(top_channels["channel_id"])
+    fig = px.bar(top_channels, x=score, y="chaine", orientation="h", title=None)
+    fig.update_traces(marker_color=BOOSTME["orange"])
+    fig.update_layout(
+        paper_bgcolor="rgba(23,23,36,0.88)",
+        plot_bgcolor="rgba(23,23,36,0.88)",
+        font_color=BOOSTME["text"],
+        yaxis={"categoryorder": "total ascending"},
+        xaxis_title=f"{TREND_STATS[stat]} / jour" if score == "velocity" else f"{TREND_STATS[stat]} / jour²",
+        yaxis_title=None,
+        margin=dict(l=10, r=10, t=10, b=10),
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+    # =============================
+    # VIDEOS
+    # =============================
+    st.subheader("🎬 Top vidéos")
+    table = pd.DataFrame({
+        "Rang": top_videos["rang"],
+        "Vidéo": top_videos["video_id"].map(titles).fillna(top_videos["video_id"]),
+        "Chaîne": top_videos["channel_id"].map(chaines_names).fillna(top_videos["channel_id"]),
+        "Catégorie": top_videos["category_id"].map(cat_names),
+        f"{TREND_STATS[stat]}": top_videos["value"],
+        f"{TREND_STATS[stat]} / jour": top_videos["velocity"].round(0),
+        "Accélération": top_videos["acceleration"].round(0),
+    })
+    st.dataframe(table, use_container_width=True, hide_index=True)
+    st.caption(
+        "Vitesse : gain par jour entre les deux derniers snapshots de la vidéo ; "
+        "accélération : variation de cette vitesse (trois snapshots nécessaires). "
+        "Seules les vidéos présentes dans le dernier snapshot sont classées."
+    )
+
+
+# =============================
+# PAGE : RECHERCHE
+# =============================
+FACET_OPTIONS = 200  # termes proposés par facette (les plus fréquents parmi les résultats)
+SEARCH_RESULTS = 50
+
+
+def facet_selection(index, labels: dict, key: str):
+    """
+    Facettes dans la sidebar, avec pour chaque terme le nombre de résultats
+    si on l'ajoutait (lignes retenues par les autres facettes). "mots" : texte
+    libre, tous les mots requis. Renvoie les positions retenues (None = toutes).
+    """
+    selections = {}
+    if "mots" in labels:
+        selections["mots"] = search.tokenize(st.sidebar.text_input(labels["mots"], key=f"{key}_mots"))
+    facets_list = [col for col in labels if col != "mots"]
+    for col in facets_list:
+        selections[col] = st.session_state.get(f"{key}_{col}", [])
+
+    for col in facets_list:
+        others = index.select({c: t for c, t in selections.items() if c != col}, match_all=["mots"])
+        counts = index.counts(col, others)
+        counts = counts[counts > 0].head(FACET_OPTIONS)
+        st.sidebar.multiselect(
+            labels[col],
+            list(dict.fromkeys([*selections[col], *counts.index])),
+            format_func=lambda t, counts=counts: f"{t} ({counts.get(t, 0):,})",
+            key=f"{key}_{col}",
+        )
+    return index.select(selections, match_all=["mots"])
+
+
+def page_search():
+    show_header("Recherche : hashtags, thèmes et mots du titre")
+
+    cible = st.sidebar.radio("Rechercher", ["Vidéos", "Chaînes"], horizontal=True, key="recherche_cible")
+    if cible == "Vidéos":
+        index, table, labels = load_video_facets(version, videos), videos, facets.VIDEO_FACETS
+    else:
+        index, table, labels = topic_index, chaines, facets.CHANNEL_FACETS
+    start = time.perf_counter()
+    rows = facet_selection(index, labels, f"recherche_{'videos' if cible == 'Vidéos' else 'chaines'}")
+    found = table if rows is None else table.iloc[rows]
+    elapsed = (time.perf_counter() - start) * 1000
+    st.caption(
+        f"{len(found):,} {cible.lower()} sur {len(table):,} "
+        f"(requête et comptes des facettes : {elapsed:.0f} ms). "
+        "Plusieurs termes d'une facette : l'un ou l'autre ; entre facettes : tous."
+    )
+
+    if cible == "Vidéos":
+        k1, k2, k3, k4 = st.columns(4)
+        with k1:
+            kpi_card("📹 Vidéos", f"{len(found):,}", BOOSTME["orange"])
+        with k2:
+            kpi_card("👀 Vues totales", f"{found['views'].sum():,.0f}", BOOSTME["jaune"])
+        with k3:
+            kpi_card("⚡ Engagement moy.", f"{found['taux_engagement_pct'].mean():.2f} %" if len(found) else "N/A", BOOSTME["rose"])
+        with k4:
+            kpi_card("📺 Chaînes", f"{found['channel_id'].nunique():,}", BOOSTME["violet"])
+        st.markdown('<div class="bm-divider"></div>', unsafe_allow_html=True)
+
+        st.subheader("🎬 Vidéos les plus vues")
+        top = found.nlargest(SEARCH_RESULTS, "views")
+        st.dataframe(pd.DataFrame({
+            "Vidéo": top["title"],
+            "Chaîne": top["channel"].astype(str),
+            "Catégorie": top["categorie"],
+            "Publiée le": top["published_at"].dt.strftime("%Y-%m-%d"),
+            "Vues": top["views"],
+            "Engagement (%)": top["taux_engagement_pct"].round(2),
+        }), use_container_width=True, hide_index=True)
+    else:
+        k1, k2, k3, k4 = st.columns(4)
+        with k1:
+            kpi_card("📺 Chaînes", f"{len(found):,}", BOOSTME["orange"])
+        with k2:
+            kpi_card("👥 Abonnés moy.", f"{found['subscribers'].mean():,.0f}" if len(found) else "N/A", BOOSTME["jaune"])
+        with k3:
+            kpi_card("📊 Vidéos / chaîne", f"{found['nb_videos'].mean():,.0f}" if len(found) else "N/A", BOOSTME["rose"])
+        with k4:
+            kpi_card("⚡ Engagement moy.", f"{found['engagement_rate_pct'].mean():.2f} %" if len(found) else "N/A", BOOSTME["violet"])
+        st.markdown('<div class="bm-divider"></div>', unsafe_allow_html=True)
+
+        st.subheader("🏆 Chaînes les plus suivies")
+        top = found.nlargest(SEARCH_RESULTS, "subscribers")
+        st.dataframe(pd.DataFrame({
+            "Chaîne": top["title"],
+            "Abonnés": top["subscribers"],
+            "Vidéos": top["nb_videos"],
+            "Engagement (%)": top["engagement_rate_pct"].round(2),
+            "Thèmes": [", ".join(topic_index.terms_of("topics", i)) for i in chaines.index.get_indexer(top.index)],
+        }), use_container_width=True, hide_index=True)
+
+
 # =============================
 # MAIN NAVIGATION
 # =============================
 pg = st.navigation([
     st.Page(page_videos, title="Analyse Vidéos", icon="🎥"),
-    st.Page(page_chaines, title="Top Chaînes Françaises", icon="🏆")
+    st.Page(page_chaines, title="Top Chaînes Françaises", icon="🏆"),
+    st.Page(page_trending, title="Tendances", icon="🔥"),
+    st.Page(page_search, title="Recherche", icon="🔎"),
 ])
-pg.run()
\ No newline at end of file
+pg.run()
+
+# rechargement explicite (les nouveaux fichiers du pipeline sont de toute façon détectés par data_version,
+# les nouveaux snapshots par tables.refresh)
+st.sidebar.button("🔄 Recharger les données", on_click=reload_data, key="reload_data")
+for name, error in tables.errors.items():
+    st.sidebar.warning(f"Snapshot {name} ignoré : {error}")
\ No newline at end of file
@@ -1,8 +1,18 @@
+import sys
+from pathlib import Path
+
 import streamlit as st
 import pandas as pd
 import numpy as np
 from datetime import datetime
 
+# package boostme (racine du repo) : registre des colonnes boostme/schema.py
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from boostme import schema  # noqa: E402
+
 # -----------------------------
 # Page config
 # -----------------------------
@@ -101,8 +111,8 @@ st.markdown(
 REQUIRED_COLUMNS = [
     "category_id",
     "views",
-    "Taux d'engagement (%)",
-    "Engagement total",
+    "taux_engagement_pct",
+    "engagement_total",
     "channel",
     "published_at",
 ]
@@ -128,44 +138,6 @@ def _fr_float(n: float, decimals: int = 2) -> str:
     except Exception:
         return "—"
 
-def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
-    """
-    The PBIX uses some column names with spaces/accents.
-    Here we accept a few common variants and standardize them.
-    """
-    rename_map = {
-        "taux_engagement": "Taux d'engagement (%)",
-        "taux d'engagement (%)": "Taux d'engagement (%)",
-        "engagement_total": "Engagement total",
-        "engagement total": "Engagement total",
-        "publishedAt": "published_at",
-        "published_at": "published_at",
-        "date_publication": "published_at",
-        "categorie_id": "category_id",
-        "categoryId": "category_id",
-        "vues": "views",
-        "views": "views",
-        "chaine": "channel",
-        "channel": "channel",
-        "jour de la semaine": "Jour de la semaine",
-        "Jour de la semaine": "Jour de la semaine",
-        "heure": "Heure",
-        "Heure": "Heure",
-        "category_name": "cats.name",
-        "categorie": "cats.name",
-        "cats.name": "cats.name",
-    }
-
-    # Case-insensitive rename
-    lower_to_actual = {c.lower(): c for c in df.columns}
-    final_rename = {}
-    for k, v in rename_map.items():
-        if k in lower_to_actual:
-            final_rename[lower_to_actual[k]] = v
-    df = df.rename(columns=final_rename)
-
-    return df
-
 @st.cache_data(show_spinner=False)
 def load_data(uploaded_file) -> pd.DataFrame:
     if uploaded_file is None:
@@ -179,30 +151,26 @@ def load_data(uploaded_file) -> pd.DataFrame:
     else:
         raise ValueError("Format non supporté (CSV/Parquet uniquement).")
 
-    df = normalize_columns(df)
-
-    # Parse published_at to datetime (if present)
-    if "published_at" in df.columns:
-        df["published_at"] = pd.to_datetime(df["published_at"], errors="coerce", utc=True).dt.tz_convert(None)
+    # Exports with only the joined channel name ("chaine") use it as the channel
+    if "channel" not in df.columns and "chaine" in df.columns:
+        df = df.rename(columns={"chaine": "channel"})
+    # Canonical names and types from the shared registry: the PBIX names
+    # ("Taux d'engagement (%)", "Engagement total", "cats.name"...) are aliases
+    df = schema.conform(df, "videos", required=REQUIRED_COLUMNS)
+    df["published_at"] = df["published_at"].dt.tz_convert(None)
 
     # Derive Year / Weekday / Hour if missing (PBIX slicers)
-    if "published_at" in df.columns:
-        if "Année" not in df.columns:
-            df["Année"] = df["published_at"].dt.year
-        if "Jour de la semaine" not in df.columns:
-            # French weekday names
-            fr_weekdays = {
-                0: "Lundi", 1: "Mardi", 2: "Mercredi", 3: "Jeudi",
-                4: "Vendredi", 5: "Samedi", 6: "Dimanche"
-            }
-            df["Jour de la semaine"] = df["published_at"].dt.weekday.map(fr_weekdays)
-        if "Heure" not in df.columns:
-            df["Heure"] = df["published_at"].dt.hour
-
-    # Coerce numeric columns
-    for col in ["views", "Taux d'engagement (%)", "Engagement total"]:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors="coerce")
+    if "annee" not in df.columns:
+        df["annee"] = df["published_at"].dt.year
+    if "jour_semaine" not in df.columns:
+        # French weekday names
+        fr_weekdays = {
+            0: "Lundi", 1: "Mardi", 2: "Mercredi", 3: "Jeudi",
+            4: "Vendredi", 5: "Samedi", 6: "Dimanche"
+        }
+        df["jour_semaine"] = df["published_at"].dt.weekday.map(fr_weekdays)
+    if "heure_publication" not in df.columns:
+        df["heure_publication"] = df["published_at"].dt.hour
 
     return df
 
@@ -225,7 +193,12 @@ def kpi_card(title: str, value: str, subtitle: str | None = None):
 st.sidebar.header("Données")
 uploaded = st.sidebar.file_uploader("Importer le dataset vidéos (CSV/Parquet)", type=["csv", "parquet"])
 
-df = load_data(uploaded)
+try:
+    df = load_data(uploaded)
+except ValueError as exc:
+    # format non supporté ou colonne obligatoire absente (message de schema.conform)
+    st.error(str(exc))
+    st.stop()
 
 # -----------------------------
 # Header area (logo + title like PBIX)
@@ -251,8 +224,9 @@ if df.empty:
     st.info(
         "Importe ton dataset (CSV/Parquet) pour afficher les KPIs.\n\n"
         "Colonnes attendues (au minimum) :\n"
-        "- category_id\n- views\n- Taux d'engagement (%)\n- Engagement total\n- channel\n- published_at\n\n"
-        "Optionnel : cats.name (nom de catégorie), Jour de la semaine, Heure"
+        "- category_id\n- views\n- taux_engagement_pct\n- engagement_total\n- channel\n- published_at\n\n"
+        "Optionnel : categorie (nom de catégorie), jour_semaine, heure_publication\n\n"
+        "Les noms du PBIX (Taux d'engagement (%), Engagement total, cats.name...) sont aussi acceptés."
     )
     st.stop()
 
@@ -271,12 +245,12 @@ st.markdown(
 c1, c2, c3, c4, c5 = st.columns([1, 1, 1, 1, 1])
 
 # Year slicer (published_at year)
-years = sorted([y for y in df.get("Année", pd.Series(dtype=int)).dropna().unique()])
+years = sorted([y for y in df.get("annee", pd.Series(dtype=int)).dropna().unique()])
 with c1:
     year_sel = st.multiselect("Année", years, default=years[-1:] if years else years)
 
 # Category name slicer
-cats = sorted(df.get("cats.name", pd.Series(dtype=str)).dropna().unique())
+cats = sorted(df.get("categorie", pd.Series(dtype=str)).dropna().unique())
 with c2:
     cat_sel = st.multiselect("Catégorie", cats, default=[])
 
@@ -287,27 +261,27 @@ with c3:
 
 # Weekday slicer
 weekdays = ["Lundi","Mardi","Mercredi","Jeudi","Vendredi","Samedi","Dimanche"]
-avail_weekdays = [d for d in weekdays if d in set(df.get("Jour de la semaine", pd.Series(dtype=str)).dropna().unique())]
+avail_weekdays = [d for d in weekdays if d in set(df.get("jour_semaine", pd.Series(dtype=str)).dropna().unique())]
 with c4:
     day_sel = st.multiselect("Jour", avail_weekdays, default=[])
 
 # Hour slicer
-hours = sorted([int(h) for h in df.get("Heure", pd.Series(dtype=float)).dropna().unique() if pd.notna(h)])
+hours = sorted([int(h) for h in df.get("heure_publication", pd.Series(dtype=float)).dropna().unique() if pd.notna(h)])
 with c5:
     hour_sel = st.multiselect("Heure", hours, default=[])
 
 fdf = df.copy()
 
-if year_sel and "Année" in fdf.columns:
-    fdf = fdf[fdf["Année"].isin(year_sel)]
-if cat_sel and "cats.name" in fdf.columns:
-    fdf = fdf[fdf["cats.name"].isin(cat_sel)]
+if year_sel and "annee" in fdf.columns:
+    fdf = fdf[fdf["annee"].isin(year_sel)]
+if cat_sel and "categorie" in fdf.columns:
+    fdf = fdf[fdf["categorie"].isin(cat_sel)]
 if ch_sel and "channel" in fdf.columns:
     fdf = fdf[fdf["channel"].isin(ch_sel)]
-if day_sel and "Jour de la semaine" in fdf.columns:
-    fdf = fdf[fdf["Jour de la semaine"].isin(day_sel)]
-if hour_sel and "Heure" in fdf.columns:
-    fdf = fdf[fdf["Heure"].isin(hour_sel)]
+if day_sel and "jour_semaine" in fdf.columns:
+    fdf = fdf[fdf["jour_semaine"].isin(day_sel)]
+if hour_sel and "heure_publication" in fdf.columns:
+    fdf = fdf[fdf["heure_publication"].isin(hour_sel)]
 
 # -----------------------------
 # KPIs (exactly the 4 cards in the PBIX)
@@ -325,13 +299,13 @@ with k2:
     kpi_card("Moyenne du nombre de vues par vidéo", value)
 
 with k3:
-    # Power BI: Avg(videos.Taux d'engagement (%))
-    value = _fr_float(fdf["Taux d'engagement (%)"].mean(), decimals=2) + " %"
+    # Power BI: Avg(videos.Taux d'engagement (%)) -> taux_engagement_pct
+    value = _fr_float(fdf["taux_engagement_pct"].mean(), decimals=2) + " %"
     kpi_card("Taux d'engagement moyen", value)
 
 with k4:
-    # Power BI: Sum(videos.Engagement total)
-    value = _fr_int(fdf["Engagement total"].sum())
+    # Power BI: Sum(videos.Engagement total) -> engagement_total
+    value = _fr_int(fdf["engagement_total"].sum())
     kpi_card("Nombre total d'intéractions", value)
 
 st.markdown("<br/>", unsafe_allow_html=True)
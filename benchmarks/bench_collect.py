@@ -0,0 +1,119 @@
+"""
+Benchmark des collecteurs contre le faux serveur YouTube (aucun quota réel).
+
+Pour chaque collecteur : nombre de requêtes, requêtes/s, temps total,
+unités de quota consommées et unités de quota par vidéo collectée.
+
+    python benchmarks/bench_collect.py --latency 0.05 --error-rate 0.02
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from boostme import youtube  # noqa: E402
+from boostme.http_cache import ResponseCache  # noqa: E402
+from boostme.seen import SeenVideos  # noqa: E402
+from boostme.fake_api import FakeYouTubeData, FakeYouTubeServer  # noqa: E402
+
+NICHE_KEYWORDS = ["gaming", "jeux video", "football", "film", "musique"]
+# niches qui se recouvrent (mêmes vidéos trouvées par plusieurs niches)
+NICHES = {
+    "jeux video": ["jeux video", "gaming"],
+    "gaming": ["gaming", "gameplay"],
+    "sport": ["football", "sport"],
+}
+
+
+def collect_niches(client, target: int, seen_path=None) -> list:
+    """Boucle des notebooks de collecte : search puis détails, niche par niche."""
+    seen = SeenVideos(seen_path) if seen_path else None
+    rows = []
+    for keywords in NICHES.values():
+        ids = youtube.collect_niche_videos(client, keywords, target=target)
+        fetched = youtube.fetch_video_details(client, ids, seen=seen)
+        rows.extend(fetched.to_dict("records"))
+        if seen is not None and len(fetched):
+            seen.mark(fetched["video_id"])  # les notebooks marquent une fois le CSV de la niche écrit
+    if seen is not None:
+        seen.close()
+    return rows
+
+
+def scenarios(data: FakeYouTubeData, args) -> dict:
+    """Collecteur -> fonction(client) renvoyant les vidéos collectées."""
+    cats = pd.read_csv(ROOT_DIR / "data" / "cats.csv")
+    video_ids = data.videos.index[: args.videos].tolist()
+    playlists = data.chaines["uploads_playlist"].dropna().head(args.channels).tolist()
+    return {
+        "get_popular_videos": lambda client: youtube.collect_popular_videos(
+            client, cats, max_workers=args.workers
+        ),
+        "collect_niche_videos": lambda client: youtube.collect_niche_videos(
+            client, NICHE_KEYWORDS, target=args.target
+        ),
+        "fetch_video_details": lambda client: youtube.fetch_video_details(client, video_ids),
+        "collect_niches": lambda client: collect_niches(client, args.target, args.seen),
+        "get_stats_recent_videos": lambda client: youtube.get_stats_recent_videos(client, playlists),
+    }
+
+
+def run(args) -> pd.DataFrame:
+    data = FakeYouTubeData.from_csvs()
+    results = []
+    with FakeYouTubeServer(
+        data, latency=args.latency, jitter=args.jitter, error_rate=args.error_rate, daily_quota=args.daily_quota
+    ) as server:
+        for name, collect in scenarios(data, args).items():
+            if args.only and name not in args.only:
+                continue
+            server.reset_stats()
+            cache = ResponseCache(args.cache) if args.cache else None
+            client = youtube.YouTubeClient("bench", base_url=server.url, rate=args.rate, backoff=0.05, cache=cache)
+            start = time.perf_counter()
+            collected = len(collect(client))
+            wall = time.perf_counter() - start
+            client.close()
+            results.append({
+                "collecteur": name,
+                "vidéos": collected,
+                "requêtes": client.requests_made,
+                "req/s": client.requests_made / wall if wall else 0,
+                "temps (s)": wall,
+                "quota": client.quota_used,
+                "quota/vidéo": client.quota_used / collected if collected else float("nan"),
+                "cache": client.cache_hits,
+                "erreurs 5xx": server.errors,
+            })
+    return pd.DataFrame(results)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.05, help="latence serveur par requête (s)")
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="proportion de réponses 503")
+    parser.add_argument("--daily-quota", type=int, default=1_000_000)
+    parser.add_argument("--rate", type=float, default=50, help="requêtes/s côté client (token bucket)")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--target", type=int, default=1000, help="vidéos par niche (search)")
+    parser.add_argument("--videos", type=int, default=2000, help="IDs pour fetch_video_details")
+    parser.add_argument("--channels", type=int, default=100, help="playlists pour get_stats_recent_videos")
+    parser.add_argument("--only", nargs="*", help="ne lancer que ces collecteurs")
+    parser.add_argument("--cache", help="fichier ResponseCache (relancer pour mesurer un rerun)")
+    parser.add_argument("--seen", help="fichier SeenVideos partagé entre niches (relancer pour mesurer un rerun)")
+    args = parser.parse_args(argv)
+
+    results = run(args)
+    with pd.option_context("display.width", 160, "display.float_format", "{:,.2f}".format):
+        print(results.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,4 @@
+"""
+Outils partagés BoostMe : pipeline de collecte / nettoyage et chargement
+rapide des données pour le dashboard Streamlit.
+"""
@@ -0,0 +1,83 @@
+"""
+Point de reprise d'une collecte par niche (search puis videos.list).
+
+Sauvegardé après chaque page / paquet :
+- state.json : mot-clé en cours, pageToken suivant, IDs déjà collectés,
+  IDs retenus pour les détails, nombre de paquets de détails déjà récupérés
+- details.jsonl : lignes des paquets de détails déjà récupérés
+
+Après une exception ou un quota épuisé, relancer la même collecte reprend
+exactement au même endroit : les pages de search déjà payées ne sont pas
+redemandées.
+"""
+import json
+import os
+from pathlib import Path
+
+STATE_FILE = "state.json"
+DETAILS_FILE = "details.jsonl"
+
+
+class CollectionCheckpoint:
+    """
+    Point de reprise d'une collecte, dans son propre dossier.
+    - job : description de la collecte (mots-clés, cible...) ; un dossier
+      contenant une autre collecte lève une ValueError
+    """
+
+    def __init__(self, directory, **job):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.state_path = self.directory / STATE_FILE
+        self.details_path = self.directory / DETAILS_FILE
+        self.job = json.loads(json.dumps(job))
+
+        if self.state_path.exists():
+            self.state = json.loads(self.state_path.read_text(encoding="utf-8"))
+            if self.state["job"] != self.job:
+                raise ValueError(
+                    f"Le point de reprise {self.directory} correspond à une autre collecte : {self.state['job']}"
+                )
+        else:
+            self.state = {
+                "job": self.job,
+                "keyword_index": 0,
+                "page_token": None,
+                "video_ids": [],
+                "search_done": False,
+                "detail_ids": None,
+                "batches_done": 0,
+                "details_size": 0,
+            }
+
+    def save(self, **changes) -> None:
+        # écriture atomique : jamais d'état à moitié écrit
+        self.state.update(changes)
+        tmp_path = self.state_path.with_name(STATE_FILE + ".tmp")
+        tmp_path.write_text(json.dumps(self.state, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, self.state_path)
+
+    def append_rows(self, rows: list) -> None:
+        """Ajoute un paquet de détails ; ce qui a été écrit après le dernier état sauvegardé est écarté."""
+        with open(self.details_path, "a+b") as f:
+            f.truncate(self.state["details_size"])
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False).encode("utf-8") + b"\n")
+            size = f.tell()
+        self.save(batches_done=self.state["batches_done"] + 1, details_size=size)
+
+    def rows(self) -> list:
+        if not self.details_path.exists():
+            return []
+        with open(self.details_path, "rb") as f:
+            data = f.read(self.state["details_size"])
+        return [json.loads(line) for line in data.splitlines() if line]
+
+    def clear(self) -> None:
+        """Collecte terminée : supprime le point de reprise."""
+        for path in (self.state_path, self.details_path):
+            path.unlink(missing_ok=True)
+        try:
+            self.directory.rmdir()
+        except OSError:
+            pass
@@ -0,0 +1,73 @@
+"""
+Fusion des CSV de CSV_Categories_clean/ en videos.csv (Concate.ipynb).
+
+Le notebook chargeait tous les fichiers en DataFrames, les concaténait puis
+dédoublonnait : la mémoire montait à plusieurs fois la taille du résultat et
+grossissait avec chaque nouveau fichier de catégorie. Ici les fichiers sont
+lus par morceaux, en texte brut (dtype=str : types figés, valeurs recopiées
+telles quelles), et les lignes écrites au fil de l'eau ; seul l'ensemble des
+video_id déjà écrits reste en mémoire.
+
+Même résultat que concat + drop_duplicates(keep="first") : colonnes dans
+l'ordre d'apparition (colonnes absentes d'un fichier laissées vides), première
+ligne de chaque vidéo gardée dans l'ordre des fichiers.
+
+    rows, nulls = concat.concat_csv(sorted(glob.glob("CSV_Categories_clean/*.csv")), "videos.csv")
+"""
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from boostme import durations
+
+CHUNKSIZE = 50_000
+
+
+def union_columns(paths, dropped=durations.DROPPED_COLUMNS) -> list:
+    """Colonnes de tous les fichiers, dans l'ordre d'apparition (seuls les en-têtes sont lus)."""
+    columns = {}
+    for path in paths:
+        for col in pd.read_csv(path, nrows=0).columns:
+            if col not in dropped:
+                columns.setdefault(col, None)
+    return list(columns)
+
+
+def concat_csv(paths, out_path, key: str = "video_id", chunksize: int = CHUNKSIZE) -> tuple:
+    """
+    Écrit dans out_path les lignes des fichiers `paths`, sans doublon de `key`.
+    Renvoie (nombre de lignes écrites, nombre de valeurs vides par colonne).
+    """
+    paths = [Path(p) for p in paths]
+    columns = union_columns(paths)
+    seen = set()
+    nulls = pd.Series(0, index=columns, dtype="int64")
+    rows = 0
+
+    # fichier temporaire + os.replace : videos.csv n'est jamais visible à moitié écrit
+    tmp_path = str(out_path) + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8", newline="") as out:
+        pd.DataFrame(columns=columns).to_csv(out, index=False)
+        for path in paths:
+            for chunk in pd.read_csv(path, dtype=str, keep_default_na=False, chunksize=chunksize):
+                # test d'appartenance ligne par ligne : proportionnel au morceau, pas à l'ensemble
+                keys = chunk[key].to_numpy(dtype=object)
+                new = np.fromiter((k not in seen for k in keys), dtype=bool, count=len(keys))
+                chunk = chunk[new].drop_duplicates(subset=[key], keep="first")
+                if chunk.empty:
+                    continue
+                seen.update(chunk[key])
+                chunk = chunk.reindex(columns=columns, fill_value="")
+                nulls += (chunk == "").sum()
+                chunk.to_csv(out, index=False, header=False)
+                rows += len(chunk)
+    os.replace(tmp_path, out_path)
+    return rows, nulls
+
+
+if __name__ == "__main__":
+    source = Path(sys.argv[1] if len(sys.argv) > 1 else "CSV_Categories_clean")
+    concat_csv(sorted(source.glob("*.csv")), sys.argv[2] if len(sys.argv) > 2 else "videos.csv")
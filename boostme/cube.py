@@ -0,0 +1,108 @@
+"""
+Cube pré-agrégé des vidéos pour la page "Laboratoire d'influenceurs".
+
+Une ligne par combinaison (annee, categorie, chaine, jour_semaine,
+heure_publication) avec des sommes et des comptes : les filtres de la
+sidebar portent tous sur ces dimensions, donc KPIs et graphiques se
+calculent en sommant les lignes du cube retenues (boostme/filters.py),
+sans reparcourir les vidéos. Les moyennes sont recomposées (somme / nombre
+de valeurs non manquantes), comme DataFrame.mean qui ignore les NaN.
+"""
+from pathlib import Path
+
+import pandas as pd
+
+from boostme import store
+
+CUBE_FILE = "videos_cube.arrow"
+
+DIMENSIONS = ["annee", "categorie", "chaine", "jour_semaine", "heure_publication"]
+# mesure -> colonnes du cube (somme, nombre de valeurs)
+MEASURES = {"views": "views", "taux_engagement_pct": "taux", "engagement_total": "engagement"}
+
+
+def build_cube(videos: pd.DataFrame) -> pd.DataFrame:
+    """
+    Agrège videos_enriched. Les vidéos sans année / heure / jour (date
+    manquante) ne passent jamais les filtres : elles ne sont pas dans le cube.
+    """
+    df = videos[DIMENSIONS].copy()
+    df["n"] = 1
+    for measure, name in MEASURES.items():
+        df[f"{name}_sum"] = videos[measure].fillna(0)
+        df[f"{name}_n"] = videos[measure].notna().astype("int64")
+
+    cube = df.groupby(DIMENSIONS, observed=True, sort=False).sum().reset_index()
+    return cube
+
+
+def _categories(dtype: pd.CategoricalDtype, values) -> pd.CategoricalDtype:
+    # catégories de `dtype` complétées de `values` (triées si non ordonnées)
+    present = pd.Index(pd.Series(values).astype(object).dropna().unique())
+    return pd.CategoricalDtype(dtype.categories.union(present, sort=not dtype.ordered), ordered=dtype.ordered)
+
+
+def update_cube(cube: pd.DataFrame, added: pd.DataFrame, removed: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cube après remplacement de vidéos : on ajoute les agrégats des lignes
+    ajoutées et on retranche ceux des lignes remplacées (sommes et comptes sont
+    additifs), sans réagréger toute la table. Les cellules vidées disparaissent.
+    - added : lignes aux catégories de la nouvelle table (store.union_categories),
+      le cube garde alors les dtypes de build_cube sur cette table
+    """
+    removed = build_cube(removed)
+    measures = [c for c in removed.columns if c not in DIMENSIONS]
+    removed[measures] = -removed[measures]
+
+    parts = [cube, build_cube(added), removed]
+    # mêmes catégories pour les trois parties, sinon concat / groupby passent en object
+    dtypes = {
+        col: _categories(added[col].dtype, pd.concat([p[col].astype(object) for p in parts]))
+        for col in DIMENSIONS if isinstance(added[col].dtype, pd.CategoricalDtype)
+    }
+    cube = pd.concat([p.astype(dtypes) for p in parts], ignore_index=True)
+    cube = cube.groupby(DIMENSIONS, observed=True, sort=False).sum().reset_index()
+    cube = cube[cube["n"] > 0].reset_index(drop=True)
+    # puis celles de `added` et des cellules restantes : les dtypes de build_cube
+    return cube.astype({col: _categories(added[col].dtype, cube[col]) for col in dtypes})
+
+
+def _mean(sums, counts):
+    # aucune valeur -> NaN, comme mean() sur une série vide
+    return sums / counts.where(counts > 0)
+
+
+def kpis(cube: pd.DataFrame) -> dict:
+    """Nombre de vidéos, vues moyennes, engagement moyen, interactions totales."""
+    totals = cube[["n", "views_sum", "views_n", "taux_sum", "taux_n", "engagement_sum"]].sum()
+    return {
+        "videos": int(totals["n"]),
+        "views_mean": totals["views_sum"] / totals["views_n"] if totals["views_n"] else float("nan"),
+        "taux_mean": totals["taux_sum"] / totals["taux_n"] if totals["taux_n"] else float("nan"),
+        "engagement_total": totals["engagement_sum"],
+    }
+
+
+def rollup_mean(cube: pd.DataFrame, by: str, measure: str) -> pd.DataFrame:
+    """Moyenne de `measure` par `by` : colonnes [by, measure] comme df.groupby(by)[measure].mean()."""
+    name = MEASURES[measure]
+    g = cube.groupby(by, observed=True)[[f"{name}_sum", f"{name}_n"]].sum()
+    return _mean(g[f"{name}_sum"], g[f"{name}_n"]).rename(measure).reset_index()
+
+
+def rollup_sum(cube: pd.DataFrame, by: str, measure: str) -> pd.DataFrame:
+    """Somme de `measure` par `by` : colonnes [by, measure]."""
+    name = MEASURES[measure]
+    return cube.groupby(by, observed=True)[f"{name}_sum"].sum().rename(measure).reset_index()
+
+
+def write_cube(videos: pd.DataFrame, data_dir) -> None:
+    store.write_table(build_cube(videos), Path(data_dir) / CUBE_FILE)
+
+
+def has_cube(data_dir) -> bool:
+    return (Path(data_dir) / CUBE_FILE).exists()
+
+
+def load_cube(data_dir) -> pd.DataFrame:
+    return store.read_frame(Path(data_dir) / CUBE_FILE)
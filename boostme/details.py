@@ -0,0 +1,143 @@
+"""
+Fiches détaillées des chaînes pour le bloc "Focus Influenceur" (page_chaines).
+
+Description, topics, hashtags et dernières vidéos de chaque chaîne ne sont
+affichés que pour la chaîne sélectionnée : ils ne restent plus en mémoire
+dans la table chaines du dashboard (colonnes numériques seulement), mais dans
+un fichier Arrow (id, record) : un JSON par chaîne dans une colonne binaire,
+dont le tampon d'offsets sert d'index. Le fichier est ouvert en memory-map :
+lire une fiche = une recherche de l'id + une tranche du fichier, et il est
+remplacé d'un bloc par le pipeline (write_table).
+
+    chaines, videos = enrich.build_dashboard_tables(cats, chaines, videos)
+    details.write_details(data_dir, chaines, videos)
+    fiche = details.ChannelDetails.open(data_dir).get(channel_id)
+"""
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from boostme import store
+
+DETAILS_FILE = "chaines_details.arrow"
+
+DETAIL_COLUMNS = ["description", "topics", "hashtags"]  # retirées de la table chaines du dashboard
+RECENT_VIDEOS = 10
+RECENT_COLUMNS = ["title", "published_at", "views", "likes", "comments", "taux_engagement_pct"]
+
+
+def _plain(value):
+    # valeurs lues d'Arrow (tableaux numpy, NaN, Timestamp) -> types JSON
+    if isinstance(value, np.ndarray):
+        return [_plain(v) for v in value]
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and value != value:
+        return None
+    if value is pd.NA or value is pd.NaT:
+        return None
+    return value
+
+
+def recent_videos(videos: pd.DataFrame, recent: int = RECENT_VIDEOS) -> dict:
+    """channel_id -> `recent` dernières vidéos publiées (liste de dicts RECENT_COLUMNS)."""
+    columns = [c for c in RECENT_COLUMNS if c in videos.columns]
+    latest = (
+        videos.sort_values("published_at", ascending=False, kind="stable")
+        .groupby("channel_id", sort=False, observed=True)
+        .head(recent)
+    )
+    by_channel = {}
+    for channel_id, row in zip(latest["channel_id"].astype(str), latest[columns].to_dict("records")):
+        by_channel.setdefault(channel_id, []).append({k: _plain(v) for k, v in row.items()})
+    return by_channel
+
+
+def build_records(chaines: pd.DataFrame, videos: pd.DataFrame, recent: int = RECENT_VIDEOS) -> pa.Table:
+    """
+    Table (id, record) : une fiche JSON par chaîne.
+    - chaines : sortie de enrich.prepare_chaines ; videos : table enrichie
+    """
+    chaines = chaines.drop_duplicates("id")
+    columns = [c for c in DETAIL_COLUMNS if c in chaines.columns]
+    videos_by_channel = recent_videos(videos, recent)
+
+    ids, records = [], []
+    for channel_id, row in zip(chaines["id"].astype(str), chaines[columns].to_dict("records")):
+        record = {k: _plain(v) for k, v in row.items()}
+        record["recent_videos"] = videos_by_channel.get(channel_id, [])
+        ids.append(channel_id)
+        records.append(json.dumps(record, ensure_ascii=False).encode("utf-8"))
+    return pa.table({"id": pa.array(ids, pa.string()), "record": pa.array(records, pa.binary())})
+
+
+def drop_details(chaines: pd.DataFrame) -> pd.DataFrame:
+    """Table chaines sans les colonnes texte des fiches."""
+    return chaines.drop(columns=DETAIL_COLUMNS, errors="ignore")
+
+
+class ChannelDetails:
+    """Fiches des chaînes : table (id, record), mappée sur le fichier ou construite en mémoire."""
+
+    def __init__(self, table: pa.Table):
+        self.positions = pd.Index(table.column("id").to_pandas())
+        self.records = table.column("record")
+
+    @classmethod
+    def open(cls, data_dir) -> "ChannelDetails":
+        return cls(store.read_table(Path(data_dir) / DETAILS_FILE))
+
+    @classmethod
+    def from_frames(cls, chaines: pd.DataFrame, videos: pd.DataFrame) -> "ChannelDetails":
+        """Fiches construites en mémoire (dashboard lancé sans fichiers matérialisés)."""
+        return cls(build_records(chaines, videos))
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def get(self, channel_id: str) -> dict | None:
+        """Fiche d'une chaîne (description, topics, hashtags, recent_videos), None si inconnue."""
+        pos = self.positions.get_indexer([str(channel_id)])[0]
+        if pos < 0:
+            return None
+        return json.loads(self.records[int(pos)].as_py())
+
+
+def write_details(data_dir, chaines: pd.DataFrame, videos: pd.DataFrame) -> None:
+    store.write_table(build_records(chaines, videos), Path(data_dir) / DETAILS_FILE)
+
+
+def update_details(data_dir, videos: pd.DataFrame, channel_ids, recent: int = RECENT_VIDEOS) -> None:
+    """
+    Dernières vidéos des seules chaînes `channel_ids` recalculées (vidéos du
+    jour ajoutées ou remplacées) ; les autres fiches sont reprises telles quelles.
+    - videos : nouvelle table enrichie
+    """
+    path = Path(data_dir) / DETAILS_FILE
+    table = store.read_table(path)
+    ids = table.column("id").to_pylist()
+    channel_ids = set(channel_ids) & set(ids)
+    if not channel_ids:
+        return
+    videos_by_channel = recent_videos(videos[videos["channel_id"].isin(channel_ids)], recent)
+
+    records = table.column("record").to_pylist()
+    for i, channel_id in enumerate(ids):
+        if channel_id in channel_ids:
+            record = json.loads(records[i])
+            record["recent_videos"] = videos_by_channel.get(channel_id, [])
+            records[i] = json.dumps(record, ensure_ascii=False).encode("utf-8")
+    store.write_table(
+        pa.table({"id": pa.array(ids, pa.string()), "record": pa.array(records, pa.binary())}), path
+    )
+
+
+def has_details(data_dir) -> bool:
+    return (Path(data_dir) / DETAILS_FILE).exists()
@@ -0,0 +1,45 @@
+"""
+Durées ISO-8601 de l'API YouTube ("PT1M49S", "PT1H2M", "P1DT3H", "P0D" pour
+les lives) converties directement en secondes (Int32).
+
+Remplace pd.to_timedelta + dt.total_seconds dans les notebooks de nettoyage :
+plus de colonne intermédiaire duration_td, et chaque durée distincte n'est
+analysée qu'une fois (beaucoup de vidéos ont la même durée).
+
+    df["Durée (s)"] = durations.parse_durations(df["duration"])
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+DURATION_COLUMN = "Durée (s)"
+DROPPED_COLUMNS = ["duration_td"]  # ancienne colonne timedelta, plus écrite
+
+ISO_DURATION_RE = re.compile(
+    r"^P(?:(?P<weeks>\d+)W)?(?:(?P<days>\d+)D)?"
+    r"(?:T(?:(?P<hours>\d+)H)?(?:(?P<minutes>\d+)M)?(?:(?P<seconds>\d+)S)?)?$"
+)
+UNIT_SECONDS = {"weeks": 7 * 24 * 3600, "days": 24 * 3600, "hours": 3600, "minutes": 60, "seconds": 1}
+
+
+def parse_durations(values: pd.Series) -> pd.Series:
+    """
+    Secondes (Int32) de chaque durée ISO-8601 ; format invalide ou manquant -> <NA>
+    (comme errors="coerce"). Mêmes formats acceptés que pd.to_timedelta (majuscules,
+    sans espaces), sauf les fractions de seconde ("PT1.5S"), refusées elles aussi :
+    la colonne est en secondes entières et l'API n'en renvoie pas.
+    """
+    codes, uniques = pd.factorize(values)
+    parts = pd.Series(uniques, dtype=object).astype(str).str.extract(ISO_DURATION_RE)
+    valid = parts.notna().any(axis=1).to_numpy()
+
+    seconds = np.zeros(len(uniques), dtype="float64")
+    for unit, factor in UNIT_SECONDS.items():
+        seconds += pd.to_numeric(parts[unit]).fillna(0).to_numpy() * factor
+    # "P0D" : live / première, aucune partie non nulle mais format valide
+    seconds = pd.array(seconds, dtype="Int32")
+    seconds[~valid] = pd.NA
+
+    result = seconds.take(codes, allow_fill=True)  # code -1 (valeur manquante) -> <NA>
+    return pd.Series(result, index=values.index, name=DURATION_COLUMN)
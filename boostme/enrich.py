@@ -0,0 +1,201 @@
+"""
+Table de faits vidéos enrichie pour le dashboard.
+
+Toutes les transformations faites auparavant à chaque rerun de app3.py
+(jointures cats / chaines, colonnes dérivées) sont calculées une fois ici et
+écrites dans le store ; le dashboard n'a plus qu'à filtrer et agréger. Les
+noms de colonnes sont ceux du registre (boostme/schema.py), fixés dès
+l'écriture du store : plus de renommage au chargement.
+"""
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+from boostme import cube, details, facets, store, topics
+
+# =============================
+# FICHIERS
+# =============================
+VIDEOS_ENRICHED_FILE = "videos_enriched.arrow"
+CHAINES_FR_FILE = "chaines_fr.arrow"
+ENRICHED_FILES = [
+    CHAINES_FR_FILE, VIDEOS_ENRICHED_FILE, details.DETAILS_FILE, topics.TOPICS_FILE, facets.FACETS_FILE,
+]
+
+JOURS_MAP = {0: "Lundi", 1: "Mardi", 2: "Mercredi", 3: "Jeudi", 4: "Vendredi", 5: "Samedi", 6: "Dimanche"}
+ORDRE_JOURS = ["Lundi", "Mardi", "Mercredi", "Jeudi", "Vendredi", "Samedi", "Dimanche"]
+
+CHAINES_MERGE_COLUMNS = ["id", "chaine", "country", "subscribers", "engagement_rate_pct", "nb_videos"]
+# colonnes catégorielles de la table enrichie (types du store, perdus par les jointures)
+ENRICHED_CATEGORIES = ["channel_id", "id", "category_id", "categorie", "chaine", "country"]
+# comptes des chaînes : manquants pour les vidéos hors chaînes FR -> Int64 plutôt que float
+ENRICHED_COUNTS = ["subscribers", "nb_videos"]
+
+
+def french_channels(chaines: pd.DataFrame) -> pd.DataFrame:
+    """Chaînes FR : les lignes (et leur ordre) de la table chaines du dashboard."""
+    return chaines[chaines["country"] == "FR"]
+
+
+def prepare_chaines(chaines: pd.DataFrame) -> pd.DataFrame:
+    """
+    Chaînes FR, topics prêts à afficher.
+    - chaines : table du store (noms et types du registre boostme/schema.py)
+    """
+    chaines = french_channels(chaines).copy()
+
+    # Topics - listes déjà parsées par le store, on les affiche séparées par des virgules
+    if "topics" in chaines.columns:
+        chaines["topics"] = chaines["topics"].map(lambda t: ", ".join(t) if t is not None else "")
+    return chaines
+
+
+def enrich_videos(cats: pd.DataFrame, chaines: pd.DataFrame, videos: pd.DataFrame) -> pd.DataFrame:
+    """
+    Jointures cats / chaines + colonnes dérivées.
+    - cats, videos : tables du store (noms et types du registre boostme/schema.py)
+    - chaines : sortie de prepare_chaines
+    """
+    videos = videos.copy()
+
+    # Dates (published_at déjà en datetime UTC)
+    videos["heure_publication"] = videos["published_at"].dt.hour
+    videos["jour_semaine_num"] = videos["published_at"].dt.weekday
+    videos["jour_semaine"] = pd.Categorical(
+        videos["jour_semaine_num"].map(JOURS_MAP), categories=ORDRE_JOURS, ordered=True
+    )
+    videos["annee"] = videos["published_at"].dt.year
+
+    # Engagement total
+    videos["engagement_total"] = videos.get("likes", 0).fillna(0) + videos.get("comments", 0).fillna(0)
+
+    # Join cats
+    videos = videos.merge(
+        cats[["category_id", "name"]],
+        on="category_id",
+        how="left"
+    ).rename(columns={"name": "categorie"})
+
+    # Join chaines (clés forcées en str pour matcher)
+    chaines_for_merge = chaines.rename(columns={"title": "chaine"}) if "title" in chaines.columns else chaines.copy()
+    videos["channel_id"] = videos["channel_id"].astype(str).str.strip()
+    chaines_for_merge["id"] = chaines_for_merge["id"].astype(str).str.strip()
+
+    videos = videos.merge(
+        chaines_for_merge[CHAINES_MERGE_COLUMNS],
+        left_on="channel_id",
+        right_on="id",
+        how="left",
+        suffixes=("", "_chaine")
+    )
+
+    # ne pas perdre les vidéos sans chaîne / catégorie connue au filtre
+    videos["chaine"] = videos["chaine"].fillna("Chaîne inconnue")
+    videos["categorie"] = videos["categorie"].fillna("Catégorie inconnue")
+
+    # les merges sur des clés str rendent du texte / des float : on revient aux
+    # types du store (catégories = codes entiers pour les filtres, moins de mémoire)
+    for col in ENRICHED_CATEGORIES:
+        videos[col] = videos[col].astype("category")
+    for col in ENRICHED_COUNTS:
+        videos[col] = videos[col].astype("Int64")
+    return videos
+
+
+def build_dashboard_tables(cats: pd.DataFrame, chaines: pd.DataFrame, videos: pd.DataFrame):
+    """(chaines, videos) tels qu'utilisés par app3.py."""
+    chaines = prepare_chaines(chaines)
+    return chaines, enrich_videos(cats, chaines, videos)
+
+
+def replace_videos(cats: pd.DataFrame, chaines: pd.DataFrame, videos: pd.DataFrame,
+                   videos_cube: pd.DataFrame, delta: pd.DataFrame, delta_ids) -> tuple:
+    """
+    (vidéos, cube, lignes gardées, lignes ajoutées) après substitution des
+    vidéos du delta : seules les lignes du delta sont enrichies, le cube est
+    corrigé de leurs agrégats (cube.update_cube). Les tables reçues ne sont pas modifiées.
+    - chaines : sortie de prepare_chaines ; videos, videos_cube : tables enrichie et agrégée
+    - delta : lignes nettoyées (ingest.clean_delta) ; delta_ids : video_id avant
+      nettoyage, une ligne écartée au nettoyage supprime quand même l'ancienne
+    """
+    added = enrich_videos(cats, chaines, store.prepare_videos(delta))
+    kept = ~videos["video_id"].isin(set(delta_ids)).to_numpy()
+    removed = videos[~kept]
+
+    base, added = store.union_categories(videos[kept], added.reindex(columns=videos.columns))
+    videos = pd.concat([base, added], ignore_index=True)
+    return videos, cube.update_cube(videos_cube, added, removed), kept, added
+
+
+# =============================
+# LECTURE / ECRITURE
+# =============================
+def build_enriched(data_dir) -> None:
+    """
+    Matérialise chaines_fr / videos_enriched (+ le cube agrégé, les fiches
+    des chaînes et les facettes de recherche) à partir du store du dossier.
+    chaines_fr ne garde pas les colonnes texte, lues fiche par fiche
+    (boostme/details.py) ; chaines_topics et videos_facets suivent l'ordre
+    des lignes de chaines_fr / videos_enriched.
+    """
+    data_dir = Path(data_dir)
+    cats, chaines, videos = store.load_store(data_dir)
+    fr = french_channels(chaines)
+    topics.write_topics(data_dir, fr)
+    chaines, videos = build_dashboard_tables(cats, chaines, videos)
+    facets.write_facets(data_dir, videos, facets.channel_topics(fr))
+    details.write_details(data_dir, chaines, videos)
+    store.write_table(details.drop_details(chaines), data_dir / CHAINES_FR_FILE)
+    store.write_table(videos, data_dir / VIDEOS_ENRICHED_FILE)
+    cube.write_cube(videos, data_dir)
+
+
+def update_tables(data_dir, delta: pd.DataFrame, delta_ids) -> None:
+    """
+    Ingestion du jour (nettoyage.ipynb) sans reconstruire le store : seules les
+    tables touchées par le delta sont réécrites (videos.arrow, videos_enriched,
+    cube, facettes, fiches des chaînes concernées), à partir des fichiers
+    existants et des seules lignes du delta. cats / chaines / chaines_fr /
+    chaines_topics ne changent pas. Tables absentes : construites en entier
+    (store depuis les CSV, où le delta est déjà fusionné).
+    - delta, delta_ids : comme ingest.apply_delta
+    """
+    data_dir = Path(data_dir)
+    if store.has_store(data_dir):
+        store.update_videos(data_dir, delta, delta_ids)
+    else:
+        store.build_store(data_dir)
+    if not (has_enriched(data_dir) and cube.has_cube(data_dir)):
+        build_enriched(data_dir)
+        return
+
+    cats = store.read_frame(data_dir / store.CATS_FILE, "cats")
+    chaines = prepare_chaines(store.read_frame(data_dir / store.CHAINES_FILE, "chaines"))
+    videos = store.read_frame(data_dir / VIDEOS_ENRICHED_FILE)
+    new_videos, videos_cube, kept, added = replace_videos(
+        cats, chaines, videos, cube.load_cube(data_dir), delta, delta_ids
+    )
+
+    facets.update_facets(data_dir, kept, added, topics.TopicIndex.open(data_dir).terms_by_id("topics"))
+    # dernières vidéos : seules les fiches des chaînes gagnant ou perdant des lignes changent
+    channels = set(added["channel_id"].astype(str)) | set(videos.loc[~kept, "channel_id"].astype(str))
+    details.update_details(data_dir, new_videos, channels)
+    store.write_table(new_videos, data_dir / VIDEOS_ENRICHED_FILE)
+    store.write_table(videos_cube, data_dir / cube.CUBE_FILE)
+
+
+def has_enriched(data_dir) -> bool:
+    return all((Path(data_dir) / f).exists() for f in ENRICHED_FILES)
+
+
+def load_enriched(data_dir):
+    data_dir = Path(data_dir)
+    return (
+        store.read_frame(data_dir / CHAINES_FR_FILE),
+        store.read_frame(data_dir / VIDEOS_ENRICHED_FILE),
+    )
+
+
+if __name__ == "__main__":
+    build_enriched(sys.argv[1] if len(sys.argv) > 1 else "data")
@@ -0,0 +1,107 @@
+"""
+Recherche à facettes sur les vidéos (page "Recherche" du dashboard).
+
+Trouver les vidéos d'un hashtag demandait d'exploser toute la table vidéos,
+et les thèmes des chaînes n'étaient qu'affichés. Chaque vidéo a ici ses
+termes par facette, en listes encodées en dictionnaire, et un index inversé
+(topics.TopicIndex) : terme -> positions triées des vidéos. Une requête
+("#shorts" ET catégorie Gaming ET 2025) est une intersection de listes
+triées, les comptes des autres facettes un bincount sur les lignes
+retenues : quelques millisecondes, recalculés à chaque changement.
+
+videos_facets.arrow (video_id + une colonne par facette) est écrit par
+build_enriched (cellule store de nettoyage.ipynb) dans l'ordre des lignes de
+videos_enriched. Les facettes des chaînes (thèmes, hashtags, mots du titre)
+sont dans chaines_topics.arrow.
+
+    index = facets.open_facets(data_dir)
+    rows = index.select({"hashtags": ["#shorts"], "categorie": ["Gaming"], "annee": ["2025"]})
+    videos.iloc[rows]
+"""
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+
+from boostme import search, store
+from boostme.topics import TopicIndex, encoded_table
+
+FACETS_FILE = "videos_facets.arrow"
+# facette -> libellé affiché, dans l'ordre de la page
+VIDEO_FACETS = {
+    "hashtags": "Hashtags",
+    "themes": "Thèmes de la chaîne",
+    "categorie": "Catégorie",
+    "annee": "Année",
+    "mots": "Mots du titre",
+}
+CHANNEL_FACETS = {
+    "topics": "Thèmes",
+    "hashtags": "Hashtags",
+    "mots": "Mots du titre",
+}
+
+
+def _single(values: pd.Series) -> pd.Series:
+    # facette à une valeur par vidéo : liste d'un terme (vide si la valeur manque) ;
+    # texte avant map : un Int64 avec des manquants y passerait en float ("2025.0")
+    return values.astype("string").map(lambda v: [v] if pd.notna(v) else [])
+
+
+def channel_topics(chaines: pd.DataFrame) -> pd.Series:
+    """id de chaîne -> liste de ses thèmes (chaines du store, topics en listes)."""
+    topics = pd.Series(chaines["topics"].to_numpy(), index=chaines["id"].astype(str), dtype=object)
+    return topics[~topics.index.duplicated()]
+
+
+def facets_table(videos: pd.DataFrame, topics_by_channel: pd.Series) -> pa.Table:
+    """
+    Table (video_id, hashtags, themes, categorie, annee, mots) dans l'ordre de `videos`.
+    - videos : table enrichie du dashboard
+    - topics_by_channel : id de chaîne -> thèmes (channel_topics, ou TopicIndex.terms_by_id
+      de l'index des chaînes FR)
+    """
+    annee = pd.to_numeric(videos["annee"], errors="coerce").astype("Int64")
+    lists = {
+        "hashtags": videos["hashtags"] if "hashtags" in videos.columns else pd.Series([[]] * len(videos)),
+        "themes": videos["channel_id"].astype(str).map(topics_by_channel),
+        "categorie": _single(videos["categorie"]),
+        "annee": _single(annee),
+        "mots": videos["title"].map(search.tokenize),
+    }
+    return encoded_table(videos["video_id"].reset_index(drop=True), lists)
+
+
+def build_facets(videos: pd.DataFrame, topics_by_channel: pd.Series) -> TopicIndex:
+    """Index construit en mémoire (dashboard sans fichiers matérialisés, ou après un rechargement à chaud)."""
+    return TopicIndex.from_table(facets_table(videos, topics_by_channel), key="video_id")
+
+
+def write_facets(data_dir, videos: pd.DataFrame, topics_by_channel: pd.Series) -> None:
+    store.write_table(facets_table(videos, topics_by_channel), Path(data_dir) / FACETS_FILE)
+
+
+def update_facets(data_dir, kept, added: pd.DataFrame, topics_by_channel: pd.Series) -> None:
+    """
+    Facettes après substitution de vidéos (enrich.replace_videos) : lignes
+    gardées reprises du fichier, facettes calculées pour les seules lignes
+    ajoutées (même ordre que la nouvelle table enrichie).
+    - kept : masque des lignes gardées de l'ancienne table
+    """
+    path = Path(data_dir) / FACETS_FILE
+    table = store.read_table(path).filter(pa.array(kept))
+    table = pa.concat_tables([table, facets_table(added, topics_by_channel)])
+    # une seule tranche par colonne, vocabulaires réunis et réduits aux termes encore présents
+    table = pa.table({
+        f.name: store.compact_lists(table.column(f.name)) if pa.types.is_list(f.type) else table.column(f.name).combine_chunks()
+        for f in table.schema
+    })
+    store.write_table(table, path)
+
+
+def open_facets(data_dir) -> TopicIndex:
+    return TopicIndex.from_table(store.read_table(Path(data_dir) / FACETS_FILE), key="video_id")
+
+
+def has_facets(data_dir) -> bool:
+    return (Path(data_dir) / FACETS_FILE).exists()
@@ -0,0 +1,325 @@
+"""
+Faux serveur YouTube Data API v3, en local, construit à partir de nos CSV.
+
+Sert search, videos (id= ou chart=mostPopular), channels et playlistItems
+avec pagination par pageToken, ETag / 304, latence simulée, erreurs 5xx
+aléatoires et 403 quotaExceeded une fois le quota journalier consommé.
+Permet de tester et de mesurer les collecteurs (boostme/youtube.py) sans
+dépenser de quota réel.
+
+    python -m boostme.fake_api --port 8765 --latency 0.05
+"""
+import argparse
+import glob
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+from boostme.store import parse_list
+from boostme.youtube import QUOTA_COST
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+VIDEO_CSVS = [
+    str(ROOT_DIR / "data" / "new_videos" / "*.csv"),
+    str(ROOT_DIR / "CSV_Categories_clean" / "*.csv"),
+]
+CHAINES_CSV = ROOT_DIR / "data" / "chaines.csv"
+CATS_CSV = ROOT_DIR / "data" / "cats.csv"
+
+MAX_RESULTS = 50
+MAX_CHART_RESULTS = 200
+MAX_SEARCH_RESULTS = 500
+DAILY_QUOTA = 10_000
+
+
+def _error(code: int, reason: str, message: str) -> tuple:
+    return code, {"error": {"code": code, "message": message, "errors": [{"reason": reason, "message": message}]}}
+
+
+def _page(items: list, params: dict, cap: int) -> dict:
+    # pageToken = offset encodé, comme un jeton opaque
+    max_results = min(int(params.get("maxResults", 5)), MAX_RESULTS)
+    token = params.get("pageToken")
+    offset = int(token[1:]) if token and token.startswith("p") else 0
+    items = items[:cap]
+    body = {
+        "items": items[offset:offset + max_results],
+        "pageInfo": {"totalResults": len(items), "resultsPerPage": max_results},
+    }
+    if offset + max_results < len(items):
+        body["nextPageToken"] = f"p{offset + max_results}"
+    return body
+
+
+class FakeYouTubeData:
+    """Données servies par le faux serveur (vidéos, chaînes, catégories)."""
+
+    def __init__(self, videos: pd.DataFrame, chaines: pd.DataFrame, cats: pd.DataFrame):
+        videos = videos.dropna(subset=["video_id"]).copy()
+        videos = videos.sort_values(["video_id", "views"], kind="stable").drop_duplicates("video_id", keep="last")
+        videos["category_id"] = videos["category_id"].astype(str)
+        videos = videos.sort_values("published_at", ascending=False)
+        self.videos = videos.set_index("video_id", drop=False)
+        self.search_text = (videos["title"].fillna("") + " " + videos["description"].fillna("")).str.lower()
+        self.by_popularity = videos.sort_values("views", ascending=False)
+        # playlist uploads "UU..." <-> chaîne "UC..."
+        self.by_channel = {cid: g["video_id"].tolist() for cid, g in videos.groupby("channel_id")}
+        self.chaines = chaines.drop_duplicates("id").set_index("id", drop=False)
+        self.charts = set(cats.loc[cats["chart_available"].astype(bool), "category_id"].astype(str))
+
+    @classmethod
+    def from_csvs(cls, video_csvs=VIDEO_CSVS, chaines_csv=CHAINES_CSV, cats_csv=CATS_CSV) -> "FakeYouTubeData":
+        files = [f for pattern in video_csvs for f in sorted(glob.glob(str(pattern)))]
+        columns = ["video_id", "title", "description", "channel", "published_at", "duration",
+                   "views", "likes", "comments", "channel_id", "category_id", "language"]
+        videos = pd.concat(
+            [pd.read_csv(f, usecols=lambda c: c in columns) for f in files], ignore_index=True
+        )
+        return cls(videos, pd.read_csv(chaines_csv), pd.read_csv(cats_csv))
+
+    # -----------------------------
+    # ressources au format de l'API
+    # -----------------------------
+    def video_resource(self, row) -> dict:
+        snippet = {
+            "publishedAt": row["published_at"],
+            "channelId": row["channel_id"],
+            "title": row["title"],
+            "description": "" if pd.isna(row["description"]) else row["description"],
+            "channelTitle": row["channel"],
+            "categoryId": row["category_id"],
+        }
+        if not pd.isna(row["language"]):
+            snippet["defaultAudioLanguage"] = row["language"]
+        return {
+            "kind": "youtube#video",
+            "id": row["video_id"],
+            "snippet": snippet,
+            "contentDetails": {"duration": None if pd.isna(row["duration"]) else row["duration"]},
+            "statistics": {
+                "viewCount": str(int(row["views"])),
+                "likeCount": str(int(row["likes"])),
+                "commentCount": str(int(row["comments"])),
+            },
+        }
+
+    def channel_resource(self, row) -> dict:
+        topics = parse_list(row["topics"])
+        return {
+            "kind": "youtube#channel",
+            "id": row["id"],
+            "snippet": {
+                "title": row["title"],
+                "description": "" if pd.isna(row["description"]) else row["description"],
+                "country": None if pd.isna(row["country"]) else row["country"],
+            },
+            "contentDetails": {"relatedPlaylists": {"uploads": row["uploads_playlist"]}},
+            "statistics": {
+                "viewCount": str(int(row["views"])),
+                "subscriberCount": str(int(row["subscribers"])),
+                "videoCount": str(int(row["nb_videos"])),
+            },
+            "topicDetails": {
+                "topicCategories": [f"https://en.wikipedia.org/wiki/{t.replace(' ', '_')}" for t in topics]
+            },
+        }
+
+    # -----------------------------
+    # endpoints
+    # -----------------------------
+    def search(self, params: dict) -> tuple:
+        q = params.get("q", "").lower()
+        ids = self.videos.index[self.search_text.str.contains(q, regex=False)] if q else self.videos.index
+        items = [
+            {"kind": "youtube#searchResult", "id": {"kind": "youtube#video", "videoId": vid},
+             "snippet": {"title": self.videos.at[vid, "title"], "channelId": self.videos.at[vid, "channel_id"]}}
+            for vid in ids[:MAX_SEARCH_RESULTS]
+        ]
+        return 200, _page(items, params, MAX_SEARCH_RESULTS)
+
+    def videos_list(self, params: dict) -> tuple:
+        if "id" in params:
+            ids = [i for i in params["id"].split(",") if i]
+            if len(ids) > MAX_RESULTS:
+                return _error(400, "invalidParameter", "Too many ids")
+            items = [self.video_resource(self.videos.loc[i]) for i in ids if i in self.videos.index]
+            return 200, {"items": items, "pageInfo": {"totalResults": len(items), "resultsPerPage": len(items)}}
+        if params.get("chart") == "mostPopular":
+            cat = params.get("videoCategoryId")
+            if cat and cat not in self.charts:
+                return _error(404, "videoChartNotFound", "The requested video chart is not supported")
+            videos = self.by_popularity
+            if cat:
+                videos = videos[videos["category_id"] == cat]
+            # on ne sérialise que la page demandée
+            body = _page(list(range(len(videos))), params, MAX_CHART_RESULTS)
+            body["items"] = [self.video_resource(videos.iloc[i]) for i in body["items"]]
+            return 200, body
+        return _error(400, "missingRequiredParameter", "No filter selected")
+
+    def channels(self, params: dict) -> tuple:
+        ids = [i for i in params.get("id", "").split(",") if i]
+        if len(ids) > MAX_RESULTS:
+            return _error(400, "invalidParameter", "Too many ids")
+        items = [self.channel_resource(self.chaines.loc[i]) for i in ids if i in self.chaines.index]
+        return 200, {"items": items, "pageInfo": {"totalResults": len(items), "resultsPerPage": len(items)}}
+
+    def playlist_items(self, params: dict) -> tuple:
+        playlist_id = params.get("playlistId", "")
+        channel_id = "UC" + playlist_id[2:]
+        if not playlist_id.startswith("UU") or (channel_id not in self.chaines.index and channel_id not in self.by_channel):
+            return _error(404, "playlistNotFound", "The playlist identified with the request's playlistId parameter cannot be found")
+        items = [
+            {"kind": "youtube#playlistItem", "contentDetails": {"videoId": vid}}
+            for vid in self.by_channel.get(channel_id, [])
+        ]
+        return 200, _page(items, params, len(items))
+
+
+class FakeYouTubeServer:
+    """
+    Serveur HTTP local (un thread par requête).
+    - latency : délai par réponse en secondes (+ jitter aléatoire)
+    - error_rate : proportion de réponses 503
+    - daily_quota : unités disponibles avant les 403 quotaExceeded
+
+        with FakeYouTubeServer(data, latency=0.05) as server:
+            client = YouTubeClient("test", base_url=server.url)
+    """
+
+    ENDPOINTS = {
+        "search": FakeYouTubeData.search,
+        "videos": FakeYouTubeData.videos_list,
+        "channels": FakeYouTubeData.channels,
+        "playlistItems": FakeYouTubeData.playlist_items,
+    }
+
+    def __init__(
+        self,
+        data: FakeYouTubeData | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        daily_quota: int = DAILY_QUOTA,
+        seed: int = 0,
+    ):
+        self.data = data if data is not None else FakeYouTubeData.from_csvs()
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.daily_quota = daily_quota
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.reset_stats()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def reset_stats(self) -> None:
+        with self.lock:
+            self.quota_used = 0
+            self.requests = {name: 0 for name in self.ENDPOINTS}
+            self.errors = 0
+
+    def handle(self, endpoint: str, params: dict) -> tuple:
+        if endpoint not in self.ENDPOINTS:
+            return _error(404, "notFound", f"Unknown endpoint {endpoint}")
+        with self.lock:
+            self.requests[endpoint] += 1
+            cost = QUOTA_COST.get(endpoint, 1)
+            if self.quota_used + cost > self.daily_quota:
+                return _error(403, "quotaExceeded", "The request cannot be completed because you have exceeded your quota.")
+            self.quota_used += cost
+            delay = self.latency + self.random.uniform(0, self.jitter)
+            fail = self.random.random() < self.error_rate
+            if fail:
+                self.errors += 1
+        time.sleep(delay)
+        if fail:
+            return _error(503, "backendError", "Backend Error")
+        return self.ENDPOINTS[endpoint](self.data, params)
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive : connexions réutilisées par le pool client
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+                status, body = server.handle(url.path.rstrip("/").rsplit("/", 1)[-1], params)
+                payload = json.dumps(body, sort_keys=True).encode("utf-8")
+
+                # ETag / If-None-Match : 304 sans corps si la réponse n'a pas changé
+                etag = None
+                if status == 200:
+                    etag = '"' + hashlib.sha1(payload).hexdigest() + '"'
+                    if self.headers.get("If-None-Match") == etag:
+                        self.send_response(304)
+                        self.send_header("ETag", etag)
+                        self.send_header("Content-Length", "0")
+                        self.end_headers()
+                        return
+
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=UTF-8")
+                self.send_header("Content-Length", str(len(payload)))
+                if etag:
+                    self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(payload)
+
+        return Handler
+
+    def start(self) -> "FakeYouTubeServer":
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "FakeYouTubeServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Faux serveur YouTube Data API v3")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--daily-quota", type=int, default=DAILY_QUOTA)
+    args = parser.parse_args()
+
+    server = FakeYouTubeServer(
+        port=args.port, latency=args.latency, jitter=args.jitter,
+        error_rate=args.error_rate, daily_quota=args.daily_quota,
+    )
+    print(f"Faux YouTube Data API sur {server.url}/ (Ctrl+C pour arrêter)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.httpd.server_close()
@@ -0,0 +1,110 @@
+"""
+Filtres de la sidebar sans comparaison de chaînes.
+
+Chaque dimension filtrée est encodée une fois (pd.factorize) en codes
+entiers ; une sélection devient une table de correspondance code -> bool
+(une case par valeur distincte) et le masque d'une dimension est un simple
+accès indexé lut[codes]. Une dimension dont toutes les valeurs sont cochées
+(le cas par défaut, avec des milliers de chaînes) n'est pas parcourue du
+tout, et si rien n'est filtré on renvoie le DataFrame lui-même, sans copie.
+
+    index = FilterIndex(videos)
+    rows = index.select({"annee": annees, "chaine": chaines_sel}, heures)
+    df = take(videos, rows)
+"""
+import numpy as np
+import pandas as pd
+
+FILTER_DIMENSIONS = ["annee", "categorie", "chaine", "jour_semaine"]
+HOUR_DIMENSION = "heure_publication"
+HOURS = 24
+ALL = "__all__"  # sélection "toutes les valeurs" (ex. toutes les chaînes) : dimension non filtrée
+
+
+class FilterIndex:
+    """Dimensions encodées d'une table (vidéos ou cube) ; les lignes gardent l'ordre de la table."""
+
+    def __init__(self, df: pd.DataFrame, dims=FILTER_DIMENSIONS, hour: str | None = HOUR_DIMENSION):
+        self.n_rows = len(df)
+        self.codes = {}
+        self.uniques = {}
+        self.has_na = {}
+        self._options = {}
+        for dim in dims:
+            codes, uniques = pd.factorize(df[dim])
+            self.codes[dim] = codes.astype(np.int32)
+            self.uniques[dim] = pd.Index(uniques)
+            self.has_na[dim] = bool((codes < 0).any())
+            if isinstance(df[dim].dtype, pd.CategoricalDtype):
+                self._options[dim] = list(df[dim].cat.categories)
+            else:
+                self._options[dim] = sorted(uniques)
+
+        self.hour = hour
+        if hour is not None:
+            hours = pd.to_numeric(df[hour], errors="coerce")
+            self.hour_codes = hours.fillna(-1).to_numpy(dtype=np.int8)
+            self.hour_has_na = bool(hours.isna().any())
+
+    def options(self, dim: str) -> list:
+        """Valeurs proposées dans le multiselect (triées ; ordre des catégories pour un Categorical)."""
+        return self._options[dim]
+
+    def _lut(self, dim: str, values) -> np.ndarray | None:
+        # dernière case = code -1 (valeur manquante) : jamais retenue, comme isin
+        uniques = self.uniques[dim]
+        selected = uniques.get_indexer(pd.Index(list(values), dtype=object)) if len(values) else np.array([], int)
+        selected = np.unique(selected[selected >= 0])
+        if len(selected) == len(uniques) and not self.has_na[dim]:
+            return None
+        lut = np.zeros(len(uniques) + 1, dtype=bool)
+        lut[selected] = True
+        return lut
+
+    def select(self, selections: dict, hour_range=None):
+        """
+        Lignes retenues : slice(None) si aucun filtre n'écarte de ligne,
+        sinon positions (np.ndarray) dans l'ordre de la table.
+        - selections : dimension -> valeurs cochées, ou ALL
+        - hour_range : (début, fin) inclus, comme Series.between
+        """
+        mask = None
+        for dim, values in selections.items():
+            if isinstance(values, str) and values == ALL:
+                continue
+            lut = self._lut(dim, values)
+            if lut is None:
+                continue
+            m = lut[self.codes[dim]]
+            mask = m if mask is None else mask & m
+
+        if self.hour is not None and hour_range is not None:
+            start, end = int(hour_range[0]), int(hour_range[1])
+            if start > 0 or end < HOURS - 1 or self.hour_has_na:
+                lut = np.zeros(HOURS + 1, dtype=bool)
+                lut[max(start, 0):min(end, HOURS - 1) + 1] = True
+                m = lut[self.hour_codes]
+                mask = m if mask is None else mask & m
+
+        if mask is None:
+            return slice(None)
+        return np.flatnonzero(mask)
+
+
+def count(rows, n_rows: int) -> int:
+    """Nombre de lignes retenues (n_rows = taille de la table si rien n'est filtré)."""
+    return n_rows if isinstance(rows, slice) else len(rows)
+
+
+def take_page(df: pd.DataFrame, rows, start: int, stop: int) -> pd.DataFrame:
+    """Lignes retenues [start:stop] : seule la page affichée est extraite."""
+    if isinstance(rows, slice):
+        return df.iloc[start:stop]
+    return df.take(rows[start:stop])
+
+
+def take(df: pd.DataFrame, rows) -> pd.DataFrame:
+    """Lignes retenues de `df` : `df` lui-même si rien n'est filtré, sinon une seule extraction par positions."""
+    if isinstance(rows, slice):
+        return df
+    return df.take(rows)
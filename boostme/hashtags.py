@@ -0,0 +1,91 @@
+"""
+Hashtags des vidéos (nettoyage.ipynb) et des chaînes (extract_chaines.ipynb).
+
+Extraction vectorisée (Series.str.findall, regex compilée) vers une table
+d'incidence creuse : un couple (vidéo, hashtag) par ligne. La table des
+vidéos est gardée dans video_hashtags.arrow, à côté de videos.csv, et mise
+à jour à chaque ingestion avec les seules vidéos ajoutées ou remplacées ;
+video_hashtags.csv est recompté à partir d'elle (plus de relecture de toute
+la colonne hashtags de videos.csv).
+
+    df["hashtags"] = hashtags.hashtag_lists(hashtags.video_text(df))
+    ...
+    hashtags.update_hashtags("videos.csv", df, delta_ids)
+"""
+import re
+from pathlib import Path
+
+import pandas as pd
+
+from boostme import store
+
+HASHTAG_RE = re.compile(r"#\w+")
+INCIDENCE_FILE = "video_hashtags.arrow"
+COUNTS_FILE = "video_hashtags.csv"
+
+
+def video_text(df: pd.DataFrame) -> pd.Series:
+    """Texte dans lequel on cherche les hashtags : titre + description."""
+    return df["title"].fillna("") + " " + df["description"].fillna("")
+
+
+def extract_incidence(text: pd.Series, with_hash: bool = True) -> pd.DataFrame:
+    """
+    Couples (row, hashtag) : row = index de `text`, un hashtag au plus une fois
+    par ligne, dans l'ordre d'apparition.
+    """
+    found = text.fillna("").str.findall(HASHTAG_RE).explode().dropna()
+    incidence = pd.DataFrame({"row": found.index, "hashtag": found.to_numpy()})
+    if not with_hash:
+        incidence["hashtag"] = incidence["hashtag"].str[1:]
+    return incidence.drop_duplicates(ignore_index=True)
+
+
+def hashtag_lists(text: pd.Series, with_hash: bool = True) -> pd.Series:
+    """Liste des hashtags de chaque ligne (None si aucun), alignée sur `text`."""
+    incidence = extract_incidence(text, with_hash)
+    lists = incidence.groupby("row", sort=False)["hashtag"].agg(list).reindex(text.index)
+    return lists.astype(object).where(lists.notna(), None)
+
+
+def video_incidence(videos: pd.DataFrame) -> pd.DataFrame:
+    """Table d'incidence (video_id, category_id, hashtag) d'un lot de vidéos."""
+    videos = videos.reset_index(drop=True)
+    incidence = extract_incidence(video_text(videos))
+    rows = incidence["row"].to_numpy()
+    return pd.DataFrame({
+        "video_id": videos["video_id"].to_numpy()[rows].astype(str),
+        "category_id": videos["category_id"].to_numpy()[rows],
+        "hashtag": incidence["hashtag"].to_numpy(),
+    })
+
+
+def count_hashtags(incidence: pd.DataFrame) -> pd.DataFrame:
+    """Nombre de vidéos par (category_id, hashtag), format de video_hashtags.csv."""
+    counts = incidence.groupby(["category_id", "hashtag"]).size().reset_index(name="count")
+    counts = counts.rename(columns={"hashtag": "hashtags"})
+    return counts.sort_values(["category_id", "count"], ascending=[True, False], kind="stable", ignore_index=True)
+
+
+def update_hashtags(videos_path, delta: pd.DataFrame, delta_ids) -> pd.DataFrame:
+    """
+    À appeler après ingest.apply_delta : retire de la table d'incidence les
+    vidéos remplacées (delta_ids), ajoute celles du lot nettoyé, réécrit
+    video_hashtags.csv et renvoie les comptes. Sans table existante, elle est
+    construite à partir de tout videos.csv (qui contient déjà le lot).
+    """
+    videos_path = Path(videos_path)
+    incidence_path = videos_path.with_name(INCIDENCE_FILE)
+
+    if incidence_path.exists():
+        incidence = store.read_frame(incidence_path)
+        incidence = incidence[~incidence["video_id"].isin(pd.Series(delta_ids).astype(str))]
+        incidence = pd.concat([incidence, video_incidence(delta)], ignore_index=True)
+    else:
+        videos = pd.read_csv(videos_path, usecols=["video_id", "category_id", "title", "description"])
+        incidence = video_incidence(videos)
+
+    store.write_table(incidence, incidence_path)
+    counts = count_hashtags(incidence)
+    counts.to_csv(videos_path.with_name(COUNTS_FILE), index=False)
+    return counts
@@ -0,0 +1,122 @@
+"""
+Cache disque (SQLite) des réponses de l'API YouTube.
+
+Clé = endpoint + paramètres normalisés (sans la clé d'API). Durée de vie
+par endpoint : longue pour les métadonnées vidéo, courte dès que la réponse
+contient des statistiques. Une entrée expirée avec ETag est revalidée par
+If-None-Match (304 -> on garde le corps en cache).
+
+    cache = ResponseCache("youtube_cache.sqlite")
+    client = YouTubeClient(API_KEY, cache=cache)
+"""
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+# TTL par endpoint ; suffixe ":statistics" si part contient statistics
+DEFAULT_TTL = {
+    "search": DAY,
+    "videos": 30 * DAY,
+    "videos:statistics": 6 * HOUR,
+    "channels": 7 * DAY,
+    "channels:statistics": DAY,
+    "playlistItems": 6 * HOUR,
+    "videoCategories": 30 * DAY,
+}
+LIST_PARAMS = {"id", "part"}
+
+
+def normalize_params(params: dict) -> dict:
+    """Paramètres triés, sans clé d'API ni valeurs None, listes "a,b" triées."""
+    clean = {}
+    for name, value in params.items():
+        if value is None or name == "key":
+            continue
+        value = str(value)
+        if name in LIST_PARAMS:
+            value = ",".join(sorted(v.strip() for v in value.split(",") if v.strip()))
+        clean[name] = value
+    return dict(sorted(clean.items()))
+
+
+def cache_key(endpoint: str, params: dict) -> str:
+    return endpoint + "?" + json.dumps(normalize_params(params), ensure_ascii=False, separators=(",", ":"))
+
+
+class CacheEntry:
+    def __init__(self, body: dict, etag: str | None, fetched_at: float, ttl: float):
+        self.body = body
+        self.etag = etag
+        self.fetched_at = fetched_at
+        self.ttl = ttl
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() - self.fetched_at < self.ttl
+
+
+class ResponseCache:
+    """Cache persistant partagé entre threads (une connexion SQLite + verrou)."""
+
+    def __init__(self, path, ttl: dict | None = None):
+        self.path = Path(path)
+        self.ttl = {**DEFAULT_TTL, **(ttl or {})}
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, endpoint TEXT, body TEXT, etag TEXT, fetched_at REAL)"
+        )
+        self.db.commit()
+
+    def ttl_for(self, endpoint: str, params: dict) -> float:
+        if "statistics" in str(params.get("part", "")) and f"{endpoint}:statistics" in self.ttl:
+            return self.ttl[f"{endpoint}:statistics"]
+        return self.ttl.get(endpoint, HOUR)
+
+    def get(self, endpoint: str, params: dict) -> CacheEntry | None:
+        with self.lock:
+            row = self.db.execute(
+                "SELECT body, etag, fetched_at FROM responses WHERE key = ?", (cache_key(endpoint, params),)
+            ).fetchone()
+        if row is None:
+            return None
+        return CacheEntry(json.loads(row[0]), row[1], row[2], self.ttl_for(endpoint, params))
+
+    def put(self, endpoint: str, params: dict, body: dict, etag: str | None = None) -> None:
+        with self.lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (cache_key(endpoint, params), endpoint, json.dumps(body, ensure_ascii=False), etag, time.time()),
+            )
+            self.db.commit()
+
+    def touch(self, endpoint: str, params: dict) -> None:
+        """Réponse revalidée (304) : on repart pour un TTL complet."""
+        with self.lock:
+            self.db.execute(
+                "UPDATE responses SET fetched_at = ? WHERE key = ?", (time.time(), cache_key(endpoint, params))
+            )
+            self.db.commit()
+
+    def purge(self, older_than: float | None = None) -> None:
+        """Vide le cache (ou seulement les entrées plus vieilles que `older_than` secondes)."""
+        with self.lock:
+            if older_than is None:
+                self.db.execute("DELETE FROM responses")
+            else:
+                self.db.execute("DELETE FROM responses WHERE fetched_at < ?", (time.time() - older_than,))
+            self.db.commit()
+
+    def __len__(self) -> int:
+        with self.lock:
+            return self.db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self) -> None:
+        with self.lock:
+            self.db.close()
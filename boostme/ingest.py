@@ -0,0 +1,148 @@
+"""
+Ajout incrémental des vidéos du jour dans videos.csv.
+
+Remplace le concat + tri + dédoublonnage de tout l'historique : un index
+persistant (video_id -> views) permet de ne garder du snapshot du jour que
+les lignes nouvelles ou avec plus de vues, de ne nettoyer que celles-ci, puis
+de les fusionner dans videos.csv (trié par video_id) en un seul passage.
+
+Le résultat est identique à l'ancienne logique du notebook :
+    concat([base, new]) -> sort_values(['video_id', 'views']) -> drop_duplicates(keep="last")
+(à égalité de vues, la ligne du jour l'emporte).
+"""
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from boostme import durations, hashtags, schema, store
+
+INDEX_FILE = "videos_index.arrow"
+CHUNKSIZE = 50_000
+
+
+def index_path(videos_path) -> Path:
+    return Path(videos_path).with_name(INDEX_FILE)
+
+
+def build_index(videos_path) -> pd.DataFrame:
+    """
+    Index (video_id, views) reconstruit depuis videos.csv, dans l'ordre du fichier
+    (un index non trié signale un videos.csv qui n'est pas encore trié par video_id).
+    """
+    videos_path = Path(videos_path)
+    if not videos_path.exists():
+        return pd.DataFrame({"video_id": pd.Series(dtype=str), "views": pd.Series(dtype="int64")})
+    return pd.read_csv(videos_path, usecols=["video_id", "views"])
+
+
+def load_index(videos_path) -> pd.DataFrame:
+    path = index_path(videos_path)
+    if path.exists():
+        return store.read_frame(path)
+    index = build_index(videos_path)
+    store.write_table(index, path)
+    return index
+
+
+def dedup_snapshot(new: pd.DataFrame) -> pd.DataFrame:
+    # si en doublon dans le snapshot, prendre la ligne avec + de views (la dernière à égalité)
+    new = new.sort_values(by=["video_id", "views"], kind="stable")
+    return new.drop_duplicates(subset=["video_id"], keep="last").reset_index(drop=True)
+
+
+def snapshot_delta(new: pd.DataFrame, index: pd.DataFrame) -> pd.DataFrame:
+    """Lignes du snapshot à insérer ou à substituer à la ligne existante."""
+    new = dedup_snapshot(new)
+    known_views = new["video_id"].map(index.set_index("video_id")["views"])
+    keep = known_views.isna() | (new["views"] >= known_views)
+    return new[keep].reset_index(drop=True)
+
+
+def clean_delta(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Étapes de nettoyage de nettoyage.ipynb sur les lignes du delta (sortie de
+    snapshot_delta) : langues, engagement, durées en secondes, hashtags.
+    """
+    # langues: supprimer les lignes sans langue, regrouper fr_fr, be_fr sous 'fr', pareil pour 'en'
+    df = df.dropna(subset=["language"]).copy()
+    df.loc[df["language"].str.contains("^fr"), "language"] = "fr"
+    df.loc[df["language"].str.contains("^en"), "language"] = "en"
+
+    # taux d'engagement ; colonnes sous leurs en-têtes de videos.csv (registre boostme/schema.py)
+    engagement = df["likes"] + df["comments"]
+    df[schema.header("videos", "engagement_total")] = engagement
+    df[schema.header("videos", "taux_engagement_pct")] = (engagement / df["views"].replace(0, 1)) * 100
+
+    df[schema.header("videos", "duree_s")] = durations.parse_durations(df["duration"])
+    df["hashtags"] = hashtags.hashtag_lists(hashtags.video_text(df))
+    return df
+
+
+def _full_merge(videos_path: Path, delta: pd.DataFrame, delta_ids: set) -> pd.DataFrame:
+    # videos.csv non trié (ex: sortie de Concate.ipynb) : fusion en mémoire, une seule fois
+    base = pd.read_csv(videos_path, dtype=str, keep_default_na=False)
+    base = base.drop(columns=durations.DROPPED_COLUMNS, errors="ignore")
+    base = base[~base["video_id"].isin(delta_ids)]
+    df = pd.concat([base, delta.reindex(columns=base.columns)], ignore_index=True)
+    return df.sort_values("video_id", kind="stable")
+
+
+def apply_delta(videos_path, delta: pd.DataFrame, delta_ids, chunksize: int = CHUNKSIZE) -> pd.DataFrame:
+    """
+    Fusionne les lignes nettoyées du delta dans videos.csv et met à jour l'index.
+    - delta : sortie de snapshot_delta, après les étapes de nettoyage
+    - delta_ids : video_id du delta avant nettoyage ; les lignes existantes de ces
+      vidéos sont remplacées (ou supprimées si le nettoyage a écarté la nouvelle ligne)
+    Retourne le nouvel index.
+    """
+    videos_path = Path(videos_path)
+    index = load_index(videos_path)
+    delta_ids = set(delta_ids)
+    delta = delta.sort_values("video_id", kind="stable").reset_index(drop=True)
+    tmp_path = videos_path.with_name(videos_path.name + ".tmp")
+
+    if not videos_path.exists():
+        delta.to_csv(tmp_path, index=False)
+    elif not index["video_id"].is_monotonic_increasing:
+        _full_merge(videos_path, delta, delta_ids).to_csv(tmp_path, index=False)
+    else:
+        # fusion de deux flux triés : videos.csv lu par morceaux (texte brut) + delta
+        delta_keys = delta["video_id"].to_numpy(dtype=object)
+        pos = 0
+        header = True
+        columns = None
+        for chunk in pd.read_csv(videos_path, dtype=str, keep_default_na=False, chunksize=chunksize):
+            # colonnes abandonnées (duration_td) : retirées au passage
+            chunk = chunk.drop(columns=durations.DROPPED_COLUMNS, errors="ignore")
+            columns = chunk.columns
+            if chunk.empty:
+                continue
+            end = int(np.searchsorted(delta_keys, chunk["video_id"].iloc[-1], side="right"))
+            chunk = chunk[~chunk["video_id"].isin(delta_ids)]
+            part = pd.concat([chunk, delta.iloc[pos:end].reindex(columns=columns)], ignore_index=True)
+            part.sort_values("video_id", kind="stable").to_csv(
+                tmp_path, index=False, header=header, mode="w" if header else "a"
+            )
+            pos = end
+            header = False
+        rest = delta.iloc[pos:]
+        if columns is not None:
+            rest = rest.reindex(columns=columns)
+        if header:
+            rest.to_csv(tmp_path, index=False)
+        elif len(rest):
+            rest.to_csv(tmp_path, index=False, header=False, mode="a")
+
+    os.replace(tmp_path, videos_path)
+
+    # index : on retire les vidéos du delta puis on ajoute les lignes conservées
+    index = pd.concat(
+        [index[~index["video_id"].isin(delta_ids)], delta[["video_id", "views"]]],
+        ignore_index=True,
+    )
+    index = index.sort_values("video_id", kind="stable").reset_index(drop=True)
+    index["views"] = index["views"].astype("int64")
+    store.write_table(index, index_path(videos_path))
+    return index
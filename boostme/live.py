@@ -0,0 +1,138 @@
+"""
+Rechargement à chaud des snapshots du jour dans le dashboard.
+
+Les fichiers déposés dans data/new_videos/ (get_new_videos.ipynb) sont
+repérés sans redémarrer l'application : pour chaque nouveau fichier, seules
+les lignes nouvelles ou avec plus de vues (ingest.snapshot_delta) sont
+nettoyées, enrichies et substituées dans la table vidéos en mémoire, et le
+cube est corrigé de leurs seuls agrégats. Le numéro de version est alors
+incrémenté : il fait partie de la clé des caches dépendants (index des
+filtres, recherche de chaînes, figures).
+
+Les tables publiées ne sont jamais modifiées : une mise à jour construit de
+nouveaux DataFrames et remplace l'état d'un seul coup, une session en cours
+de rendu garde une version cohérente.
+
+    tables = LiveTables(cats, chaines, videos, cube, SnapshotWatcher(SNAPSHOT_DIR, since_ns))
+    version, videos, videos_cube = tables.refresh()
+"""
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from boostme import enrich, ingest
+
+SNAPSHOT_DIR = Path(__file__).resolve().parent.parent / "data" / "new_videos"
+POLL_INTERVAL = 30  # secondes entre deux parcours du dossier
+
+
+class SnapshotWatcher:
+    """
+    Snapshots CSV du dossier pas encore appliqués.
+    - since_ns : les fichiers modifiés avant (mtime) sont déjà dans les tables chargées
+    Un snapshot réécrit (taille ou date changée) est proposé à nouveau.
+    """
+
+    def __init__(self, snapshot_dir=SNAPSHOT_DIR, since_ns: int = 0):
+        self.snapshot_dir = Path(snapshot_dir)
+        self.applied = {}  # nom -> (taille, mtime_ns)
+        for name, stamp in self._scan().items():
+            if stamp[1] <= since_ns:
+                self.applied[name] = stamp
+
+    def _scan(self) -> dict:
+        stamps = {}
+        if not self.snapshot_dir.is_dir():
+            return stamps
+        for entry in sorted(self.snapshot_dir.iterdir()):
+            if entry.suffix != ".csv":
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            stamps[entry.name] = (stat.st_size, stat.st_mtime_ns)
+        return stamps
+
+    def poll(self) -> list:
+        """Nouveaux snapshots, dans l'ordre des dates (noms AAAA-MM-JJ.csv) : [(chemin, empreinte)]."""
+        return [
+            (self.snapshot_dir / name, stamp)
+            for name, stamp in self._scan().items()
+            if self.applied.get(name) != stamp
+        ]
+
+    def mark(self, path, stamp) -> None:
+        self.applied[Path(path).name] = stamp
+
+
+def apply_snapshot(cats: pd.DataFrame, chaines: pd.DataFrame, videos: pd.DataFrame,
+                   videos_cube: pd.DataFrame, snapshot: pd.DataFrame):
+    """
+    (vidéos, cube, nombre de lignes appliquées) après intégration d'un snapshot brut.
+    - cats, chaines : tables de jointure (chaines = sortie de enrich.prepare_chaines)
+    - videos, videos_cube : tables enrichie et agrégée courantes (non modifiées)
+    """
+    delta = ingest.snapshot_delta(snapshot, videos[["video_id", "views"]])
+    if delta.empty:
+        return videos, videos_cube, 0
+    videos, videos_cube, _, added = enrich.replace_videos(
+        cats, chaines, videos, videos_cube, ingest.clean_delta(delta), delta["video_id"]
+    )
+    return videos, videos_cube, len(added)
+
+
+class LiveTables:
+    """
+    Tables du dashboard (chaînes, vidéos enrichies, cube) tenues à jour avec les
+    snapshots repérés par `watcher`. Un seul exemplaire par processus, partagé
+    par les sessions.
+    """
+
+    def __init__(self, cats: pd.DataFrame, chaines: pd.DataFrame, videos: pd.DataFrame,
+                 videos_cube: pd.DataFrame, watcher: SnapshotWatcher, poll_interval: float = POLL_INTERVAL):
+        self.cats = cats
+        self.chaines = chaines
+        self.watcher = watcher
+        self.poll_interval = poll_interval
+        self.state = (0, videos, videos_cube)  # (version, vidéos, cube) remplacé d'un bloc
+        self.errors = {}  # snapshot illisible -> message (réessayé s'il est réécrit)
+        self._lock = threading.Lock()
+        self._last_poll = None
+
+    @property
+    def version(self) -> int:
+        return self.state[0]
+
+    def refresh(self, force: bool = False) -> tuple:
+        """
+        Applique les nouveaux snapshots (au plus un parcours du dossier toutes
+        les poll_interval secondes) et renvoie l'état courant (version, vidéos, cube).
+        """
+        now = time.monotonic()
+        if not force and self._last_poll is not None and now - self._last_poll < self.poll_interval:
+            return self.state
+        # une autre session applique déjà les snapshots : on sert la version actuelle
+        if not self._lock.acquire(blocking=False):
+            return self.state
+        try:
+            self._last_poll = now
+            version, videos, videos_cube = self.state
+            applied = False
+            for path, stamp in self.watcher.poll():
+                try:
+                    snapshot = pd.read_csv(path)
+                    videos, videos_cube, _ = apply_snapshot(self.cats, self.chaines, videos, videos_cube, snapshot)
+                except (OSError, ValueError, KeyError) as e:
+                    self.errors[path.name] = f"{type(e).__name__}: {e}"
+                else:
+                    self.errors.pop(path.name, None)
+                    applied = True
+                self.watcher.mark(path, stamp)
+            if applied:
+                self.state = (version + 1, videos, videos_cube)
+        finally:
+            self._lock.release()
+        return self.state
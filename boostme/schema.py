@@ -0,0 +1,286 @@
+"""
+Registre des colonnes : un seul nom (et un type) par champ, pour toutes les
+sources.
+
+Selon la source, un même champ arrivait sous plusieurs noms ("Taux
+d'engagement (%)" dans videos.csv, taux_engagement_pct dans le dashboard,
+taux_engagementpct dans les premières apps, channel_title dans l'API...).
+Chaque app les rattrapait au chargement (clean_columns + recherche de
+colonnes candidates dans app3.py, normalize_columns dans l'app de Romain),
+avec un travail sur les chaînes et une copie à chaque lecture.
+
+Ici chaque table déclare ses colonnes canoniques, leur type et les noms
+rencontrés dans les sources (alias). Le store (boostme/store.py) écrit les
+tables sous les noms canoniques, avec les types déclarés ; les lecteurs
+renomment (au niveau Arrow, sans copie), vérifient les colonnes obligatoires
+et ne convertissent que les colonnes dont le type ne correspond pas.
+
+    videos = schema.conform(pd.read_csv("videos.csv"), "videos")
+    table = schema.conform_table(store.read_table("videos.arrow"), "videos")
+
+Les CSV d'échange (videos.csv, chaines.csv, snapshots) gardent leurs en-têtes
+historiques : ce sont des alias.
+"""
+import ast
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from boostme import durations
+
+
+class Column:
+    """
+    Colonne canonique d'une table.
+    - dtype : "string", "int" (int64, float64 si valeurs manquantes, comme read_csv),
+      "Int64" / "Int32", "float", "bool", "datetime" (UTC), "list", "category"
+      ou "category:<type>" (converti en <type> avant d'être encodé) ; None : pas de conversion
+    - aliases : autres noms rencontrés dans les sources (comparés sans la casse)
+    - header : nom dans les CSV d'échange (videos.csv...), s'il diffère du nom canonique
+    """
+
+    def __init__(self, dtype: str | None, *aliases: str, required: bool = False, header: str | None = None):
+        self.dtype = dtype
+        self.aliases = (header, *aliases) if header and header not in aliases else aliases
+        self.required = required
+        self.header = header or None
+
+
+CATS = {
+    "category_id": Column("int", "categoryId", "categorie_id", required=True),
+    "name": Column("string", "category_name", required=True),
+    "chart_available": Column("bool"),
+}
+
+CHAINES = {
+    "id": Column("string", required=True),
+    "title": Column("string", "channel_title", required=True),
+    "description": Column("string"),
+    "country": Column("category", required=True),
+    "views": Column("int", "viewCount"),
+    "subscribers": Column("int", "subscriberCount", required=True),
+    "nb_videos": Column("int", "videoCount", required=True),
+    "uploads_playlist": Column("string"),
+    "topics": Column("list"),
+    "hashtags": Column("list"),
+    "main_category_id": Column("category:Int64"),
+    "nb_videos_analysed": Column("int"),
+    "engagement_rate_pct": Column("float", "engagement_rate", required=True),
+}
+
+VIDEOS = {
+    "video_id": Column("string", required=True),
+    "playlist_id": Column("string"),  # playlist uploads de la chaîne (vidéos récentes, extract_chaines)
+    "title": Column("string"),
+    "description": Column("string"),
+    "channel": Column("category", "channel_title"),
+    "published_at": Column("datetime", "publishedAt", "date_publication", required=True),
+    "duration": Column("string"),
+    "views": Column("int", "vues", "viewCount", required=True),
+    "likes": Column("int", "likeCount"),
+    "comments": Column("int", "commentCount"),
+    "channel_id": Column("category", "channelId", required=True),
+    "category_id": Column("category", "categoryId", "categorie_id", required=True),
+    "language": Column("category"),
+    "engagement_total": Column("int", header="Engagement total"),
+    "taux_engagement_pct": Column(
+        "float", "taux_engagementpct", "taux_engagement", required=True, header="Taux d'engagement (%)"
+    ),
+    "duree_s": Column("Int32", "durée_s", header=durations.DURATION_COLUMN),
+    "hashtags": Column("list"),
+    # colonnes dérivées (enrich.enrich_videos) : noms des exports Power BI
+    "annee": Column(None, "Année"),
+    "jour_semaine": Column(None, "Jour de la semaine"),
+    "heure_publication": Column(None, "Heure"),
+    "categorie": Column(None, "cats.name", "category_name"),
+    "chaine": Column(None),  # titre de chaines.csv joint sur channel_id, distinct de channel (nom renvoyé par l'API)
+}
+
+TABLES = {"cats": CATS, "chaines": CHAINES, "videos": VIDEOS}
+DROPPED = {"videos": durations.DROPPED_COLUMNS}  # colonnes abandonnées, retirées à la lecture
+
+
+def _lookup(table: str) -> dict:
+    # nom rencontré (sans la casse) -> nom canonique
+    names = {}
+    for name, column in TABLES[table].items():
+        for alias in (name, *column.aliases):
+            names.setdefault(alias.casefold(), name)
+    return names
+
+
+LOOKUPS = {table: _lookup(table) for table in TABLES}
+
+
+def canonical_names(columns, table: str) -> tuple:
+    """
+    (renommages, colonnes à retirer) pour des colonnes lues d'une source.
+    Un alias d'une colonne déjà présente sous son nom canonique est retiré.
+    """
+    lookup = LOOKUPS[table]
+    present = set(columns)
+    rename, drop = {}, [c for c in columns if c in DROPPED.get(table, ())]
+    for col in columns:
+        target = lookup.get(str(col).casefold())
+        if target is None or target == col or col in drop:
+            continue
+        if target in present or target in rename.values():
+            drop.append(col)
+        else:
+            rename[col] = target
+    return rename, drop
+
+
+def _check_required(columns, table: str, required=None) -> None:
+    required = [n for n, c in TABLES[table].items() if c.required] if required is None else required
+    missing = [c for c in required if c not in columns]
+    if missing:
+        raise ValueError(f"Colonnes manquantes dans {table} : {missing}. Colonnes {table} : {list(columns)}")
+
+
+# =============================
+# TYPES
+# =============================
+def parse_list(value) -> list:
+    """
+    Convertit une liste sérialisée par pandas ("['a', 'b']") en vraie liste.
+    Valeurs vides / invalides -> liste vide.
+    """
+    if isinstance(value, list):
+        return value
+    if isinstance(value, (tuple, np.ndarray)):
+        return [str(v) for v in value]
+    if not isinstance(value, str) or not value.strip():
+        return []
+    try:
+        parsed = ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return []
+    if isinstance(parsed, (list, tuple, set)):
+        return [str(v) for v in parsed]
+    return []
+
+
+def _to_integer(s: pd.Series) -> pd.Series:
+    # int64 si aucune valeur manquante, sinon float64 (comme read_csv)
+    s = pd.to_numeric(s, errors="coerce")
+    if s.notna().all():
+        return s.astype("int64")
+    return s.astype("float64")
+
+
+def _matches(s: pd.Series, dtype: str) -> bool:
+    if dtype.startswith("category"):
+        return isinstance(s.dtype, pd.CategoricalDtype)
+    if dtype == "int":
+        # float64 : colonne entière avec valeurs manquantes
+        return s.dtype in ("int64", "float64")
+    if dtype == "float":
+        return s.dtype == "float64"
+    if dtype in ("Int64", "Int32", "bool"):
+        return s.dtype == dtype
+    if dtype == "datetime":
+        return isinstance(s.dtype, pd.DatetimeTZDtype)
+    if dtype == "string":
+        return pd.api.types.is_string_dtype(s.dtype) or s.dtype == object
+    if dtype == "list":
+        # valeur manquante -> liste vide, comme à la lecture du CSV
+        first = s.dropna().head(1)
+        return not s.isna().any() and (first.empty or isinstance(first.iloc[0], (list, np.ndarray)))
+    return True
+
+
+def _coerce(s: pd.Series, dtype: str) -> pd.Series:
+    if dtype.startswith("category"):
+        base = dtype.partition(":")[2]
+        return (_coerce(s, base) if base else s).astype("category")
+    if dtype == "int":
+        return _to_integer(s)
+    if dtype == "float":
+        return pd.to_numeric(s, errors="coerce").astype("float64")
+    if dtype in ("Int64", "Int32"):
+        return pd.to_numeric(s, errors="coerce").astype(dtype)
+    if dtype == "bool":
+        return s.astype(bool)
+    if dtype == "datetime":
+        return pd.to_datetime(s, errors="coerce", utc=True)
+    if dtype == "string":
+        return s.astype(str).where(s.notna(), None)
+    if dtype == "list":
+        return s.map(parse_list)
+    return s
+
+
+# =============================
+# LECTURE
+# =============================
+def conform(df: pd.DataFrame, table: str, required=None) -> pd.DataFrame:
+    """
+    Table sous les noms canoniques, aux types déclarés, en un passage sur les
+    colonnes ; `df` n'est pas modifié. ValueError si une colonne obligatoire
+    manque (`required` : liste propre à l'appelant, sinon celle du registre).
+    Les colonnes inconnues du registre sont gardées telles quelles.
+    """
+    rename, drop = canonical_names(df.columns, table)
+    if rename or drop:
+        df = df.drop(columns=drop).rename(columns=rename)
+    _check_required(df.columns, table, required)
+
+    coerce = {
+        name: column.dtype for name, column in TABLES[table].items()
+        if column.dtype and name in df.columns and not _matches(df[name], column.dtype)
+    }
+    if coerce:
+        df = df.copy(deep=False)
+        for name, dtype in coerce.items():
+            df[name] = _coerce(df[name], dtype)
+    return df
+
+
+def conform_table(table: pa.Table, name: str, required=None) -> pa.Table:
+    """Renommage / vérification au niveau Arrow (sans copie des données) avant to_pandas."""
+    rename, drop = canonical_names(table.column_names, name)
+    if drop:
+        table = table.drop_columns(drop)
+    if rename:
+        table = table.rename_columns([rename.get(c, c) for c in table.column_names])
+    _check_required(table.column_names, name, required)
+    return table
+
+
+# =============================
+# ECRITURE
+# =============================
+# lignes brutes des collecteurs (boostme/youtube.py) : valeurs telles que renvoyées
+# par l'API, dates / identifiants / libellés en texte, convertis à la lecture
+RAW_ARROW_TYPES = {"int": pa.int64(), "Int64": pa.int64(), "Int32": pa.int32(), "float": pa.float64(), "bool": pa.bool_()}
+
+
+def header(table: str, name: str) -> str:
+    """Nom de la colonne canonique `name` dans les CSV d'échange."""
+    return TABLES[table][name].header or name
+
+
+def arrow_schema(table: str, columns) -> pa.Schema:
+    """
+    Schéma Arrow des lignes brutes `columns` (noms canoniques) d'un collecteur.
+    ValueError si une colonne n'est pas déclarée dans le registre.
+    """
+    unknown = [c for c in columns if c not in TABLES[table]]
+    if unknown:
+        raise ValueError(f"Colonnes absentes du registre {table} : {unknown}")
+    return pa.schema([(c, RAW_ARROW_TYPES.get(TABLES[table][c].dtype, pa.string())) for c in columns])
+
+
+def csv_dtypes(table: str) -> dict:
+    """dtype à passer à read_csv : identifiants et textes lus en str (pas d'inférence sur "0123")."""
+    return {
+        alias: str
+        for name, column in TABLES[table].items() if column.dtype == "string"
+        for alias in (name, *column.aliases)
+    }
+
+
+def read_csv(path, table: str, **kwargs) -> pd.DataFrame:
+    return conform(pd.read_csv(path, dtype=csv_dtypes(table), **kwargs), table)
@@ -0,0 +1,99 @@
+"""
+Recherche de chaînes pour le filtre "Chaînes" du dashboard.
+
+Index construit une fois : titres normalisés (minuscules, sans accents),
+triés pour la recherche par préfixe, et index inversé trigramme -> chaînes
+pour la recherche dans le titre. Une requête renvoie les k meilleures
+chaînes (préfixe d'abord, puis les plus présentes dans les données) : le
+navigateur ne reçoit jamais la liste complète.
+"""
+import bisect
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+SEARCH_LIMIT = 20
+TOKEN_RE = re.compile(r"\w{3,}")  # mots d'au moins 3 caractères (articles, "de", "le"... ignorés)
+
+
+def normalize(text: str) -> str:
+    text = unicodedata.normalize("NFKD", str(text))
+    return "".join(c for c in text if not unicodedata.combining(c)).casefold().strip()
+
+
+def tokenize(text) -> list:
+    """Mots distincts d'un texte normalisé, dans l'ordre d'apparition (texte absent -> [])."""
+    if not isinstance(text, str):
+        return []
+    return list(dict.fromkeys(TOKEN_RE.findall(normalize(text))))
+
+
+def trigrams(text: str) -> set:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class ChannelSearch:
+    """
+    - names : titres des chaînes (valeurs du filtre)
+    - weights : poids de classement (ex. nombre de vidéos), même ordre que names
+    """
+
+    def __init__(self, names, weights=None):
+        self.names = list(names)
+        self.weights = np.ones(len(self.names)) if weights is None else np.asarray(weights, dtype="float64")
+        self.keys = [normalize(n) for n in self.names]
+
+        # ordre de classement sans requête : poids décroissant puis nom
+        self.by_weight = sorted(range(len(self.names)), key=lambda i: (-self.weights[i], self.keys[i]))
+        self.rank = np.empty(len(self.names), dtype=np.int64)
+        self.rank[self.by_weight] = np.arange(len(self.names))
+
+        self.sorted_keys = sorted((k, i) for i, k in enumerate(self.keys))
+
+        self.postings = {}
+        for i, key in enumerate(self.keys):
+            for gram in trigrams(key):
+                self.postings.setdefault(gram, []).append(i)
+
+    @classmethod
+    def from_videos(cls, videos: pd.DataFrame, column: str = "chaine") -> "ChannelSearch":
+        counts = videos[column].dropna().value_counts()
+        return cls(counts.index.tolist(), counts.to_numpy())
+
+    def _prefix(self, query: str) -> list:
+        start = bisect.bisect_left(self.sorted_keys, (query, -1))
+        ids = []
+        for key, i in self.sorted_keys[start:]:
+            if not key.startswith(query):
+                break
+            ids.append(i)
+        return ids
+
+    def _contains(self, query: str) -> list:
+        if len(query) < 3:
+            return [i for i in self.by_weight if query in self.keys[i]]
+        lists = [self.postings.get(gram, []) for gram in trigrams(query)]
+        lists.sort(key=len)
+        candidates = set(lists[0])
+        for ids in lists[1:]:
+            candidates.intersection_update(ids)
+            if not candidates:
+                break
+        # les trigrammes ne garantissent pas la sous-chaîne complète
+        return [i for i in candidates if query in self.keys[i]]
+
+    def search(self, query: str = "", k: int = SEARCH_LIMIT, offset: int = 0) -> tuple:
+        """
+        (noms de la page demandée, nombre total de résultats).
+        Sans requête : les chaînes les plus présentes.
+        """
+        query = normalize(query or "")
+        if not query:
+            ids = self.by_weight
+        else:
+            prefix = set(self._prefix(query))
+            matches = set(self._contains(query)) | prefix
+            ids = sorted(matches, key=lambda i: (i not in prefix, self.rank[i]))
+        return [self.names[i] for i in ids[offset:offset + k]], len(ids)
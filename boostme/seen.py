@@ -0,0 +1,82 @@
+"""
+Registre global des vidéos dont les détails ont déjà été récupérés.
+
+Partagé entre niches, catégories et exécutions précédentes (SQLite dans
+data/) : une vidéo trouvée par plusieurs mots-clés ou plusieurs niches
+("jeux video" / "gaming", "voiture" / "automobile") n'est envoyée qu'une
+fois à videos.list par fenêtre de rafraîchissement.
+
+    seen = SeenVideos()
+    ids = seen.unseen(ids)               # avant fetch_video_details
+    ...
+    seen.mark(ids)                       # une fois le CSV de la niche écrit
+
+Marquer avant d'avoir écrit les lignes perdrait les vidéos d'une exécution
+interrompue : la relance les sauterait sans les avoir enregistrées.
+"""
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+SEEN_PATH = ROOT_DIR / "data" / "seen_videos.sqlite"
+# même registre pour les chaînes (IDs de playlist uploads) dont les vidéos
+# récentes ont été rafraîchies par extract_chaines.ipynb
+SEEN_CHANNELS_PATH = ROOT_DIR / "data" / "seen_channels.sqlite"
+
+DAY = 24 * 3600
+REFRESH_WINDOW = 7 * DAY
+SQL_BATCH = 500  # limite de paramètres par requête SQLite
+
+
+class SeenVideos:
+    """
+    video_id -> date du dernier fetch de détails.
+    - window : durée (s) pendant laquelle une vidéo déjà récupérée n'est pas redemandée
+    """
+
+    def __init__(self, path=SEEN_PATH, window: float = REFRESH_WINDOW):
+        self.path = Path(path)
+        self.window = window
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self.db.execute("CREATE TABLE IF NOT EXISTS seen (video_id TEXT PRIMARY KEY, fetched_at REAL)")
+        self.db.commit()
+
+    def recent(self, ids) -> set:
+        """IDs récupérés dans la fenêtre de rafraîchissement."""
+        ids = list(dict.fromkeys(ids))
+        since = time.time() - self.window
+        found = set()
+        with self.lock:
+            for i in range(0, len(ids), SQL_BATCH):
+                batch = ids[i:i + SQL_BATCH]
+                rows = self.db.execute(
+                    f"SELECT video_id FROM seen WHERE fetched_at >= ? AND video_id IN ({','.join('?' * len(batch))})",
+                    [since, *batch],
+                ).fetchall()
+                found.update(r[0] for r in rows)
+        return found
+
+    def unseen(self, ids) -> list:
+        """IDs à récupérer : dédoublonnés (ordre conservé), sans ceux vus dans la fenêtre."""
+        ids = list(dict.fromkeys(ids))
+        recent = self.recent(ids)
+        return [i for i in ids if i not in recent]
+
+    def mark(self, ids, fetched_at: float | None = None) -> None:
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        with self.lock:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO seen VALUES (?, ?)", [(i, fetched_at) for i in dict.fromkeys(ids)]
+            )
+            self.db.commit()
+
+    def __len__(self) -> int:
+        with self.lock:
+            return self.db.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+
+    def close(self) -> None:
+        with self.lock:
+            self.db.close()
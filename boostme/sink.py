@@ -0,0 +1,133 @@
+"""
+Écriture en flux des lignes collectées (Arrow IPC stream, .arrows).
+
+Chaque page de réponse de l'API devient un record batch ajouté au fichier
+dès son arrivée : la mémoire ne grossit pas avec le nombre de lignes, et
+après un plantage le fichier contient toutes les pages déjà écrites (le
+format stream n'a pas de pied de fichier, un dernier batch tronqué est
+simplement ignoré à la lecture).
+
+    with ArrowSink("new_videos/2026-01-22.arrows", youtube.VIDEO_SCHEMA) as out:
+        youtube.collect_popular_videos(client, cats, sink=out)
+    sink_to_csv("new_videos/2026-01-22.arrows", "new_videos/2026-01-22.csv")
+
+resume=True reprend un fichier laissé par une exécution interrompue : ses
+batches complets sont recopiés en tête du nouveau fichier (un batch à la
+fois) et les pages suivantes s'y ajoutent. À utiliser avec un registre qui
+saute ce qui est déjà dans le fichier (ex. seen.SEEN_CHANNELS_PATH).
+"""
+import os
+import threading
+from pathlib import Path
+
+import pyarrow as pa
+
+
+class ArrowSink:
+    """
+    Fichier Arrow IPC stream alimenté page par page (utilisable depuis plusieurs threads).
+    - resume : garder les lignes d'un fichier existant au lieu de l'écraser
+    """
+
+    def __init__(self, path, schema: pa.Schema, resume: bool = False):
+        self.path = Path(path)
+        self.schema = schema
+        self.rows = 0
+        self.lock = threading.Lock()
+
+        # le fichier repris est d'abord renommé : un plantage pendant la recopie
+        # laisse l'original intact (.old), repris à la relance suivante
+        old_path = self.path.with_name(self.path.name + ".old")
+        if resume and self.path.exists() and not old_path.exists():
+            os.replace(self.path, old_path)
+        if resume and old_path.exists():
+            old_schema = _schema(old_path)
+            if old_schema is not None and not old_schema.equals(schema):
+                raise ValueError(f"{old_path} n'a pas le schéma attendu : {old_schema}")
+
+        self.file = pa.OSFile(str(self.path), "wb")
+        self.writer = pa.ipc.new_stream(self.file, schema)
+        if resume and old_path.exists():
+            for batch in iter_batches(old_path):
+                self.writer.write_batch(batch)
+                self.rows += batch.num_rows
+            self.file.flush()
+            old_path.unlink()
+
+    def write(self, rows: list) -> None:
+        """Ajoute une page de lignes (liste de dicts) au fichier."""
+        if not rows:
+            return
+        batch = pa.RecordBatch.from_pylist(rows, schema=self.schema)
+        with self.lock:
+            self.writer.write_batch(batch)
+            self.file.flush()
+            self.rows += len(rows)
+
+    def close(self) -> None:
+        with self.lock:
+            if not self.file.closed:
+                self.writer.close()
+                self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def iter_batches(path):
+    """Record batches d'un fichier .arrows, jusqu'au dernier batch complet."""
+    with pa.OSFile(str(path), "rb") as f:
+        try:
+            reader = pa.ipc.open_stream(f)
+        except pa.ArrowInvalid:
+            return  # fichier vide : plantage avant le premier batch
+        while True:
+            try:
+                yield reader.read_next_batch()
+            except StopIteration:
+                return
+            except (pa.ArrowInvalid, OSError):
+                return  # batch tronqué par un plantage
+
+
+def _schema(path) -> pa.Schema | None:
+    # None : fichier vide (plantage avant l'en-tête)
+    with pa.OSFile(str(path), "rb") as f:
+        try:
+            return pa.ipc.open_stream(f).schema
+        except pa.ArrowInvalid:
+            return None
+
+
+def read_sink(path) -> pa.Table:
+    batches = list(iter_batches(path))
+    if not batches:
+        schema = _schema(path)
+        return pa.table({}) if schema is None else schema.empty_table()
+    return pa.Table.from_batches(batches)
+
+
+def sink_to_csv(path, csv_path, encoding: str = "utf-8-sig") -> int:
+    """
+    Convertit un .arrows en CSV batch par batch (même format que DataFrame.to_csv).
+    Renvoie le nombre de lignes. Sans aucune ligne, le CSV a quand même l'en-tête
+    (schéma du fichier) : read_csv en aval lit un tableau vide, pas une erreur.
+    """
+    # fichier temporaire + os.replace : un CSV à moitié écrit n'est jamais visible
+    # (le dashboard surveille data/new_videos, voir boostme/live.py)
+    rows = 0
+    header = True
+    tmp_path = str(csv_path) + ".tmp"
+    with open(tmp_path, "w", encoding=encoding, newline="") as f:
+        for batch in iter_batches(path):
+            batch.to_pandas().to_csv(f, header=header, index=False)
+            rows += batch.num_rows
+            header = False
+        schema = _schema(path) if header else None
+        if schema is not None:
+            schema.empty_table().to_pandas().to_csv(f, index=False)
+    os.replace(tmp_path, csv_path)
+    return rows
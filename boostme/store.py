@@ -0,0 +1,211 @@
+"""
+Stockage colonnaire (Arrow IPC) des tables cats / chaines / videos.
+
+Le pipeline de nettoyage écrit une seule fois des fichiers typés
+(dates natives, catégories et listes topics / hashtags encodées en
+dictionnaire) ; le dashboard les ouvre en memory-map au lieu de re-parser
+les CSV à chaque démarrage à froid.
+"""
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from boostme import schema
+from boostme.schema import parse_list  # noqa: F401 (store.parse_list, utilisé par les notebooks)
+
+# =============================
+# FICHIERS
+# =============================
+CATS_FILE = "cats.arrow"
+CHAINES_FILE = "chaines.arrow"
+VIDEOS_FILE = "videos.arrow"
+STORE_FILES = [CATS_FILE, CHAINES_FILE, VIDEOS_FILE]
+
+# =============================
+# TYPES
+# =============================
+# noms et types des colonnes : registre boostme/schema.py
+CHAINES_LISTS = ["topics", "hashtags"]
+# listes de chaines -> list<dictionary<int32, string>> : un thème / hashtag
+# distinct n'est stocké qu'une fois, une chaîne n'est qu'une liste de codes
+LIST_TYPE = pa.list_(pa.dictionary(pa.int32(), pa.string()))
+
+
+def prepare_cats(cats: pd.DataFrame) -> pd.DataFrame:
+    return schema.conform(cats, "cats")
+
+
+def prepare_chaines(chaines: pd.DataFrame) -> pd.DataFrame:
+    return schema.conform(chaines, "chaines")
+
+
+def prepare_videos(videos: pd.DataFrame) -> pd.DataFrame:
+    return schema.conform(videos, "videos")
+
+
+def encode_lists(values) -> pa.ListArray:
+    """
+    Colonne list<dictionary<int32, string>> : vocabulaire trié, doublons
+    retirés dans chaque liste. Valeur absente / non liste -> liste vide.
+    """
+    lists = [list(dict.fromkeys(parse_list(v))) for v in values]
+    offsets = np.zeros(len(lists) + 1, dtype=np.int32)
+    np.cumsum([len(v) for v in lists], out=offsets[1:])
+
+    codes, vocab = pd.factorize(pd.Series([t for v in lists for t in v], dtype=object), sort=True)
+    items = pa.DictionaryArray.from_arrays(
+        pa.array(codes.astype(np.int32), pa.int32()), pa.array(vocab.to_numpy(dtype=object), pa.string())
+    )
+    return pa.ListArray.from_arrays(pa.array(offsets), items)
+
+
+def compact_lists(column) -> pa.ListArray:
+    """
+    Colonne list<dictionary<int32, string>> en une seule tranche, vocabulaire
+    réduit aux termes utilisés et trié, comme encode_lists (après filtre /
+    concaténation de tables encodées, sans repasser par les listes Python).
+    """
+    if isinstance(column, pa.ChunkedArray):
+        column = column.combine_chunks() if column.num_chunks else pa.array([], LIST_TYPE)
+    items = column.flatten()
+    used, codes = np.unique(items.indices.to_numpy(zero_copy_only=False), return_inverse=True)
+    terms = items.dictionary.to_numpy(zero_copy_only=False).astype(object)[used]
+    order = np.argsort(terms.astype(str), kind="stable")
+    rank = np.empty(len(order), dtype=np.int32)
+    rank[order] = np.arange(len(order), dtype=np.int32)
+
+    offsets = column.offsets.to_numpy().astype(np.int32)
+    items = pa.DictionaryArray.from_arrays(
+        pa.array(rank[codes.reshape(-1)], pa.int32()), pa.array(terms[order], pa.string())
+    )
+    return pa.ListArray.from_arrays(pa.array(offsets - offsets[0]), items)
+
+
+def chaines_table(chaines: pd.DataFrame) -> pa.Table:
+    """Table Arrow de chaines (sortie de prepare_chaines), listes encodées en dictionnaire."""
+    lists = [c for c in CHAINES_LISTS if c in chaines.columns]
+    table = pa.Table.from_pandas(chaines.drop(columns=lists), preserve_index=False)
+    for col in lists:
+        table = table.append_column(pa.field(col, LIST_TYPE), encode_lists(chaines[col]))
+    return table
+
+
+# =============================
+# LECTURE / ECRITURE
+# =============================
+def write_table(df: pd.DataFrame | pa.Table, path, compression: str = "uncompressed") -> None:
+    # non compressé : condition pour pouvoir relire en memory-map sans copie
+    # (compression="zstd" pour les tables lues en entier, ex. boostme/timeseries.py)
+    # fichier temporaire + os.replace : un DataFrame encore mappé sur l'ancien
+    # fichier (lu puis réécrit, ex. l'index d'ingestion) reste valide
+    tmp_path = str(path) + ".tmp"
+    feather.write_feather(df, tmp_path, compression=compression)
+    os.replace(tmp_path, path)
+
+
+def read_table(path) -> pa.Table:
+    with pa.memory_map(str(path), "r") as source:
+        return pa.ipc.open_file(source).read_all()
+
+
+def read_frame(path, table: str | None = None) -> pd.DataFrame:
+    """
+    Fichier Arrow en DataFrame. Avec `table` (cats / chaines / videos), lecture
+    validée : noms canoniques, colonnes obligatoires présentes (ValueError
+    sinon), conversion des seules colonnes au type inattendu (fichier ancien).
+    """
+    arrow_table = read_table(path)
+    if table is not None:
+        arrow_table = schema.conform_table(arrow_table, table)
+    # split_blocks : les colonnes numériques sans NaN restent des vues sur le fichier mappé
+    df = arrow_table.to_pandas(split_blocks=True)
+    return df if table is None else schema.conform(df, table)
+
+
+def union_categories(base: pd.DataFrame, added: pd.DataFrame) -> tuple:
+    """
+    (base, added) aux mêmes catégories pour chaque colonne catégorielle de
+    base : sinon pd.concat repasserait la colonne en object. Catégories non
+    ordonnées : valeurs présentes triées, comme astype("category") sur la
+    table entière (mêmes dtypes, mêmes options de filtres qu'une reconstruction).
+    """
+    base, added = base.copy(), added.copy()
+    for col in base.columns:
+        if isinstance(base[col].dtype, pd.CategoricalDtype) and col in added.columns:
+            if base[col].cat.ordered:
+                categories = base[col].cat.categories.union(pd.Index(added[col].dropna().unique()), sort=False)
+            else:
+                present = base[col].cat.remove_unused_categories().cat.categories
+                categories = present.union(pd.Index(added[col].dropna().unique()), sort=True)
+            dtype = pd.CategoricalDtype(categories, ordered=base[col].cat.ordered)
+            base[col] = base[col].astype(dtype)
+            added[col] = added[col].astype(dtype)
+    return base, added
+
+
+def data_version(data_dir, files) -> tuple:
+    """
+    Empreinte (nom, taille, mtime) des fichiers présents : change dès que le
+    pipeline réécrit une table (write_table remplace le fichier).
+    """
+    version = []
+    for name in files:
+        try:
+            stat = (Path(data_dir) / name).stat()
+        except FileNotFoundError:
+            continue
+        version.append((name, stat.st_size, stat.st_mtime_ns))
+    return tuple(version)
+
+
+def write_store(data_dir, cats: pd.DataFrame, chaines: pd.DataFrame, videos: pd.DataFrame) -> None:
+    data_dir = Path(data_dir)
+    write_table(prepare_cats(cats), data_dir / CATS_FILE)
+    write_table(chaines_table(prepare_chaines(chaines)), data_dir / CHAINES_FILE)
+    write_table(prepare_videos(videos), data_dir / VIDEOS_FILE)
+
+
+def build_store(data_dir) -> None:
+    """Construit le store à partir de cats.csv, chaines.csv et videos.csv du dossier."""
+    data_dir = Path(data_dir)
+    write_store(
+        data_dir,
+        schema.read_csv(data_dir / "cats.csv", "cats"),
+        schema.read_csv(data_dir / "chaines.csv", "chaines"),
+        schema.read_csv(data_dir / "videos.csv", "videos"),
+    )
+
+
+def update_videos(data_dir, delta: pd.DataFrame, delta_ids) -> None:
+    """
+    videos.arrow après ingestion du jour (ingest.apply_delta), sans relire videos.csv :
+    les lignes des vidéos de delta_ids sont retirées, celles du delta ajoutées en fin de table.
+    - delta : lignes nettoyées (ingest.clean_delta)
+    """
+    path = Path(data_dir) / VIDEOS_FILE
+    videos = read_frame(path, "videos")
+    kept = videos[~videos["video_id"].isin(set(delta_ids))]
+    kept, added = union_categories(kept, prepare_videos(delta).reindex(columns=videos.columns))
+    write_table(pd.concat([kept, added], ignore_index=True), path)
+
+
+def has_store(data_dir) -> bool:
+    return all((Path(data_dir) / f).exists() for f in STORE_FILES)
+
+
+def load_store(data_dir):
+    data_dir = Path(data_dir)
+    return (
+        read_frame(data_dir / CATS_FILE, "cats"),
+        read_frame(data_dir / CHAINES_FILE, "chaines"),
+        read_frame(data_dir / VIDEOS_FILE, "videos"),
+    )
+
+
+if __name__ == "__main__":
+    build_store(sys.argv[1] if len(sys.argv) > 1 else "data")
@@ -0,0 +1,222 @@
+"""
+Historique des statistiques de chaque vidéo à travers les snapshots du jour.
+
+nettoyage.ipynb ne garde dans videos.csv que la ligne avec le plus de vues
+par vidéo : la croissance d'un jour à l'autre est perdue. Ce store garde un
+point (vues, likes, commentaires) par vidéo et par snapshot :
+
+- video_ids.arrow : dictionnaire video_id -> code (position), avec la chaîne
+  et la catégorie ;
+  on ne fait qu'y ajouter des lignes, un code ne change jamais
+- <AAAA-MM-JJ>.arrow : un fichier par snapshot, jamais réécrit (code int32,
+  jour, écarts int64 avec le point précédent de la même vidéo ; le premier
+  point d'une vidéo est sa valeur). Les écarts sont petits : compressés zstd.
+
+À l'ouverture, les points sont triés par (vidéo, jour) et reconstitués par
+somme cumulée ; les points d'une vidéo sont ensuite un intervalle contigu
+(offsets), une requête ne lit que ceux-là.
+
+    timeseries.append_snapshot("video_stats", DATE, new_videos)
+    stats = timeseries.VideoStats.open("video_stats")
+    stats.velocity("ZUImulAXjWs", days=7)     # vues / jour sur les 7 derniers jours
+    stats.channel_velocity("UCzsdGXNzB9m0wXZwU05Fiyg", days=7)
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from boostme import ingest, store
+
+IDS_FILE = "video_ids.arrow"
+ID_COLUMNS = ["video_id", "channel_id", "category_id"]
+STATS = ["views", "likes", "comments"]
+EPOCH = pd.Timestamp("1970-01-01")
+
+
+def to_day(value) -> int:
+    """Jour (nombre de jours depuis 1970-01-01) d'une date / d'un nom de snapshot."""
+    return int((pd.Timestamp(str(value)).normalize() - EPOCH).days)
+
+
+def day_name(day: int) -> str:
+    return (EPOCH + pd.Timedelta(days=int(day))).strftime("%Y-%m-%d")
+
+
+def snapshot_days(stats_dir) -> list:
+    """Jours déjà présents dans le store, triés."""
+    return sorted(to_day(p.stem) for p in Path(stats_dir).glob("????-??-??.arrow"))
+
+
+def load_ids(stats_dir) -> pd.DataFrame:
+    path = Path(stats_dir) / IDS_FILE
+    if path.exists():
+        return store.read_frame(path)
+    return pd.DataFrame({col: pd.Series(dtype=str) for col in ID_COLUMNS})
+
+
+class VideoStats:
+    """
+    Séries (jour, vues, likes, commentaires) de toutes les vidéos du store.
+    - ids : dictionnaire video_id / channel_id / category_id (position = code)
+    - codes, days, values : points triés par (code, jour), values[stat] en valeurs absolues
+    """
+
+    def __init__(self, ids: pd.DataFrame, codes: np.ndarray, days: np.ndarray, values: dict):
+        self.ids = ids
+        self.codes = codes
+        self.days = days
+        self.values = values
+        self.code_of = pd.Index(ids["video_id"])
+        # points de la vidéo c : [offsets[c], offsets[c + 1])
+        self.offsets = np.searchsorted(codes, np.arange(len(ids) + 1)).astype(np.int64)
+        self.last_day = int(days.max()) if len(days) else None
+
+        # vidéos de chaque chaîne, triées par chaîne
+        channel_codes, self.channels = pd.factorize(ids["channel_id"])
+        self.by_channel = np.argsort(channel_codes, kind="stable")
+        self.channel_offsets = np.searchsorted(
+            channel_codes[self.by_channel], np.arange(len(self.channels) + 1)
+        ).astype(np.int64)
+
+    @classmethod
+    def open(cls, stats_dir) -> "VideoStats":
+        stats_dir = Path(stats_dir)
+        ids = load_ids(stats_dir)
+        parts = [store.read_frame(stats_dir / f"{day_name(day)}.arrow") for day in snapshot_days(stats_dir)]
+        if not parts:
+            empty = np.array([], dtype=np.int64)
+            return cls(ids, empty.astype(np.int32), empty.astype(np.int32), {s: empty for s in STATS})
+
+        points = pd.concat(parts, ignore_index=True)
+        codes = points["code"].to_numpy()
+        days = points["day"].to_numpy()
+        order = np.lexsort((days, codes))
+        codes, days = codes[order], days[order]
+
+        # somme cumulée par vidéo : cumsum global moins le total des vidéos précédentes
+        starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+        values = {}
+        for stat in STATS:
+            total = np.cumsum(points[stat].to_numpy()[order])
+            before = np.r_[0, total[starts[1:] - 1]]
+            values[stat] = total - np.repeat(before, np.diff(np.r_[starts, len(codes)]))
+        return cls(ids, codes, days, values)
+
+    def series(self, video_id: str) -> pd.DataFrame:
+        """Points d'une vidéo : colonnes date, views, likes, comments."""
+        start, end = self._range(video_id)
+        df = pd.DataFrame({stat: self.values[stat][start:end] for stat in STATS})
+        df.insert(0, "date", EPOCH + pd.to_timedelta(self.days[start:end], unit="D"))
+        return df
+
+    def last_values(self, codes: np.ndarray) -> dict:
+        """Dernière valeur connue de chaque stat pour des codes (0 pour une vidéo sans point)."""
+        codes = np.asarray(codes, dtype=np.int64)
+        result = {stat: np.zeros(len(codes), dtype=np.int64) for stat in STATS}
+        known = np.flatnonzero(codes < len(self.offsets) - 1)
+        ends = self.offsets[codes[known] + 1]
+        has_point = ends > self.offsets[codes[known]]
+        for stat in STATS:
+            result[stat][known[has_point]] = self.values[stat][ends[has_point] - 1]
+        return result
+
+    def _range(self, video_id: str) -> tuple:
+        code = self.code_of.get_indexer([video_id])[0]
+        if code < 0:
+            return 0, 0
+        return int(self.offsets[code]), int(self.offsets[code + 1])
+
+    def _velocity(self, start: int, end: int, days: int, asof: int, stat: str) -> float:
+        # dernier point <= asof, et point de référence : dernier point <= asof - days
+        # (ou premier point si la vidéo est plus récente que la fenêtre)
+        point_days = self.days[start:end]
+        last = start + int(np.searchsorted(point_days, asof, side="right")) - 1
+        if last < start:
+            return float("nan")
+        base = max(start + int(np.searchsorted(point_days, asof - days, side="right")) - 1, start)
+        elapsed = int(self.days[last]) - int(self.days[base])
+        if elapsed <= 0:
+            return float("nan")
+        values = self.values[stat]
+        return float(values[last] - values[base]) / elapsed
+
+    def velocity(self, video_id: str, days: int = 7, asof=None, stat: str = "views") -> float:
+        """
+        Gain moyen par jour de `stat` sur les `days` jours avant `asof` (dernier
+        snapshot par défaut). NaN si moins de deux points dans la fenêtre.
+        """
+        start, end = self._range(video_id)
+        asof = self.last_day if asof is None else to_day(asof)
+        if start == end or asof is None:
+            return float("nan")
+        return self._velocity(start, end, days, asof, stat)
+
+    def channel_velocity(self, channel_id: str, days: int = 7, asof=None, stat: str = "views") -> float:
+        """Somme des vitesses des vidéos suivies de la chaîne (NaN si aucune n'est mesurable)."""
+        pos = self.channels.get_indexer([channel_id])[0]
+        asof = self.last_day if asof is None else to_day(asof)
+        if pos < 0 or asof is None:
+            return float("nan")
+        video_codes = self.by_channel[self.channel_offsets[pos]:self.channel_offsets[pos + 1]]
+        speeds = [
+            self._velocity(int(self.offsets[c]), int(self.offsets[c + 1]), days, asof, stat)
+            for c in video_codes
+            if self.offsets[c + 1] > self.offsets[c]
+        ]
+        speeds = [v for v in speeds if v == v]
+        return float(np.sum(speeds)) if speeds else float("nan")
+
+
+def append_snapshot(stats_dir, snapshot_date, snapshot: pd.DataFrame) -> int:
+    """
+    Ajoute un snapshot (CSV brut de new_videos/) au store. Renvoie le nombre de points écrits.
+    Un jour déjà présent est ignoré ; un snapshot plus ancien que le dernier
+    est refusé (les écarts des jours suivants en dépendent).
+    """
+    stats_dir = Path(stats_dir)
+    stats_dir.mkdir(parents=True, exist_ok=True)
+    day = to_day(snapshot_date)
+    days = snapshot_days(stats_dir)
+    if day in days:
+        return 0
+    if days and day < days[-1]:
+        raise ValueError(
+            f"Snapshot {day_name(day)} antérieur au dernier du store ({day_name(days[-1])}) : "
+            f"reconstruire le store avec build_stats"
+        )
+
+    snap = ingest.dedup_snapshot(snapshot[[*ID_COLUMNS, *STATS]])
+    ids = load_ids(stats_dir)
+    new = snap.loc[~snap["video_id"].isin(ids["video_id"]), ID_COLUMNS]
+    if len(new):
+        ids = pd.concat([ids, new.astype(str)], ignore_index=True)
+        store.write_table(ids, stats_dir / IDS_FILE)
+    codes = pd.Index(ids["video_id"]).get_indexer(snap["video_id"])
+
+    # écart avec le dernier point de la vidéo ; valeur manquante (likes masqués...) -> inchangée
+    last = VideoStats.open(stats_dir).last_values(codes)
+    points = pd.DataFrame({"code": codes.astype(np.int32), "day": np.full(len(codes), day, dtype=np.int32)})
+    for stat in STATS:
+        current = pd.to_numeric(snap[stat], errors="coerce").to_numpy(dtype="float64")
+        current = np.where(np.isnan(current), last[stat], current).astype(np.int64)
+        points[stat] = current - last[stat]
+    store.write_table(points, stats_dir / f"{day_name(day)}.arrow", compression="zstd")
+    return len(points)
+
+
+def build_stats(snapshot_dir, stats_dir) -> None:
+    """(Re)construit le store à partir de tous les snapshots CSV du dossier, dans l'ordre des dates."""
+    stats_dir = Path(stats_dir)
+    for path in list(stats_dir.glob("*.arrow")):
+        path.unlink()
+    for path in sorted(Path(snapshot_dir).glob("????-??-??.csv")):
+        append_snapshot(stats_dir, path.stem, pd.read_csv(path))
+
+
+if __name__ == "__main__":
+    build_stats(
+        sys.argv[1] if len(sys.argv) > 1 else "data/new_videos",
+        sys.argv[2] if len(sys.argv) > 2 else "data/video_stats",
+    )
@@ -0,0 +1,174 @@
+"""
+Index inversé thème -> chaînes sur les listes topics / hashtags.
+
+Les tables Arrow des chaînes (store.chaines_table) gardent topics et hashtags
+en list<dictionary<int32, string>> : codes entiers par chaîne et vocabulaire
+partagé. L'index est construit sur ces codes sans repasser par les chaînes de
+caractères : postings = positions des chaînes triées, regroupées par code.
+"chaînes du thème X" est une tranche, un filtre sur plusieurs thèmes une
+union / intersection de tableaux triés.
+
+chaines_topics.arrow (id, topics, hashtags, mots du titre) est écrit par
+build_enriched dans l'ordre de chaines_fr : les positions renvoyées indexent
+ses lignes. La même structure sert aux facettes des vidéos (boostme/facets.py).
+
+    index = topics.TopicIndex.open(data_dir)
+    rows = index.any_of("topics", ["Food", "Lifestyle (sociology)"])
+    chaines.iloc[rows]
+    rows = index.select({"topics": ["Food"], "mots": ["cuisine"]}, match_all=["mots"])
+"""
+from functools import reduce
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from boostme import search, store
+
+TOPICS_FILE = "chaines_topics.arrow"
+
+
+def topic_names(urls) -> list:
+    """
+    Noms des thèmes à partir des URLs topicDetails de l'API
+    ("https://en.wikipedia.org/wiki/Lifestyle_(sociology)" -> "Lifestyle (sociology)").
+    """
+    if not isinstance(urls, (list, tuple, np.ndarray)):
+        return []
+    return list(dict.fromkeys(str(url).split("/")[-1].replace("_", " ") for url in urls))
+
+
+def encoded_table(key: pd.Series, lists: dict) -> pa.Table:
+    """Table (clé, colonnes list<dictionary<int32, string>>) : une ligne par valeur de `key`."""
+    table = pa.table({key.name: pa.array(key.astype(str).to_numpy(dtype=object), pa.string())})
+    for col, values in lists.items():
+        table = table.append_column(pa.field(col, store.LIST_TYPE), store.encode_lists(values))
+    return table
+
+
+def topics_table(chaines: pd.DataFrame) -> pa.Table:
+    """(id, topics, hashtags, mots) encodés, dans l'ordre de `chaines` (listes Python ou tableaux)."""
+    lists = {c: chaines[c] for c in store.CHAINES_LISTS if c in chaines.columns}
+    if "title" in chaines.columns:
+        lists["mots"] = chaines["title"].map(search.tokenize)
+    return encoded_table(chaines["id"], lists)
+
+
+class TopicIndex:
+    """
+    Listes des chaînes (même ordre que `ids`) et index inversé, par colonne :
+    - vocab[col] : termes triés (position = code)
+    - lists[col] : (offsets, codes) des termes de chaque chaîne ; owners[col] : chaîne de chaque code
+    - postings[col] : (offsets, positions) des chaînes de chaque terme, triées
+    """
+
+    def __init__(self, ids, columns: dict):
+        self.ids = pd.Index(ids)
+        self.vocab, self.lists, self.owners, self.postings = {}, {}, {}, {}
+        for col, column in columns.items():
+            if isinstance(column, pa.ChunkedArray):
+                column = column.combine_chunks() if column.num_chunks else pa.array([], store.LIST_TYPE)
+            items = column.flatten()
+            if not isinstance(items.type, pa.DictionaryType):
+                items = items.dictionary_encode()
+            vocab = items.dictionary.to_numpy(zero_copy_only=False).astype(object)
+            codes = items.indices.to_numpy(zero_copy_only=False).astype(np.int64)
+            # vocabulaire trié (déjà le cas pour les fichiers écrits par le store)
+            order = np.argsort(vocab.astype(str), kind="stable")
+            rank = np.empty(len(order), dtype=np.int64)
+            rank[order] = np.arange(len(order))
+            codes = rank[codes]
+
+            offsets = column.offsets.to_numpy().astype(np.int64)
+            offsets -= offsets[0]
+            owner = np.repeat(np.arange(len(column), dtype=np.int64), np.diff(offsets))
+            by_term = np.argsort(codes, kind="stable")  # positions croissantes dans chaque terme
+
+            self.vocab[col] = pd.Index(vocab[order])
+            self.lists[col] = (offsets, codes)
+            self.owners[col] = owner
+            self.postings[col] = (np.searchsorted(codes[by_term], np.arange(len(order) + 1)), owner[by_term])
+
+    @classmethod
+    def from_table(cls, table: pa.Table, key: str = "id") -> "TopicIndex":
+        """Index sur toutes les colonnes listes de la table ; `key` donne les ids des lignes."""
+        return cls(
+            table.column(key).to_pandas(),
+            {f.name: table.column(f.name) for f in table.schema if pa.types.is_list(f.type)},
+        )
+
+    @classmethod
+    def from_frame(cls, chaines: pd.DataFrame) -> "TopicIndex":
+        """Index construit en mémoire (dashboard lancé sans fichiers matérialisés)."""
+        return cls.from_table(topics_table(chaines))
+
+    @classmethod
+    def open(cls, data_dir) -> "TopicIndex":
+        return cls.from_table(store.read_table(Path(data_dir) / TOPICS_FILE))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def counts(self, col: str = "topics", rows=None) -> pd.Series:
+        """
+        Nombre de chaînes par terme, décroissant (termes absents compris, à 0).
+        - rows : positions auxquelles se limiter (résultat d'une autre sélection)
+        """
+        if rows is None:
+            n = np.diff(self.postings[col][0])
+        else:
+            keep = np.zeros(len(self.ids), dtype=bool)
+            keep[rows] = True
+            n = np.bincount(self.lists[col][1][keep[self.owners[col]]], minlength=len(self.vocab[col]))
+        return pd.Series(n, index=self.vocab[col]).sort_values(ascending=False, kind="stable")
+
+    def channels(self, col: str, term: str) -> np.ndarray:
+        """Positions (triées) des chaînes ayant le terme."""
+        code = self.vocab[col].get_indexer([term])[0]
+        if code < 0:
+            return np.array([], dtype=np.int64)
+        offsets, positions = self.postings[col]
+        return positions[offsets[code]:offsets[code + 1]]
+
+    def any_of(self, col: str, terms) -> np.ndarray:
+        """Chaînes ayant au moins un des termes (union)."""
+        return reduce(np.union1d, (self.channels(col, t) for t in terms), np.array([], dtype=np.int64))
+
+    def all_of(self, col: str, terms) -> np.ndarray:
+        """Chaînes ayant tous les termes (intersection, en partant de la liste la plus courte) ; toutes si aucun."""
+        lists = sorted((self.channels(col, t) for t in terms), key=len)
+        if not lists:
+            return np.arange(len(self.ids))
+        return reduce(lambda a, b: np.intersect1d(a, b, assume_unique=True), lists)
+
+    def select(self, selections: dict, match_all=()) -> np.ndarray | None:
+        """
+        Positions retenues : au moins un des termes de chaque colonne (tous pour
+        les colonnes de match_all), intersection entre colonnes. None si aucune
+        colonne n'a de terme sélectionné (pas de filtre).
+        """
+        rows = None
+        for col, terms in selections.items():
+            if not terms:
+                continue
+            found = self.all_of(col, terms) if col in match_all else self.any_of(col, terms)
+            rows = found if rows is None else np.intersect1d(rows, found, assume_unique=True)
+        return rows
+
+    def terms_of(self, col: str, position: int) -> list:
+        offsets, codes = self.lists[col]
+        return list(self.vocab[col][codes[offsets[position]:offsets[position + 1]]])
+
+    def terms_by_id(self, col: str = "topics") -> pd.Series:
+        """id -> liste des termes de la ligne (premier exemplaire d'un id répété)."""
+        terms = pd.Series([self.terms_of(col, i) for i in range(len(self.ids))], index=self.ids, dtype=object)
+        return terms[~terms.index.duplicated()]
+
+
+def write_topics(data_dir, chaines: pd.DataFrame) -> None:
+    store.write_table(topics_table(chaines), Path(data_dir) / TOPICS_FILE)
+
+
+def has_topics(data_dir) -> bool:
+    return (Path(data_dir) / TOPICS_FILE).exists()
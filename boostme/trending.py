@@ -0,0 +1,106 @@
+"""
+Classement des vidéos et des chaînes qui accélèrent (page "Tendances").
+
+Le "Top chaînes" de la page vidéos somme engagement_total : il favorise les
+grosses chaînes anciennes. Ici on mesure la croissance entre snapshots
+consécutifs (boostme/timeseries.py) :
+
+- vitesse : gain par jour entre les deux derniers points de la vidéo
+- accélération : variation de la vitesse par jour entre les deux derniers
+  intervalles (trois points nécessaires)
+
+Le calcul est vectorisé (np.diff sur les points triés par vidéo) et seules
+les vidéos présentes dans le dernier snapshot sont classées ; les k
+meilleures par catégorie sont gardées dans un tas de taille k. Quelques
+millisecondes : recalculé à chaque ingestion / rechargement du store.
+
+    stats = timeseries.VideoStats.open("video_stats")
+    videos = trending.video_trends(stats)
+    top = trending.top_k(videos, "velocity", k=10, by="category_id")
+    chaines = trending.top_k(trending.channel_trends(videos), "velocity", k=10, by="category_id")
+"""
+import heapq
+
+import numpy as np
+import pandas as pd
+
+from boostme.timeseries import VideoStats
+
+TOP_K = 10
+
+
+def video_trends(stats: VideoStats, stat: str = "views") -> pd.DataFrame:
+    """
+    Vitesse et accélération de `stat` pour chaque vidéo du dernier snapshot
+    ayant au moins deux points : video_id, channel_id, category_id, value
+    (dernière valeur), velocity, acceleration (NaN avec deux points seulement).
+    """
+    columns = ["video_id", "channel_id", "category_id", "value", "velocity", "acceleration"]
+    if stats.last_day is None:
+        return pd.DataFrame(columns=columns)
+
+    codes, days = stats.codes, stats.days.astype(np.int64)
+    values = stats.values[stat].astype(np.float64)
+
+    # vitesse de chaque intervalle (point i -> i + 1) ; NaN à la frontière entre deux vidéos
+    same = codes[1:] == codes[:-1]
+    elapsed = np.diff(days)
+    speed = np.where(same, np.diff(values) / np.where(elapsed > 0, elapsed, 1), np.nan)
+    # accélération entre deux intervalles consécutifs, rapportée à l'écart entre leurs milieux
+    middles = (days[1:] + days[:-1]) / 2
+    accel = np.where(same[1:] & same[:-1], np.diff(speed) / np.where(np.diff(middles) > 0, np.diff(middles), 1), np.nan)
+
+    starts, ends = stats.offsets[:-1], stats.offsets[1:]
+    active = (ends - starts >= 2)
+    active[active] = days[ends[active] - 1] == stats.last_day
+    video_codes = np.flatnonzero(active)
+    last = ends[video_codes] - 1
+
+    acceleration = np.full(len(video_codes), np.nan)
+    has_accel = last - starts[video_codes] >= 2
+    acceleration[has_accel] = accel[last[has_accel] - 2]
+
+    df = stats.ids.iloc[video_codes][["video_id", "channel_id", "category_id"]].reset_index(drop=True)
+    df["value"] = stats.values[stat][last]
+    df["velocity"] = speed[last - 1]
+    df["acceleration"] = acceleration
+    return df[columns]
+
+
+def channel_trends(videos: pd.DataFrame, by_category: bool = True) -> pd.DataFrame:
+    """
+    Somme des vitesses / accélérations des vidéos classées de chaque chaîne
+    (par catégorie si by_category), avec le nombre de vidéos mesurées.
+    """
+    keys = ["category_id", "channel_id"] if by_category else ["channel_id"]
+    g = videos.groupby(keys, sort=False)
+    df = g[["velocity", "acceleration"]].sum(min_count=1)
+    df["videos"] = g.size()
+    return df.reset_index()
+
+
+def top_k(df: pd.DataFrame, score: str, k: int = TOP_K, by: str | None = None) -> pd.DataFrame:
+    """
+    Les k lignes de plus grand `score` (par valeur de `by` si donné), triées,
+    avec leur rang. Un tas de taille k par groupe : un seul passage sur les lignes.
+    """
+    values = df[score].to_numpy(dtype=np.float64)
+    groups = df[by].to_numpy() if by is not None else np.zeros(len(df), dtype=np.int8)
+
+    heaps = {}
+    for i in np.flatnonzero(np.isfinite(values)):
+        heap = heaps.setdefault(groups[i], [])
+        item = (values[i], -i)  # à égalité, la première ligne l'emporte
+        if len(heap) < k:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+
+    rows, ranks = [], []
+    for group in sorted(heaps, key=str):
+        ranked = sorted(heaps[group], reverse=True)
+        rows.extend(-i for _, i in ranked)
+        ranks.extend(range(1, len(ranked) + 1))
+    top = df.iloc[rows].reset_index(drop=True)
+    top.insert(0, "rang", np.array(ranks, dtype=np.int64))
+    return top
@@ -0,0 +1,512 @@
+"""
+Client YouTube Data API v3 partagé par les notebooks de collecte.
+
+- connexions HTTP réutilisées (requests.Session + pool)
+- limiteur de débit token bucket, partagé entre threads
+- comptage des unités de quota consommées (search = 100, le reste = 1)
+- base_url configurable : permet de viser un faux serveur local
+- collecte des vidéos populaires de toutes les catégories en parallèle
+- collecteurs des notebooks (search par niche, détails vidéos, vidéos récentes
+  des chaînes) portés ici pour être testés contre boostme/fake_api.py
+- sink=... : lignes écrites page par page dans un fichier Arrow (boostme/sink.py)
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+from boostme import schema
+
+API_URL = "https://www.googleapis.com/youtube/v3"
+
+# coût en unités de quota par appel (cf. doc YouTube Data API)
+QUOTA_COST = {
+    "search": 100,
+    "videos": 1,
+    "channels": 1,
+    "playlistItems": 1,
+    "videoCategories": 1,
+}
+QUOTA_REASONS = {"quotaExceeded", "dailyLimitExceeded", "rateLimitExceeded"}
+
+REGION_CODE = "FR"
+MAX_PER_PAGE = 50
+MAX_VIDEOS_PER_CAT = 200
+
+
+class QuotaExceeded(Exception):
+    """Quota journalier épuisé (403 de l'API ou budget local atteint)."""
+
+
+class TokenBucket:
+    """
+    Limiteur de débit : `rate` requêtes par seconde en moyenne,
+    rafales jusqu'à `capacity` requêtes.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class YouTubeClient:
+    """
+    Appels REST à l'API, utilisable depuis plusieurs threads.
+    - rate : requêtes / seconde (token bucket)
+    - quota_budget : plafond local d'unités, None = pas de plafond
+    - retries : nouvelles tentatives sur erreurs 5xx / réseau
+    - cache : ResponseCache (boostme/http_cache.py) ; une réponse encore fraîche
+      ne coûte ni requête ni quota, une réponse expirée est revalidée par ETag
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = API_URL,
+        rate: float = 20,
+        pool_size: int = 16,
+        quota_budget: int | None = None,
+        retries: int = 3,
+        backoff: float = 0.5,
+        timeout: float = 30,
+        cache=None,
+    ):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.bucket = TokenBucket(rate)
+        self.quota_budget = quota_budget
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.cache = cache
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self.lock = threading.Lock()
+        self.quota_used = 0
+        self.requests_made = 0
+        self.exhausted = False
+        self.cache_hits = 0
+        self.revalidated = 0
+
+    def _charge(self, endpoint: str) -> None:
+        cost = QUOTA_COST.get(endpoint, 1)
+        with self.lock:
+            if self.exhausted:
+                raise QuotaExceeded("Quota épuisé")
+            if self.quota_budget is not None and self.quota_used + cost > self.quota_budget:
+                self.exhausted = True
+                raise QuotaExceeded(f"Budget de quota atteint ({self.quota_used}/{self.quota_budget})")
+            self.quota_used += cost
+            self.requests_made += 1
+
+    def get(self, endpoint: str, **params) -> dict:
+        params = {k: v for k, v in params.items() if v is not None}
+        cached = self.cache.get(endpoint, params) if self.cache is not None else None
+        if cached is not None and cached.fresh:
+            with self.lock:
+                self.cache_hits += 1
+            return cached.body
+
+        headers = {"If-None-Match": cached.etag} if cached is not None and cached.etag else {}
+        url = f"{self.base_url}/{endpoint}"
+
+        for attempt in range(self.retries + 1):
+            self.bucket.acquire()
+            self._charge(endpoint)
+            try:
+                r = self.session.get(url, params={**params, "key": self.api_key}, headers=headers, timeout=self.timeout)
+            except requests.ConnectionError:
+                if attempt == self.retries:
+                    raise
+            else:
+                if r.status_code == 304 and cached is not None:
+                    self.cache.touch(endpoint, params)
+                    with self.lock:
+                        self.revalidated += 1
+                    return cached.body
+                if r.status_code == 403 and _error_reason(r) in QUOTA_REASONS:
+                    with self.lock:
+                        self.exhausted = True
+                    raise QuotaExceeded(r.text)
+                if r.status_code < 500 or attempt == self.retries:
+                    r.raise_for_status()
+                    body = r.json()
+                    if self.cache is not None:
+                        self.cache.put(endpoint, params, body, r.headers.get("ETag") or body.get("etag"))
+                    return body
+            time.sleep(self.backoff * 2 ** attempt)
+
+    def close(self) -> None:
+        self.session.close()
+
+
+def _error_reason(r: requests.Response) -> str | None:
+    try:
+        return r.json()["error"]["errors"][0]["reason"]
+    except (ValueError, KeyError, IndexError, TypeError):
+        return None
+
+
+# =============================
+# COLLECTE
+# =============================
+# schémas des lignes produites, pour les écrire en flux (boostme/sink.py) :
+# noms et types du registre des colonnes (boostme/schema.py)
+VIDEO_SCHEMA = schema.arrow_schema("videos", [
+    "video_id", "title", "description", "channel", "published_at", "duration",
+    "views", "likes", "comments", "channel_id", "category_id", "language",
+])
+RECENT_VIDEO_SCHEMA = schema.arrow_schema("videos", [
+    "playlist_id", "video_id", "title", "category_id", "views", "likes", "comments", "published_at",
+])
+
+
+def video_row(item: dict) -> dict:
+    """Une ligne de new_videos/<DATE>.csv à partir d'un item videos.list."""
+    return {
+        "video_id": item["id"],
+        "title": item["snippet"]["title"],
+        "description": item["snippet"].get("description", ""),
+        "channel": item["snippet"]["channelTitle"],
+        "published_at": item["snippet"]["publishedAt"],
+        "duration": item.get("contentDetails", {}).get("duration", None),
+        "views": int(item["statistics"].get("viewCount", 0)),
+        "likes": int(item["statistics"].get("likeCount", 0)),
+        "comments": int(item["statistics"].get("commentCount", 0)),
+        "channel_id": item["snippet"].get("channelId"),
+        "category_id": item["snippet"].get("categoryId"),
+        "language": item["snippet"].get("defaultAudioLanguage", "N/A"),
+    }
+
+
+def get_popular_videos(
+    client: YouTubeClient,
+    category_id,
+    category_name: str = "",
+    max_videos: int = MAX_VIDEOS_PER_CAT,
+    region_code: str = REGION_CODE,
+    sink=None,
+) -> list:
+    """
+    Vidéos du chart mostPopular d'une catégorie (pages successives).
+    - sink : ArrowSink (boostme/sink.py) ; chaque page y est écrite au lieu
+      d'être gardée en mémoire, la liste renvoyée est alors vide
+    """
+    videos = []
+    collected = 0
+    next_page_token = None
+
+    while collected < max_videos:
+        try:
+            response = client.get(
+                "videos",
+                part="snippet,contentDetails,statistics",
+                chart="mostPopular",
+                regionCode=region_code,
+                videoCategoryId=str(category_id),
+                maxResults=MAX_PER_PAGE,
+                pageToken=next_page_token,
+            )
+        except Exception as e:
+            print(f"Erreur sur {category_name or category_id}: {e}")
+            break
+
+        items = response.get("items", [])
+        if not items:
+            break
+        page = [video_row(item) for item in items]
+        collected += len(page)
+        if sink is not None:
+            sink.write(page)
+        else:
+            videos.extend(page)
+
+        next_page_token = response.get("nextPageToken")
+        if not next_page_token:
+            break
+
+    return videos
+
+
+def collect_popular_videos(
+    client: YouTubeClient,
+    cats: pd.DataFrame,
+    max_videos: int = MAX_VIDEOS_PER_CAT,
+    region_code: str = REGION_CODE,
+    max_workers: int = 8,
+    sink=None,
+) -> pd.DataFrame:
+    """
+    Vidéos populaires de toutes les catégories `chart_available` de cats.csv,
+    catégories traitées en parallèle (les pages d'une catégorie restent séquentielles).
+    Résultat dans l'ordre de cats.csv. Si le quota est épuisé, les catégories restantes
+    s'arrêtent sans appel et on renvoie ce qui a été collecté.
+    - sink : les pages sont écrites dans le fichier dans leur ordre d'arrivée,
+      le DataFrame renvoyé est alors vide
+    """
+    if "chart_available" in cats.columns:
+        cats = cats[cats["chart_available"].astype(bool)]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        results = pool.map(
+            lambda row: get_popular_videos(client, row["category_id"], row["name"], max_videos, region_code, sink),
+            [row for _, row in cats.iterrows()],
+        )
+        full_data = [video for cat_videos in results for video in cat_videos]
+
+    if client.exhausted:
+        print("Quota épuisé : collecte partielle.")
+    return pd.DataFrame(full_data)
+
+
+def is_transient(error: Exception) -> bool:
+    """Erreur qui justifie de s'arrêter et de reprendre plus tard (quota, réseau, 5xx)."""
+    if isinstance(error, (QuotaExceeded, requests.ConnectionError, requests.Timeout)):
+        return True
+    return isinstance(error, requests.HTTPError) and error.response is not None and error.response.status_code >= 500
+
+
+def collect_niche_videos(client: YouTubeClient, keywords, target: int = 1000, checkpoint=None, **search_params) -> list:
+    """
+    IDs de vidéos récentes trouvées par search pour une liste de mots-clés
+    (100 unités de quota par page). search_params : ex. relevanceLanguage, regionCode.
+    - checkpoint : CollectionCheckpoint (boostme/checkpoint.py) ; l'état est sauvegardé
+      après chaque page et une erreur de quota / réseau / 5xx arrête la collecte
+      (à relancer : elle reprend au même pageToken)
+    """
+    if isinstance(keywords, str):
+        keywords = [keywords]
+    state = checkpoint.state if checkpoint is not None else {}
+    if state.get("search_done"):
+        return state["video_ids"]
+    video_ids = list(state.get("video_ids", []))
+    start = state.get("keyword_index", 0)
+
+    for keyword_index in range(start, len(keywords)):
+        keyword = keywords[keyword_index]
+        page_token = state.get("page_token") if keyword_index == start else None
+
+        while len(video_ids) < target:
+            try:
+                data = client.get(
+                    "search",
+                    part="snippet",
+                    q=keyword,
+                    type="video",
+                    order="date",
+                    maxResults=MAX_PER_PAGE,
+                    pageToken=page_token,
+                    **search_params,
+                )
+            except Exception as e:
+                if checkpoint is not None and is_transient(e):
+                    raise
+                print(f"Erreur sur '{keyword}': {e}")
+                break
+
+            for item in data.get("items", []):
+                video_ids.append(item["id"]["videoId"])
+
+            page_token = data.get("nextPageToken")
+            if checkpoint is not None and page_token:
+                checkpoint.save(keyword_index=keyword_index, page_token=page_token, video_ids=video_ids)
+            if not page_token:
+                break
+
+        if checkpoint is not None:
+            checkpoint.save(keyword_index=keyword_index + 1, page_token=None, video_ids=video_ids)
+        if client.exhausted:
+            break
+
+    # 🔑 déduplication (ordre de collecte conservé)
+    video_ids = list(dict.fromkeys(video_ids))[:target]
+
+    if checkpoint is not None:
+        checkpoint.save(video_ids=video_ids, search_done=True)
+    return video_ids
+
+
+def fetch_video_details(client: YouTubeClient, video_ids: list, checkpoint=None, seen=None, sink=None) -> pd.DataFrame:
+    """
+    Détails (snippet, statistics, contentDetails) par paquets de 50 IDs.
+    - checkpoint : chaque paquet récupéré est sauvegardé ; une relance repart
+      du premier paquet manquant
+    - seen : registre SeenVideos (boostme/seen.py) ; les IDs déjà récupérés
+      dans la fenêtre (autre niche, exécution précédente) sont sautés. Les IDs
+      ne sont pas marqués ici : l'appelant les marque une fois les lignes
+      écrites (CSV de la niche), un plantage avant ne perd donc aucune vidéo
+    - sink : ArrowSink ; chaque paquet y est écrit au lieu d'être gardé en
+      mémoire (y compris ceux d'un point de reprise), le DataFrame renvoyé est alors vide
+    """
+    if seen is not None:
+        # la liste filtrée est figée dans le point de reprise : une relance
+        # retrouve les mêmes paquets même si le registre a changé entre-temps
+        if checkpoint is not None and checkpoint.state.get("detail_ids") is not None:
+            video_ids = checkpoint.state["detail_ids"]
+        else:
+            video_ids = seen.unseen(video_ids)
+            if checkpoint is not None:
+                checkpoint.save(detail_ids=video_ids)
+
+    rows = checkpoint.rows() if checkpoint is not None else []
+    if sink is not None:
+        sink.write(rows)
+        rows = []
+    start = checkpoint.state["batches_done"] if checkpoint is not None else 0
+
+    for i in range(start * MAX_PER_PAGE, len(video_ids), MAX_PER_PAGE):
+        batch = video_ids[i:i + MAX_PER_PAGE]
+        try:
+            data = client.get("videos", part="snippet,statistics,contentDetails", id=",".join(batch))
+            batch_rows = [video_row(video) for video in data.get("items", [])]
+        except Exception as e:
+            if checkpoint is not None and is_transient(e):
+                raise
+            print(f"Erreur sur le paquet {i // MAX_PER_PAGE}: {e}")
+            if client.exhausted:
+                break
+            batch_rows = []
+
+        if checkpoint is not None:
+            checkpoint.append_rows(batch_rows)
+        if sink is not None:
+            sink.write(batch_rows)
+        else:
+            rows.extend(batch_rows)
+
+    return pd.DataFrame(rows)
+
+
+def recent_video_row(playlist_id: str, item: dict) -> dict:
+    """Une ligne de RECENT_VIDEO_SCHEMA à partir d'un item videos.list."""
+    return {
+        "playlist_id": playlist_id,
+        "video_id": item["id"],
+        "title": item["snippet"]["title"],
+        "category_id": item["snippet"]["categoryId"],
+        "views": int(item["statistics"].get("viewCount", 0)),
+        "likes": int(item["statistics"].get("likeCount", 0)),
+        "comments": int(item["statistics"].get("commentCount", 0)),
+        "published_at": item["snippet"]["publishedAt"],
+    }
+
+
+def _playlist_video_ids(client: YouTubeClient, playlist_id: str, per_playlist: int):
+    # (playlist, IDs des dernières vidéos) ; None si l'appel a échoué
+    try:
+        response = client.get("playlistItems", part="contentDetails", playlistId=playlist_id, maxResults=per_playlist)
+    except Exception as e:
+        if not isinstance(e, QuotaExceeded):
+            print(f"Erreur sur la playlist {playlist_id}: {e}")
+        return playlist_id, None
+    return playlist_id, [item["contentDetails"]["videoId"] for item in response.get("items", [])]
+
+
+def _recent_videos_batch(client: YouTubeClient, batch: list, refreshed=None, sink=None) -> list:
+    # un appel videos.list pour un paquet de (video_id, playlist_id) de plusieurs chaînes
+    playlist_of = dict(batch)
+    try:
+        response = client.get("videos", part="statistics,snippet", id=",".join(playlist_of))
+    except Exception as e:
+        if not isinstance(e, QuotaExceeded):
+            print(f"Erreur sur le paquet de {len(set(playlist_of.values()))} chaînes: {e}")
+        return []
+
+    page = [recent_video_row(playlist_of[video["id"]], video) for video in response.get("items", [])]
+    if sink is not None:
+        sink.write(page)
+        page = []
+    if refreshed is not None:
+        # après sink.write (fichier vidé sur disque) : une chaîne marquée est dans le fichier
+        refreshed.mark(dict.fromkeys(playlist_of.values()))
+    return page
+
+
+def get_stats_recent_videos(
+    client: YouTubeClient,
+    playlist_list: list,
+    per_playlist: int = 10,
+    sink=None,
+    max_workers: int = 8,
+    refreshed=None,
+) -> list:
+    """
+    Stats des dernières vidéos de chaque playlist uploads.
+    Les playlistItems sont demandés en parallèle ; au fil des réponses, les IDs
+    de plusieurs chaînes sont regroupés en paquets complets de 50 pour
+    videos.list (une chaîne n'est jamais coupée entre deux paquets), envoyés
+    dans un second pool : ~1 + 1/5 appel par chaîne au lieu de 2.
+    - sink : ArrowSink (RECENT_VIDEO_SCHEMA) ; les lignes de chaque paquet y
+      sont écrites au lieu d'être gardées en mémoire, la liste renvoyée est alors vide
+    - refreshed : registre SeenVideos des playlists (seen.SEEN_CHANNELS_PATH) ;
+      les chaînes rafraîchies dans la fenêtre sont sautées, les autres y sont
+      marquées une fois leurs lignes écrites dans le sink (requis) : après une
+      interruption, relancer avec ArrowSink(..., resume=True) ne perd ni ne
+      redemande les chaînes déjà écrites
+    """
+    if refreshed is not None and sink is None:
+        raise ValueError("refreshed demande un sink : les chaînes ne sont marquées qu'une fois leurs lignes écrites")
+    playlist_list = list(dict.fromkeys(playlist_list))
+    if refreshed is not None:
+        playlist_list = refreshed.unseen(playlist_list)
+    per_playlist = min(per_playlist, MAX_PER_PAGE)
+
+    all_video_data = []
+    batch = []  # (video_id, playlist_id) du prochain appel videos.list
+    with ThreadPoolExecutor(max_workers=max_workers) as playlists_pool, \
+            ThreadPoolExecutor(max_workers=max(1, max_workers // 2)) as videos_pool:
+        playlist_futures = [
+            playlists_pool.submit(_playlist_video_ids, client, p_id, per_playlist) for p_id in playlist_list
+        ]
+        video_futures = []
+        for future in as_completed(playlist_futures):
+            p_id, video_ids = future.result()
+            if video_ids is None:
+                if client.exhausted:
+                    break
+                continue
+            if not video_ids:
+                # chaîne sans vidéo : rien à rafraîchir
+                if refreshed is not None:
+                    refreshed.mark([p_id])
+                continue
+
+            if len(batch) + len(video_ids) > MAX_PER_PAGE:
+                video_futures.append(videos_pool.submit(_recent_videos_batch, client, batch, refreshed, sink))
+                batch = []
+            batch.extend((video_id, p_id) for video_id in video_ids)
+
+        if client.exhausted:
+            for future in playlist_futures:
+                future.cancel()
+        elif batch:
+            video_futures.append(videos_pool.submit(_recent_videos_batch, client, batch, refreshed, sink))
+
+        for future in video_futures:
+            all_video_data.extend(future.result())
+
+    if client.exhausted:
+        print("Quota épuisé : collecte partielle (les chaînes non marquées seront reprises).")
+    return all_video_data
@@ -0,0 +1,56 @@
+"""Fusion des CSV de catégories (boostme/concat.py) contre concat + drop_duplicates."""
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+from boostme import concat
+
+FILES = {
+    # doublon dans le fichier (v2) ; pas de colonne language ; colonne abandonnée duration_td
+    "10_music.csv": "video_id,title,views,duration_td\nv1,a,10,0 days\nv2,b,20,0 days\nv2,b bis,25,0 days\nv3,,30,0 days\n",
+    # doublons d'un fichier à l'autre (v1, v3) et dans le fichier (v5)
+    "20_gaming.csv": "video_id,title,language,views\nv4,d,fr,40\nv1,a autre,en,11\nv5,e,,50\nv3,c,fr,31\nv5,e bis,fr,55\n",
+    "30_vide.csv": "video_id,title,views\n",
+    "40_people.csv": "title,video_id,views,category_id\n\"f, avec virgule\",v6,60,22\ng,v4,41,22\n",
+}
+
+
+def expected_concat(paths) -> pd.DataFrame:
+    """Ancienne logique de Concate.ipynb : tout en mémoire, puis premier exemplaire de chaque vidéo."""
+    df = pd.concat([pd.read_csv(p, dtype=str, keep_default_na=False) for p in paths], ignore_index=True)
+    df = df.drop(columns=["duration_td"]).drop_duplicates(subset=["video_id"], keep="first")
+    return df.fillna("").reset_index(drop=True)
+
+
+class ConcatCsvTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.paths = []
+        for name, content in FILES.items():
+            (self.dir / name).write_text(content, encoding="utf-8")
+            self.paths.append(self.dir / name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_same_as_concat_drop_duplicates(self):
+        expected = expected_concat(self.paths)
+        for chunksize in [1, 2, 3, concat.CHUNKSIZE]:  # doublons dans un morceau et d'un morceau à l'autre
+            with self.subTest(chunksize=chunksize):
+                out = self.dir / "videos.csv"
+                rows, nulls = concat.concat_csv(self.paths, out, chunksize=chunksize)
+                result = pd.read_csv(out, dtype=str, keep_default_na=False)
+                pd.testing.assert_frame_equal(result, expected)
+                self.assertEqual(rows, len(expected))
+                pd.testing.assert_series_equal(nulls, (expected == "").sum(), check_names=False)
+
+        self.assertEqual(list(expected.columns), ["video_id", "title", "views", "language", "category_id"])
+        self.assertEqual(expected["video_id"].tolist(), ["v1", "v2", "v3", "v4", "v5", "v6"])
+        self.assertFalse((self.dir / "videos.csv.tmp").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
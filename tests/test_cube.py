@@ -0,0 +1,59 @@
+"""Cube agrégé (boostme/cube.py) : mise à jour incrémentale contre reconstruction."""
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from boostme import cube, enrich, store
+
+
+def videos(rows) -> pd.DataFrame:
+    """Table enrichie réduite aux dimensions et mesures du cube."""
+    df = pd.DataFrame(rows, columns=[
+        "video_id", "annee", "categorie", "chaine", "jour_semaine", "heure_publication",
+        "views", "taux_engagement_pct", "engagement_total",
+    ])
+    df["categorie"] = df["categorie"].astype("category")
+    df["chaine"] = df["chaine"].astype("category")
+    df["jour_semaine"] = pd.Categorical(df["jour_semaine"], categories=enrich.ORDRE_JOURS, ordered=True)
+    return df
+
+
+class UpdateCubeTest(unittest.TestCase):
+    def sorted_cube(self, df):
+        return df.sort_values(cube.DIMENSIONS).reset_index(drop=True)
+
+    def test_same_as_build_cube(self):
+        a = videos([
+            ("v1", 2025, "Music", "Chaîne B", "Lundi", 10, 100, 2.0, 5),
+            ("v2", 2025, "Music", "Chaîne B", "Lundi", 10, 300, np.nan, 7),
+            ("v3", 2025, "Gaming", "Chaîne C", "Mardi", 18, 50, 1.0, 1),
+            ("v4", 2026, "Gaming", "Chaîne D", "Mardi", 18, 80, 3.0, 2),   # seule vidéo de sa chaîne
+            ("v5", np.nan, "Music", "Chaîne C", None, np.nan, 10, 1.0, 0),  # sans date : hors cube
+        ])
+        removed = a[a["video_id"].isin(["v2", "v4"])]
+        b = videos([
+            ("v2", 2025, "Music", "Chaîne B", "Lundi", 10, 400, 1.5, 9),      # plus de vues
+            ("v6", 2026, "Comedy", "Chaîne A", "Dimanche", 21, 20, 4.0, 3),  # chaîne et catégorie nouvelles
+        ])
+        base, added = store.union_categories(a[~a["video_id"].isin(removed["video_id"])], b)
+        expected = cube.build_cube(pd.concat([base, added], ignore_index=True))
+
+        updated = cube.update_cube(cube.build_cube(a), added, removed)
+        pd.testing.assert_frame_equal(self.sorted_cube(updated), self.sorted_cube(expected))
+        self.assertEqual(list(updated["chaine"].cat.categories), ["Chaîne A", "Chaîne B", "Chaîne C"])
+        self.assertNotIn("Chaîne D", set(updated["chaine"]))
+
+    def test_nothing_added(self):
+        a = videos([
+            ("v1", 2025, "Music", "Chaîne B", "Lundi", 10, 100, 2.0, 5),
+            ("v2", 2025, "Gaming", "Chaîne C", "Mardi", 18, 50, 1.0, 1),
+        ])
+        removed = a.iloc[[1]]
+        base, added = store.union_categories(a.iloc[[0]], a.iloc[[]])
+        updated = cube.update_cube(cube.build_cube(a), added, removed)
+        pd.testing.assert_frame_equal(self.sorted_cube(updated), self.sorted_cube(cube.build_cube(base)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+"""Durées ISO-8601 (boostme/durations.py) contre pd.to_timedelta."""
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from boostme import durations
+
+# mêmes résultats que pd.to_timedelta(errors="coerce").dt.total_seconds()
+SAME_AS_TIMEDELTA = [
+    "PT1M49S", "PT1H2M", "PT45S", "PT10M", "PT2H", "P1DT2H3M4S", "P0D", "P1W", "P2DT0S", "PT0S",
+    "pt1m", "Pt5S", " PT5S", "PT5S ", "PT", "P", "", "abc", "P1Y", "1M49S",
+]
+
+
+class ParseDurationsTest(unittest.TestCase):
+    def test_same_as_to_timedelta(self):
+        values = pd.Series(SAME_AS_TIMEDELTA + [None, np.nan])
+        expected = pd.to_timedelta(values, errors="coerce").dt.total_seconds()
+        result = durations.parse_durations(values)
+        self.assertEqual(result.dtype, "Int32")
+        self.assertEqual(result.name, durations.DURATION_COLUMN)
+        for value, got, want in zip(values, result, expected):
+            with self.subTest(value=value):
+                if pd.isna(want):
+                    self.assertIs(got, pd.NA)
+                else:
+                    self.assertEqual(got, want)
+
+    def test_edge_cases(self):
+        cases = {
+            "P1DT2H3M4S": 93784,
+            "P0D": 0,        # live / première
+            "pt1m": pd.NA,   # minuscules refusées, comme to_timedelta
+            "PT1.5S": pd.NA,  # fraction de seconde refusée (secondes entières)
+            "PT1M1.25S": pd.NA,
+            "-PT5S": pd.NA,
+            "PT": pd.NA,
+            "PT5": pd.NA,    # unité manquante : to_timedelta lit 0 s
+            "invalide": pd.NA,
+        }
+        result = durations.parse_durations(pd.Series(list(cases)))
+        for (value, want), got in zip(cases.items(), result):
+            with self.subTest(value=value):
+                if want is pd.NA:
+                    self.assertIs(got, pd.NA)
+                else:
+                    self.assertEqual(got, want)
+
+    def test_repeated_values_and_index(self):
+        values = pd.Series(["PT1M", "PT1M", None, "PT1M", "P0D"], index=[10, 11, 12, 13, 14])
+        result = durations.parse_durations(values)
+        self.assertEqual(list(result.index), [10, 11, 12, 13, 14])
+        self.assertEqual(result.tolist(), [60, 60, pd.NA, 60, 0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+"""Table vidéos enrichie : jointures et types conservés jusqu'au store."""
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+from boostme import cube, details, enrich, facets, ingest, schema, store, youtube
+
+
+def sample_tables():
+    cats = schema.conform(pd.DataFrame({"category_id": [10, 20], "name": ["Music", "Gaming"]}), "cats")
+    chaines = schema.conform(pd.DataFrame({
+        "id": ["UC1", "UC2"],
+        "title": ["Chaîne 1", "Chaîne 2"],
+        "country": ["FR", "FR"],
+        "subscribers": [1000, 2000],
+        "nb_videos": [10, 20],
+        "engagement_rate": [1.5, 2.5],
+        "topics": [["Music"], []],
+    }), "chaines")
+    videos = schema.conform(pd.DataFrame({
+        "video_id": ["v1", "v2", "v3"],
+        "title": ["a", "b", "c"],
+        "channel": ["Chaîne 1", "Chaîne 2", "Autre"],
+        "published_at": ["2025-01-06T10:00:00Z", "2025-02-07T18:30:00Z", "2024-12-31T23:00:00Z"],
+        "views": [100, 200, 300],
+        "likes": [10, 20, 30],
+        "comments": [1, 2, 3],
+        "channel_id": ["UC1", "UC2", "UC9"],
+        "category_id": [10, 20, 99],
+        "taux_engagement_pct": [11.0, 11.0, 11.0],
+    }), "videos")
+    return cats, chaines, videos
+
+
+class EnrichVideosTest(unittest.TestCase):
+    def test_joins(self):
+        chaines, videos = enrich.build_dashboard_tables(*sample_tables())
+        self.assertEqual(list(videos["chaine"].astype(str)), ["Chaîne 1", "Chaîne 2", "Chaîne inconnue"])
+        self.assertEqual(list(videos["categorie"].astype(str)), ["Music", "Gaming", "Catégorie inconnue"])
+        self.assertEqual(list(videos["jour_semaine"].astype(str)), ["Lundi", "Vendredi", "Mardi"])
+        self.assertTrue(videos["subscribers"].isna().iloc[2])
+
+    def test_stored_dtypes(self):
+        # les types du store survivent aux jointures et à l'aller-retour Arrow
+        _, videos = enrich.build_dashboard_tables(*sample_tables())
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / enrich.VIDEOS_ENRICHED_FILE
+            store.write_table(videos, path)
+            stored = store.read_frame(path)
+        for col in ["channel_id", "category_id", "categorie", "chaine", "country", "jour_semaine"]:
+            self.assertIsInstance(stored[col].dtype, pd.CategoricalDtype, col)
+        self.assertEqual(stored["subscribers"].dtype, "Int64")
+        self.assertEqual(stored["nb_videos"].dtype, "Int64")
+        self.assertEqual(list(stored["subscribers"]), [1000, 2000, pd.NA])
+
+
+def snapshot(rows):
+    """Snapshot brut du jour (colonnes de youtube.VIDEO_SCHEMA)."""
+    return pd.DataFrame([
+        {"video_id": vid, "title": title, "description": "#music", "channel": "Chaîne 1",
+         "published_at": published_at, "duration": "PT1M", "views": views, "likes": 10, "comments": 1,
+         "channel_id": channel_id, "category_id": 10, "language": "fr"}
+        for vid, title, published_at, views, channel_id in rows
+    ], columns=youtube.VIDEO_SCHEMA.names)
+
+
+class UpdateTablesTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.data_dir = Path(self.tmp.name)
+        cats, chaines, videos = sample_tables()
+        store.write_store(self.data_dir, cats, chaines, videos)
+        enrich.build_enriched(self.data_dir)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read_enriched(self):
+        videos = store.read_frame(self.data_dir / enrich.VIDEOS_ENRICHED_FILE)
+        facets_index = facets.open_facets(self.data_dir)
+        return (
+            videos.sort_values("video_id").reset_index(drop=True),
+            cube.load_cube(self.data_dir).sort_values(cube.DIMENSIONS).reset_index(drop=True),
+            {col: facets_index.counts(col).sort_index() for col in facets_index.vocab},
+            {cid: details.ChannelDetails.open(self.data_dir).get(cid) for cid in ["UC1", "UC2"]},
+        )
+
+    def test_same_as_full_rebuild(self):
+        delta = snapshot([
+            ("v2", "b", "2025-02-07T18:30:00Z", 500, "UC2"),   # plus de vues : remplace la ligne
+            ("v4", "d", "2026-01-01T08:00:00Z", 50, "UC1"),    # nouvelle vidéo
+            ("v0", "e", "2025-06-01T12:00:00Z", 70, "UC0"),    # chaîne inconnue, triée avant les autres
+        ])
+        delta_ids = delta["video_id"].copy()
+        enrich.update_tables(self.data_dir, ingest.clean_delta(delta), delta_ids)
+
+        videos = store.read_frame(self.data_dir / store.VIDEOS_FILE, "videos")
+        self.assertEqual(sorted(videos["video_id"]), ["v0", "v1", "v2", "v3", "v4"])
+        self.assertEqual(int(videos.loc[videos["video_id"] == "v2", "views"].iloc[0]), 500)
+
+        incremental = self.read_enriched()
+        enrich.build_enriched(self.data_dir)  # reconstruction complète du même store
+        full = self.read_enriched()
+
+        # mêmes catégories (triées) qu'une reconstruction
+        pd.testing.assert_frame_equal(incremental[0], full[0])
+        pd.testing.assert_frame_equal(incremental[1], full[1])
+        for col, counts in full[2].items():
+            pd.testing.assert_series_equal(incremental[2][col], counts)
+        self.assertEqual(incremental[3], full[3])
+        self.assertEqual(incremental[3]["UC1"]["recent_videos"][0]["title"], "d")
+
+    def test_builds_missing_tables(self):
+        (self.data_dir / cube.CUBE_FILE).unlink()
+        enrich.update_tables(self.data_dir, ingest.clean_delta(snapshot([])), [])
+        self.assertTrue(cube.has_cube(self.data_dir))
+
+
+if __name__ == "__main__":
+    unittest.main()
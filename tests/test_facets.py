@@ -0,0 +1,91 @@
+"""Facettes des vidéos (boostme/facets.py) contre explode().value_counts()."""
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from boostme import facets, search
+
+VIDEOS = pd.DataFrame({
+    "video_id": ["v1", "v2", "v3", "v4", "v5", "v6"],
+    "title": ["Recette facile", "Ma recette de crêpes", "Let's play", "Vlog du jour", "Crêpes au sucre", None],
+    "hashtags": [["#food", "#shorts"], ["#food"], ["#gaming", "#shorts"], [], ["#shorts"], []],
+    "channel_id": pd.Categorical(["UC1", "UC1", "UC2", "UC3", "UC9", "UC2"]),
+    "categorie": pd.Categorical(["Food", "Food", "Gaming", "People", "Food", None]),
+    "annee": [2025.0, 2024.0, 2025.0, np.nan, 2025.0, 2024.0],
+})
+TOPICS_BY_CHANNEL = pd.Series({"UC1": ["Food", "Lifestyle"], "UC2": ["Video game"], "UC3": []})
+
+
+def expected_facets(videos: pd.DataFrame) -> dict:
+    """Termes de chaque vidéo, facette par facette, calculés ligne à ligne."""
+    return {
+        "hashtags": [list(h) for h in videos["hashtags"]],
+        "themes": [TOPICS_BY_CHANNEL.get(c, []) for c in videos["channel_id"].astype(str)],
+        "categorie": [[c] if pd.notna(c) else [] for c in videos["categorie"]],
+        "annee": [[str(int(a))] if pd.notna(a) else [] for a in videos["annee"]],
+        "mots": [search.tokenize(t) for t in videos["title"]],
+    }
+
+
+def brute_select(lists: dict, selections: dict) -> np.ndarray:
+    keep = np.ones(len(next(iter(lists.values()))), dtype=bool)
+    for col, terms in selections.items():
+        if terms:
+            keep &= [any(t in row for t in terms) for row in lists[col]]
+    return np.flatnonzero(keep)
+
+
+class FacetsTest(unittest.TestCase):
+    def setUp(self):
+        self.index = facets.build_facets(VIDEOS, TOPICS_BY_CHANNEL)
+        self.lists = expected_facets(VIDEOS)
+
+    def test_counts(self):
+        self.assertEqual(list(self.index.ids), list(VIDEOS["video_id"]))
+        for col in facets.VIDEO_FACETS:
+            with self.subTest(col=col):
+                expected = pd.Series(self.lists[col], dtype=object).explode().dropna().value_counts()
+                self.assertEqual(self.index.counts(col).to_dict(), expected.to_dict())
+
+    def test_select(self):
+        cases = [
+            {"hashtags": ["#shorts"]},
+            {"hashtags": ["#shorts"], "categorie": ["Food"], "annee": ["2025"]},
+            {"themes": ["Food", "Video game"], "annee": ["2024"]},
+            {"mots": ["crepes"]},
+            {"hashtags": ["#inconnu"]},
+            {"categorie": ["Food", "People"], "hashtags": []},
+        ]
+        for selections in cases:
+            with self.subTest(selections=selections):
+                rows = self.index.select(selections)
+                np.testing.assert_array_equal(rows, brute_select(self.lists, selections))
+                # comptes des autres facettes sur les lignes retenues
+                expected = pd.Series([self.lists["hashtags"][i] for i in rows], dtype=object).explode().dropna().value_counts()
+                counts = self.index.counts("hashtags", rows)
+                self.assertEqual(counts[counts > 0].to_dict(), expected.to_dict())
+
+    def test_update_same_as_write(self):
+        added = pd.DataFrame({
+            "video_id": ["v4", "v7"], "title": ["Vlog v2", "Nouveau gaming"],
+            "hashtags": [["#food"], ["#gaming"]], "channel_id": ["UC1", "UC2"],
+            "categorie": ["Food", "Gaming"], "annee": [2026.0, 2026.0],
+        })
+        kept = ~VIDEOS["video_id"].isin(added["video_id"]).to_numpy()
+        new_videos = pd.concat([VIDEOS[kept].astype(object), added.astype(object)], ignore_index=True)
+        with tempfile.TemporaryDirectory() as tmp:
+            facets.write_facets(tmp, VIDEOS, TOPICS_BY_CHANNEL)
+            facets.update_facets(tmp, kept, added, TOPICS_BY_CHANNEL)
+            updated = facets.open_facets(tmp)
+        rebuilt = facets.build_facets(new_videos, TOPICS_BY_CHANNEL)
+        self.assertEqual(list(updated.ids), list(rebuilt.ids))
+        for col in facets.VIDEO_FACETS:
+            with self.subTest(col=col):
+                pd.testing.assert_series_equal(updated.counts(col), rebuilt.counts(col))
+        self.assertNotIn("People", updated.vocab["categorie"].tolist())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+"""Filtres de la sidebar (boostme/filters.py) contre le masque isin / between d'origine."""
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from boostme import filters
+
+NAN = float("nan")
+
+
+def sample_videos() -> pd.DataFrame:
+    return pd.DataFrame({
+        "annee": [2024.0, 2025.0, NAN, 2025.0, 2026.0, 2024.0],  # float : date manquante
+        "categorie": pd.Categorical(["Music", "Gaming", "Music", None, "Comedy", "Gaming"]),
+        "chaine": pd.Categorical(["A", "B", "A", "C", None, "B"]),
+        "jour_semaine": ["Lundi", "Mardi", "Lundi", "Samedi", "Dimanche", "Mardi"],
+        "heure_publication": [0.0, 10.0, NAN, 23.0, 18.0, 9.0],
+    })
+
+
+def isin_rows(df: pd.DataFrame, selections: dict, hour_range=None) -> np.ndarray:
+    mask = pd.Series(True, index=df.index)
+    for dim, values in selections.items():
+        if isinstance(values, str) and values == filters.ALL:
+            continue
+        mask &= df[dim].isin(values)
+    if hour_range is not None:
+        mask &= df["heure_publication"].between(*hour_range)
+    return np.flatnonzero(mask.to_numpy())
+
+
+CASES = [
+    ({}, None),
+    ({"annee": [2025]}, None),
+    ({"annee": [2024.0, 2026]}, None),
+    ({"annee": [2024, 2025, 2026]}, None),                # tout coché mais NaN présent
+    ({"categorie": ["Music", "Gaming", "Comedy"]}, None),  # idem, catégorie manquante
+    ({"chaine": ["A", "inconnue"]}, None),                 # valeur inconnue ignorée
+    ({"chaine": []}, None),                                # rien coché : aucune ligne
+    ({"chaine": filters.ALL, "annee": [2024]}, None),
+    ({"jour_semaine": ["Lundi", "Mardi", "Samedi", "Dimanche"]}, None),
+    ({"categorie": ["Gaming"], "chaine": ["B", "C"]}, (9, 23)),
+    ({}, (0, 23)),                                         # toute la journée, heure manquante écartée
+    ({}, (10, 18)),
+    ({"chaine": filters.ALL}, (5, 40)),
+]
+
+
+class FilterIndexTest(unittest.TestCase):
+    def test_matches_isin(self):
+        df = sample_videos()
+        index = filters.FilterIndex(df)
+        for selections, hour_range in CASES:
+            with self.subTest(selections=selections, hour_range=hour_range):
+                rows = index.select(selections, hour_range)
+                positions = np.arange(len(df))[rows]
+                np.testing.assert_array_equal(positions, isin_rows(df, selections, hour_range))
+                self.assertEqual(filters.count(rows, len(df)), len(positions))
+                pd.testing.assert_frame_equal(filters.take(df, rows), df.iloc[positions])
+
+    def test_no_filter_returns_table(self):
+        df = sample_videos().dropna()
+        index = filters.FilterIndex(df)
+        rows = index.select({"annee": [2024, 2025, 2026], "chaine": filters.ALL}, (0, 23))
+        self.assertEqual(rows, slice(None))
+        self.assertIs(filters.take(df, rows), df)
+
+    def test_options(self):
+        index = filters.FilterIndex(sample_videos())
+        self.assertEqual(index.options("chaine"), ["A", "B", "C"])
+        self.assertEqual(index.options("jour_semaine"), ["Dimanche", "Lundi", "Mardi", "Samedi"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+"""Registre des colonnes (boostme/schema.py)."""
+import unittest
+
+import pandas as pd
+import pyarrow as pa
+
+from boostme import ingest, schema, youtube
+
+
+class ConformTest(unittest.TestCase):
+    def test_channel_and_chaine_kept(self):
+        videos = pd.DataFrame({
+            "video_id": ["v1", "v2"],
+            "published_at": ["2025-01-01T10:00:00Z", "2025-01-02T10:00:00Z"],
+            "views": [10, 20],
+            "channel_id": ["UC1", "UC2"],
+            "category_id": [10, 20],
+            "Taux d'engagement (%)": [1.5, 2.5],
+            "channel": ["Nom API 1", "Nom API 2"],
+            "chaine": ["Titre chaines.csv 1", "Chaîne inconnue"],
+        })
+        out = schema.conform(videos, "videos")
+        self.assertEqual(out["channel"].astype(str).tolist(), ["Nom API 1", "Nom API 2"])
+        self.assertEqual(out["chaine"].tolist(), ["Titre chaines.csv 1", "Chaîne inconnue"])
+        self.assertIn("taux_engagement_pct", out.columns)
+
+
+class RegistryWritersTest(unittest.TestCase):
+    def test_collector_schemas(self):
+        self.assertEqual(youtube.VIDEO_SCHEMA.field("views").type, pa.int64())
+        self.assertEqual(youtube.VIDEO_SCHEMA.field("published_at").type, pa.string())
+        self.assertIn("playlist_id", youtube.RECENT_VIDEO_SCHEMA.names)
+        with self.assertRaises(ValueError):
+            schema.arrow_schema("videos", ["video_id", "vue_totale"])
+
+    def test_clean_delta_headers(self):
+        delta = pd.DataFrame({
+            "video_id": ["v1"], "title": ["t #humour"], "description": [""], "channel": ["c"],
+            "published_at": ["2025-01-01T10:00:00Z"], "duration": ["PT1M5S"],
+            "views": [200], "likes": [8], "comments": [2],
+            "channel_id": ["UC1"], "category_id": ["23"], "language": ["fr-FR"],
+        })
+        cleaned = ingest.clean_delta(delta)
+        # en-têtes historiques de videos.csv, rattachés aux colonnes canoniques par le registre
+        self.assertIn("Taux d'engagement (%)", cleaned.columns)
+        out = schema.conform(cleaned, "videos")
+        self.assertEqual(out["engagement_total"].tolist(), [10])
+        self.assertEqual(out["taux_engagement_pct"].tolist(), [5.0])
+        self.assertEqual(out["duree_s"].tolist(), [65])
+
+
+if __name__ == "__main__":
+    unittest.main()
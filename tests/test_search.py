@@ -0,0 +1,60 @@
+"""Recherche de chaînes (boostme/search.py) contre un parcours de toutes les chaînes."""
+import unittest
+
+import pandas as pd
+
+from boostme import search
+
+NAMES = [
+    "Squeezie", "SQUEEZIE Gaming", "Cyprien", "Léna Situations", "Lena Mahfouf", "Mister V",
+    "Le Monde", "Monde Animal", "Amixem", "Michou", "Inoxtag", "L'Équipe", "Équipe de France",
+    "Hugo Décrypte", "Décrypteurs", "Joueur du Grenier", "McFly & Carlito", "Natoo", "Norman", "Mcfly",
+]
+WEIGHTS = [50, 10, 40, 30, 5, 20, 15, 2, 25, 25, 35, 8, 3, 45, 1, 12, 18, 6, 22, 4]
+
+
+def brute_search(names, weights, query: str) -> list:
+    """Toutes les chaînes contenant la requête : préfixes d'abord, puis poids décroissant et nom."""
+    keys = [search.normalize(n) for n in names]
+    query = search.normalize(query)
+    order = sorted(range(len(names)), key=lambda i: (-weights[i], keys[i]))
+    rank = {i: r for r, i in enumerate(order)}
+    if not query:
+        return [names[i] for i in order]
+    matches = [i for i in range(len(names)) if query in keys[i]]
+    return [names[i] for i in sorted(matches, key=lambda i: (not keys[i].startswith(query), rank[i]))]
+
+
+class ChannelSearchTest(unittest.TestCase):
+    def setUp(self):
+        self.index = search.ChannelSearch(NAMES, WEIGHTS)
+
+    def test_matches_substring_scan(self):
+        queries = ["", "s", "sq", "squeezie", "  SQUEEZIE ", "lena", "Léna", "mond", "onde", "equipe",
+                   "decrypt", "mc", "cfl", "& car", "xyz", "ie", "grenier", "l'", "e"]
+        for query in queries:
+            with self.subTest(query=query):
+                expected = brute_search(NAMES, WEIGHTS, query)
+                names, total = self.index.search(query, k=len(NAMES))
+                self.assertEqual(names, expected)
+                self.assertEqual(total, len(expected))
+
+    def test_pages(self):
+        expected = brute_search(NAMES, WEIGHTS, "e")
+        pages = [self.index.search("e", k=4, offset=o)[0] for o in range(0, len(expected), 4)]
+        self.assertEqual([n for page in pages for n in page], expected)
+        self.assertEqual(self.index.search("e", k=4)[1], len(expected))
+
+    def test_from_videos(self):
+        videos = pd.DataFrame({"chaine": ["Natoo", "Norman", "Natoo", None, "Natoo", "Norman", "Cyprien"]})
+        index = search.ChannelSearch.from_videos(videos)
+        self.assertEqual(index.search("")[0], ["Natoo", "Norman", "Cyprien"])
+        self.assertEqual(index.search("n")[0], ["Natoo", "Norman", "Cyprien"])
+
+    def test_tokenize(self):
+        self.assertEqual(search.tokenize("Le Vélo de Léa : vélo ÉLECTRIQUE"), ["velo", "lea", "electrique"])
+        self.assertEqual(search.tokenize(None), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+"""Historique des statistiques (boostme/timeseries.py) : écarts zstd relus à l'identique."""
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from boostme import timeseries
+
+DAYS = ["2026-01-01", "2026-01-02", "2026-01-04", "2026-01-05", "2026-01-09", "2026-01-10"]
+
+
+def random_snapshots(seed: int = 0, n_videos: int = 30) -> dict:
+    """
+    jour -> snapshot brut ; chaque vidéo apparaît à partir d'un jour tiré au
+    hasard, manque certains jours, et ses stats peuvent baisser (vues corrigées)
+    ou manquer (likes masqués).
+    """
+    rng = np.random.default_rng(seed)
+    first = rng.integers(0, len(DAYS), n_videos)
+    current = rng.integers(0, 10_000, (n_videos, 3))
+    snapshots = {}
+    for d, day in enumerate(DAYS):
+        current = np.maximum(current + rng.integers(-50, 5_000, current.shape), 0)
+        present = (first <= d) & (rng.random(n_videos) < 0.8)
+        rows = [{
+            "video_id": f"v{i:02d}", "channel_id": f"UC{i % 5}", "category_id": str(10 + i % 3),
+            "views": current[i, 0], "likes": current[i, 1], "comments": current[i, 2],
+        } for i in np.flatnonzero(present)]
+        snap = pd.DataFrame(rows, columns=[*timeseries.ID_COLUMNS, *timeseries.STATS])
+        snap["likes"] = snap["likes"].astype("float64")
+        snap.loc[rng.random(len(snap)) < 0.1, "likes"] = np.nan
+        snapshots[day] = snap
+    return snapshots
+
+
+def expected_points(snapshots: dict) -> pd.DataFrame:
+    """Points attendus : une ligne par (vidéo, jour), valeur manquante = valeur précédente."""
+    points = pd.concat([s.assign(date=pd.Timestamp(day)) for day, s in snapshots.items()], ignore_index=True)
+    points = points.sort_values(["video_id", "date"], kind="stable")
+    points["likes"] = points.groupby("video_id")["likes"].ffill().fillna(0)
+    return points.astype({stat: "int64" for stat in timeseries.STATS}).reset_index(drop=True)
+
+
+def brute_velocity(series: pd.DataFrame, days: int, asof: int, stat: str) -> float:
+    point_days = np.array([timeseries.to_day(d) for d in series["date"]])
+    inside = np.flatnonzero(point_days <= asof)
+    if not len(inside):
+        return float("nan")
+    last = inside[-1]
+    before = np.flatnonzero(point_days <= asof - days)
+    base = before[-1] if len(before) else 0
+    elapsed = point_days[last] - point_days[base]
+    if elapsed <= 0:
+        return float("nan")
+    return float(series[stat].iloc[last] - series[stat].iloc[base]) / elapsed
+
+
+def build(stats_dir, snapshots: dict) -> timeseries.VideoStats:
+    for day, snap in snapshots.items():
+        timeseries.append_snapshot(stats_dir, day, snap)
+    return timeseries.VideoStats.open(stats_dir)
+
+
+class VideoStatsTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.stats_dir = Path(self.tmp.name)
+        self.snapshots = random_snapshots()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        stats = build(self.stats_dir, self.snapshots)
+        expected = expected_points(self.snapshots)
+        for video_id, points in expected.groupby("video_id"):
+            with self.subTest(video_id=video_id):
+                series = stats.series(video_id)
+                pd.testing.assert_frame_equal(
+                    series, points[["date", *timeseries.STATS]].reset_index(drop=True), check_dtype=False
+                )
+        self.assertEqual(stats.series("inconnue").shape[0], 0)
+
+    def test_snapshot_files(self):
+        build(self.stats_dir, self.snapshots)
+        self.assertEqual(timeseries.snapshot_days(self.stats_dir), [timeseries.to_day(d) for d in DAYS])
+        with pa.memory_map(str(self.stats_dir / f"{DAYS[-1]}.arrow"), "r") as source:
+            points = pa.ipc.open_file(source).read_all()
+        self.assertEqual(points.column_names, ["code", "day", *timeseries.STATS])
+        self.assertEqual(points.schema.field("code").type, pa.int32())
+
+        # jour déjà présent : ignoré ; jour antérieur au dernier : refusé
+        self.assertEqual(timeseries.append_snapshot(self.stats_dir, DAYS[-1], self.snapshots[DAYS[-1]]), 0)
+        with self.assertRaises(ValueError):
+            timeseries.append_snapshot(self.stats_dir, "2026-01-03", self.snapshots[DAYS[0]])
+
+    def test_velocity(self):
+        stats = build(self.stats_dir, self.snapshots)
+        for video_id in ["v00", "v07", "v13", "v29"]:
+            series = stats.series(video_id)
+            for days, asof in [(7, None), (1, "2026-01-05"), (3, "2026-01-04"), (30, "2026-01-10")]:
+                with self.subTest(video_id=video_id, days=days, asof=asof):
+                    day = stats.last_day if asof is None else timeseries.to_day(asof)
+                    expected = brute_velocity(series, days, day, "views")
+                    np.testing.assert_equal(stats.velocity(video_id, days=days, asof=asof), expected)
+
+        # chaîne : somme des vitesses mesurables de ses vidéos
+        videos = stats.ids.loc[stats.ids["channel_id"] == "UC2", "video_id"]
+        speeds = [stats.velocity(v, days=7) for v in videos]
+        self.assertAlmostEqual(stats.channel_velocity("UC2", days=7), np.nansum(speeds))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+"""Listes encodées en dictionnaire (boostme/store.py) et index inversé des thèmes (boostme/topics.py)."""
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from boostme import store, topics
+
+CHAINES = pd.DataFrame({
+    "id": ["UC1", "UC2", "UC3", "UC4", "UC5", "UC6"],
+    "title": ["Cuisine facile", "La cuisine de Léa", "Gaming FR", "Vlog", "Sport et cuisine", "Rien"],
+    "topics": [["Food", "Lifestyle"], ["Food"], ["Video game", "Lifestyle"], [], ["Sport", "Food", "Sport"], None],
+    "hashtags": [["#recette"], "['#recette', '#food']", [], ["#vlog"], ["#sport"], []],
+})
+
+
+def expected_lists(values) -> list:
+    # liste Python ou sérialisée, doublons retirés, absente -> []
+    return [list(dict.fromkeys(store.parse_list(v))) for v in values]
+
+
+def brute_rows(lists, terms, match_all=False) -> np.ndarray:
+    test = all if match_all else any
+    return np.array([i for i, row in enumerate(lists) if test(t in row for t in terms)], dtype=np.int64)
+
+
+class EncodeListsTest(unittest.TestCase):
+    def test_round_trip(self):
+        for col in ["topics", "hashtags"]:
+            encoded = store.encode_lists(CHAINES[col])
+            self.assertEqual(encoded.type, store.LIST_TYPE)
+            self.assertEqual(encoded.to_pylist(), expected_lists(CHAINES[col]))
+            vocab = encoded.flatten().dictionary.to_pylist()
+            self.assertEqual(vocab, sorted(set(vocab)))
+
+    def test_compact_after_filter(self):
+        table = pa.table({"topics": store.encode_lists(CHAINES["topics"])})
+        keep = [True, False, True, False, False, True]
+        kept = pa.concat_tables([table.filter(pa.array(keep)), pa.table({"topics": store.encode_lists([["Zoo"]])})])
+        compacted = store.compact_lists(kept.column("topics"))
+        expected = [row for row, k in zip(expected_lists(CHAINES["topics"]), keep) if k] + [["Zoo"]]
+        self.assertEqual(compacted.to_pylist(), expected)
+        self.assertEqual(compacted.flatten().dictionary.to_pylist(), ["Food", "Lifestyle", "Video game", "Zoo"])
+
+
+class TopicIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.index = topics.TopicIndex.from_frame(CHAINES)
+        self.lists = {col: expected_lists(CHAINES[col]) for col in ["topics", "hashtags"]}
+
+    def test_counts(self):
+        for col, lists in self.lists.items():
+            with self.subTest(col=col):
+                expected = pd.Series(lists).explode().dropna().value_counts()
+                counts = self.index.counts(col)
+                self.assertEqual(counts.to_dict(), expected.to_dict())
+                self.assertTrue(counts.is_monotonic_decreasing)
+
+        rows = np.array([0, 2, 4])
+        expected = pd.Series([self.lists["topics"][i] for i in rows]).explode().dropna().value_counts()
+        counts = self.index.counts("topics", rows)
+        self.assertEqual(counts[counts > 0].to_dict(), expected.to_dict())
+        self.assertEqual(counts["Food"] + counts["Sport"], 3)
+
+    def test_queries(self):
+        cases = [
+            ("topics", ["Food"]), ("topics", ["Food", "Lifestyle"]), ("topics", ["Sport", "Video game"]),
+            ("topics", ["Inconnu"]), ("topics", ["Food", "Inconnu"]), ("hashtags", ["#recette", "#food"]),
+        ]
+        for col, terms in cases:
+            with self.subTest(col=col, terms=terms):
+                lists = self.lists[col]
+                np.testing.assert_array_equal(self.index.any_of(col, terms), brute_rows(lists, terms))
+                np.testing.assert_array_equal(self.index.all_of(col, terms), brute_rows(lists, terms, True))
+        np.testing.assert_array_equal(self.index.all_of("topics", []), np.arange(len(CHAINES)))
+
+        rows = self.index.select({"topics": ["Food", "Sport"], "mots": ["cuisine"], "hashtags": []}, match_all=["mots"])
+        np.testing.assert_array_equal(rows, [0, 1, 4])
+        self.assertIsNone(self.index.select({"topics": []}))
+
+    def test_terms(self):
+        self.assertEqual(self.index.terms_of("topics", 4), ["Sport", "Food"])  # ordre de la liste
+        self.assertEqual(self.index.terms_of("mots", 1), ["cuisine", "lea"])
+        self.assertEqual(self.index.terms_by_id("topics").to_dict(),
+                         dict(zip(CHAINES["id"], self.lists["topics"])))
+
+    def test_plain_lists_and_file(self):
+        # list<string> non encodée : même index
+        plain = pa.table({"id": CHAINES["id"], "topics": pa.array(self.lists["topics"], pa.list_(pa.string()))})
+        index = topics.TopicIndex.from_table(plain)
+        self.assertEqual(index.counts("topics").to_dict(), self.index.counts("topics").to_dict())
+
+        with tempfile.TemporaryDirectory() as tmp:
+            topics.write_topics(tmp, CHAINES)
+            opened = topics.TopicIndex.open(tmp)
+        np.testing.assert_array_equal(opened.any_of("topics", ["Lifestyle"]), [0, 2])
+        self.assertEqual(list(opened.ids), list(CHAINES["id"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+"""Classement des tendances (boostme/trending.py) contre un calcul vidéo par vidéo."""
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from boostme import timeseries, trending
+from tests.test_timeseries import build, random_snapshots
+
+
+def brute_trends(stats: timeseries.VideoStats, stat: str = "views") -> pd.DataFrame:
+    rows = []
+    for video_id, channel_id, category_id in stats.ids[["video_id", "channel_id", "category_id"]].itertuples(index=False):
+        series = stats.series(video_id)
+        days = [timeseries.to_day(d) for d in series["date"]]
+        if len(days) < 2 or days[-1] != stats.last_day:
+            continue
+        values = series[stat].astype(float).tolist()
+        velocity = (values[-1] - values[-2]) / (days[-1] - days[-2])
+        acceleration = float("nan")
+        if len(days) >= 3:
+            previous = (values[-2] - values[-3]) / (days[-2] - days[-3])
+            acceleration = (velocity - previous) / ((days[-1] - days[-3]) / 2)
+        rows.append((video_id, channel_id, category_id, values[-1], velocity, acceleration))
+    return pd.DataFrame(rows, columns=["video_id", "channel_id", "category_id", "value", "velocity", "acceleration"])
+
+
+def brute_top_k(df: pd.DataFrame, score: str, k: int, by=None) -> pd.DataFrame:
+    df = df[np.isfinite(df[score].astype(float))].copy()
+    df["_pos"] = np.arange(len(df))
+    df["_group"] = df[by].astype(str) if by is not None else ""
+    ranked = df.sort_values(["_group", score, "_pos"], ascending=[True, False, True], kind="stable")
+    top = ranked.groupby("_group", sort=False).head(k).copy()
+    top.insert(0, "rang", top.groupby("_group").cumcount().astype("int64") + 1)
+    return top.drop(columns=["_pos", "_group"]).reset_index(drop=True)
+
+
+class TrendingTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.stats = build(Path(cls.tmp.name), random_snapshots(seed=1, n_videos=60))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_video_trends(self):
+        videos = trending.video_trends(self.stats)
+        expected = brute_trends(self.stats)
+        self.assertGreater(expected["acceleration"].notna().sum(), 0)
+        pd.testing.assert_frame_equal(
+            videos.sort_values("video_id").reset_index(drop=True),
+            expected.sort_values("video_id").reset_index(drop=True),
+            check_dtype=False,
+        )
+
+    def test_top_k(self):
+        videos = trending.video_trends(self.stats)
+        videos.loc[videos.index[:3], "velocity"] = videos["velocity"].iloc[3]  # égalités
+        channels = trending.channel_trends(videos)
+        cases = [
+            (videos, "velocity", 5, None),
+            (videos, "velocity", 3, "category_id"),
+            (videos, "acceleration", 4, "category_id"),  # NaN écartés
+            (channels, "velocity", 2, "category_id"),
+            (videos, "velocity", 1000, None),            # k plus grand que la table
+        ]
+        for df, score, k, by in cases:
+            with self.subTest(score=score, k=k, by=by, rows=len(df)):
+                pd.testing.assert_frame_equal(trending.top_k(df, score, k=k, by=by), brute_top_k(df, score, k, by))
+
+    def test_channel_trends(self):
+        videos = trending.video_trends(self.stats)
+        channels = trending.channel_trends(videos, by_category=False).set_index("channel_id")
+        for channel_id, group in videos.groupby("channel_id"):
+            self.assertAlmostEqual(channels.loc[channel_id, "velocity"], group["velocity"].sum())
+            self.assertEqual(channels.loc[channel_id, "videos"], len(group))
+
+
+if __name__ == "__main__":
+    unittest.main()
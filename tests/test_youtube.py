@@ -0,0 +1,158 @@
+"""Collecteurs YouTube contre le faux serveur local (boostme/fake_api.py)."""
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+from boostme import seen, sink, youtube
+from boostme.fake_api import FakeYouTubeData, FakeYouTubeServer
+
+N_CHANNELS = 12
+VIDEOS_PER_CHANNEL = 10
+
+
+def fake_data() -> FakeYouTubeData:
+    videos = pd.DataFrame([
+        {
+            "video_id": f"v{c:02d}_{i:02d}",
+            "title": f"vidéo {i} de la chaîne {c}",
+            "description": "",
+            "channel": f"Chaîne {c}",
+            "published_at": f"2025-01-{i + 1:02d}T10:00:00Z",
+            "duration": "PT1M",
+            "views": 1000 * (i + 1),
+            "likes": 10 * (i + 1),
+            "comments": i,
+            "channel_id": f"UC{c:02d}",
+            "category_id": 10,
+            "language": "fr",
+        }
+        for c in range(N_CHANNELS) for i in range(VIDEOS_PER_CHANNEL)
+    ])
+    chaines = pd.DataFrame({
+        "id": [f"UC{c:02d}" for c in range(N_CHANNELS)],
+        "title": [f"Chaîne {c}" for c in range(N_CHANNELS)],
+        "description": "",
+        "country": "FR",
+        "uploads_playlist": [f"UU{c:02d}" for c in range(N_CHANNELS)],
+        "views": 1000,
+        "subscribers": 100,
+        "nb_videos": VIDEOS_PER_CHANNEL,
+        "topics": "[]",
+    })
+    cats = pd.DataFrame({"category_id": [10], "name": ["Music"], "chart_available": [True]})
+    return FakeYouTubeData(videos, chaines, cats)
+
+
+class CollectorTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.data = fake_data()
+        cls.server = FakeYouTubeServer(cls.data).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self.server.reset_stats()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.tmp_dir = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def client(self, **kwargs) -> youtube.YouTubeClient:
+        return youtube.YouTubeClient("test", base_url=self.server.url, backoff=0, **kwargs)
+
+    def test_details_not_marked_before_persist(self):
+        registry = seen.SeenVideos(self.tmp_dir / "seen.sqlite")
+        ids = self.data.videos.index[:60].tolist()
+
+        # quota épuisé au 2e paquet : rien n'est marqué, la relance redemande tout
+        partial = youtube.fetch_video_details(self.client(quota_budget=1), ids, seen=registry)
+        self.assertEqual(len(partial), 50)
+        self.assertEqual(len(registry), 0)
+
+        fetched = youtube.fetch_video_details(self.client(), ids, seen=registry)
+        self.assertEqual(sorted(fetched["video_id"]), sorted(ids))
+        registry.mark(fetched["video_id"])  # CSV de la niche écrit
+        self.assertEqual(youtube.fetch_video_details(self.client(), ids, seen=registry).shape[0], 0)
+        registry.close()
+
+    def test_recent_videos_resume(self):
+        path = self.tmp_dir / "recent_videos.arrows"
+        playlists = [f"UU{c:02d}" for c in range(N_CHANNELS)]
+        registry = seen.SeenVideos(self.tmp_dir / "seen_channels.sqlite")
+
+        # exécution interrompue : quota épuisé après les playlistItems et un paquet videos.list
+        with sink.ArrowSink(path, youtube.RECENT_VIDEO_SCHEMA, resume=True) as out:
+            youtube.get_stats_recent_videos(self.client(quota_budget=N_CHANNELS + 1), playlists,
+                                            sink=out, refreshed=registry, max_workers=2)
+        first = sink.read_sink(path).to_pandas()
+        self.assertGreater(len(first), 0)
+        self.assertLess(len(first), N_CHANNELS * VIDEOS_PER_CHANNEL)
+        # toute chaîne marquée a ses lignes dans le fichier
+        self.assertEqual(registry.recent(playlists), set(first["playlist_id"]))
+
+        # relance : les lignes déjà écrites sont gardées, seules les chaînes manquantes sont demandées
+        with sink.ArrowSink(path, youtube.RECENT_VIDEO_SCHEMA, resume=True) as out:
+            youtube.get_stats_recent_videos(self.client(), playlists, sink=out, refreshed=registry)
+        videos = sink.read_sink(path).to_pandas()
+        self.assertEqual(sorted(videos["video_id"]), sorted(self.data.videos.index))
+        self.assertEqual(self.server.requests["playlistItems"], N_CHANNELS + N_CHANNELS - first["playlist_id"].nunique())
+        registry.close()
+
+    def test_refreshed_needs_sink(self):
+        with self.assertRaises(ValueError):
+            youtube.get_stats_recent_videos(self.client(), ["UU00"], refreshed=object())
+
+
+class ArrowSinkTest(unittest.TestCase):
+    def test_resume_after_torn_batch(self):
+        schema = youtube.RECENT_VIDEO_SCHEMA
+        rows = [{"playlist_id": "UU00", "video_id": f"v{i}", "title": "", "category_id": "10",
+                 "views": i, "likes": 0, "comments": 0, "published_at": ""} for i in range(4)]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "out.arrows"
+            out = sink.ArrowSink(path, schema)
+            out.write(rows[:2])
+            out.write(rows[2:3])
+            out.file.write(b"\xff\xff\xff\xff\x10\x00")  # processus tué au milieu d'un batch
+            out.file.close()
+
+            with sink.ArrowSink(path, schema, resume=True) as resumed:
+                self.assertEqual(resumed.rows, 3)
+                resumed.write(rows[3:])
+            self.assertEqual(sink.read_sink(path).column("video_id").to_pylist(), ["v0", "v1", "v2", "v3"])
+            self.assertFalse(path.with_name(path.name + ".old").exists())
+
+            # sans resume : le fichier est écrasé
+            with sink.ArrowSink(path, schema) as out:
+                out.write(rows[:1])
+            self.assertEqual(sink.read_sink(path).num_rows, 1)
+
+    def test_csv_header_without_rows(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path, csv_path = Path(tmp) / "out.arrows", Path(tmp) / "out.csv"
+            with sink.ArrowSink(path, youtube.VIDEO_SCHEMA):
+                pass  # aucune page collectée (quota épuisé dès le départ)
+            self.assertEqual(sink.sink_to_csv(path, csv_path), 0)
+            df = pd.read_csv(csv_path)
+            self.assertEqual(list(df.columns), youtube.VIDEO_SCHEMA.names)
+            self.assertEqual(len(df), 0)
+
+            rows = [{name: None for name in youtube.VIDEO_SCHEMA.names} | {"video_id": f"v{i}", "views": i}
+                    for i in range(3)]
+            with sink.ArrowSink(path, youtube.VIDEO_SCHEMA) as out:
+                out.write(rows[:2])
+                out.write(rows[2:])
+            self.assertEqual(sink.sink_to_csv(path, csv_path), 3)
+            df = pd.read_csv(csv_path)
+            self.assertEqual(list(df.columns), youtube.VIDEO_SCHEMA.names)
+            self.assertEqual(df["video_id"].tolist(), ["v0", "v1", "v2"])
+
+
+if __name__ == "__main__":
+    unittest.main()